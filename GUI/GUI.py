@@ -562,6 +562,7 @@ class VoltageMeasurementDialog(QDialog):
             InputZ=AdvancedSettingsList[3],
             UpTime=AdvancedSettingsList[4],
             DownTime=AdvancedSettingsList[5],
+            Checkpoint="csv/voltage_checkpoint.log",
         )
         QMessageBox.warning(
             self,
@@ -607,13 +608,14 @@ class VoltageMeasurementDialog(QDialog):
                 except Exception as e:
                     QMessageBox.warning(self, e)
                     exit()
+            A.closeRM()
             self.OutputBox.append(my_result.getvalue())
             self.OutputBox.append("Measurement is complete !")
 
             if self.checkbox_data_Report == 2:
                 instrumentData(self.PSU, self.DMM, self.ELoad)
-                datatoCSV_Accuracy(infoList, dataList)
-                datatoGraph(infoList, dataList)
+                datatoCSV_Accuracy(infoList, dataList, self.statsList, self.failList)
+                datatoGraph(infoList, dataList, self.statsList, self.failList)
                 datatoGraph.scatterCompareVoltage(
                     self, float(self.Error_Gain), float(self.Error_Offset)
                 )
@@ -963,6 +965,7 @@ class CurrentMeasurementDialog(QDialog):
             Terminal=AdvancedSettingsList[3],
             UpTime=AdvancedSettingsList[4],
             DownTime=AdvancedSettingsList[5],
+            Checkpoint="csv/current_checkpoint.log",
         )
         QMessageBox.warning(
             self,
@@ -1010,13 +1013,14 @@ class CurrentMeasurementDialog(QDialog):
                     QMessageBox.warning(self, e)
                     exit()
 
+            A.closeRM()
             self.OutputBox.append(my_result.getvalue())
             self.OutputBox.append("Measurement is complete !")
 
             if self.checkbox_data_Report == 2:
                 instrumentData(self.PSU, self.DMM, self.ELoad)
-                datatoCSV_Accuracy(infoList, dataList)
-                datatoGraph(infoList, dataList)
+                datatoCSV_Accuracy(infoList, dataList, self.statsList, self.failList)
+                datatoGraph(infoList, dataList, self.statsList, self.failList)
                 datatoGraph.scatterCompareCurrent(
                     self, float(self.Error_Gain), float(self.Error_Offset)
                 )
@@ -1588,6 +1592,7 @@ class CV_LoadRegulationDialog(QDialog):
                     QMessageBox.warning(self, "Error", str(e))
                     exit()
 
+            A.closeRM()
             self.OutputBox.append(my_result.getvalue())
             self.OutputBox.append("Measurement is complete !")
 
@@ -1910,6 +1915,7 @@ class CC_LoadRegulationDialog(QDialog):
                     QMessageBox.warning(self, "Error", str(e))
                     exit()
 
+            A.closeRM()
             self.OutputBox.append(my_result.getvalue())
             self.OutputBox.append("Measurement is complete !")
 
@@ -2202,6 +2208,7 @@ class TransientRecoveryTime(QDialog):
                 QMessageBox.warning(self, "Error", str(e))
                 exit()
 
+            A.closeRM()
             self.OutputBox.append(my_result.getvalue())
             self.OutputBox.append("Measurement is complete !")
 
@@ -2495,6 +2502,8 @@ class ProgrammingSpeed(QDialog):
                 QMessageBox.warning(self, "Error", str(e))
                 exit()
 
+            A.closeRM()
+
         self.OutputBox.append(my_result.getvalue())
         self.OutputBox.append("Measurement is complete !")
 
@@ -0,0 +1,168 @@
+"""Library containing the asyncio counterpart of the SCPI Commands Subsystems.
+
+    The Subsystems of Keysight.py, Keithley.py and Chroma.py are blocking, so every Instrument waits for the
+    previous one even when they are independent (e.g. configuring the DMM and the Oscilloscope). Every
+    Instrument is given its own single thread executor keyed by its VISA Address. A call to an Instrument is
+    run on its executor, hence calls to the same Instrument are kept in order while calls to different
+    Instruments overlap. PSU and ELoad channels sharing a mainframe share the same VISA Address, and so the
+    same executor.
+
+    Any Subsystem is made awaitable by AsyncSubsystem, e.g.
+
+        DMM = AsyncSubsystem(Keysight.Voltage, dict["DMM"])
+        ELoad = AsyncSubsystem(Keysight.Current, dict["ELoad"])
+        await asyncio.gather(DMM.setNPLC(10), ELoad.setOutputCurrent(1, 1))
+
+"""
+
+import asyncio
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor, wait
+from SessionPool import SessionPool
+
+
+class InstrumentExecutor(object):
+    """Process-wide registry of single thread executors keyed by VISA Address
+
+    The class is never instantiated, the registry is shared by the whole process through class attributes.
+
+    Attributes:
+        executors: Dictionary mapping the VISA Address to the executor of the Instrument.
+        lock: Lock guarding the registry.
+
+    """
+
+    executors = {}
+    lock = threading.Lock()
+
+    @classmethod
+    def get(cls, VISA_ADDRESS):
+        """Returns the executor of an Instrument, creating it on first use"""
+        with cls.lock:
+            if VISA_ADDRESS not in cls.executors:
+                cls.executors[VISA_ADDRESS] = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix=f"VISA {VISA_ADDRESS}"
+                )
+
+            return cls.executors[VISA_ADDRESS]
+
+    @classmethod
+    def submit(cls, VISA_ADDRESS, fn, *args, **kwargs):
+        """Runs a function on the executor of an Instrument
+
+        Returns:
+            Returns the concurrent.futures.Future of the call.
+        """
+        return cls.get(VISA_ADDRESS).submit(fn, *args, **kwargs)
+
+    @classmethod
+    def map(cls, calls):
+        """Runs calls to several Instruments concurrently and waits for all of them
+
+        Args:
+            calls: List of tuples containing the VISA Address, the function and its arguments.
+
+        Returns:
+            Returns a list containing the result of every call in the same order.
+
+        Raises:
+            The first error raised by any of the calls, after every call has completed.
+        """
+        futures = [
+            cls.submit(VISA_ADDRESS, fn, *args) for VISA_ADDRESS, fn, *args in calls
+        ]
+        wait(futures)
+        return [future.result() for future in futures]
+
+    @classmethod
+    def shutdown(cls):
+        """Waits for every pending call and stops the executors"""
+        with cls.lock:
+            for executor in cls.executors.values():
+                executor.shutdown(wait=True)
+
+            cls.executors.clear()
+
+
+async def call(VISA_ADDRESS, fn, *args, **kwargs):
+    """Awaits a function run on the executor of an Instrument
+
+    Args:
+        VISA_ADDRESS: String Literal of VISA Address of the Instrument the function talks to.
+        fn: Function to run, e.g. a Subsystem with a command in its constructor such as TRG.
+    """
+    future = InstrumentExecutor.submit(VISA_ADDRESS, fn, *args, **kwargs)
+    return await asyncio.wrap_future(future)
+
+
+class AsyncSession(object):
+    """Awaitable write and query on the pooled VISA Session of an Instrument
+
+    Attributes:
+        VISA_ADDRESS: The string which contains the VISA Address of an Instrument.
+
+    """
+
+    def __init__(self, VISA_ADDRESS):
+        self.VISA_ADDRESS = VISA_ADDRESS
+
+    async def write(self, command):
+        instr = SessionPool.open(self.VISA_ADDRESS)
+        return await call(self.VISA_ADDRESS, instr.write, command)
+
+    async def query(self, command):
+        instr = SessionPool.open(self.VISA_ADDRESS)
+        return await call(self.VISA_ADDRESS, instr.query, command)
+
+
+class AsyncSubsystem(object):
+    """Awaitable counterpart of a SCPI Commands Subsystem
+
+    Every method of the Subsystem is returned as a coroutine function that runs the method on the
+    executor of the Instrument.
+
+    Attributes:
+        Subsystem: The Subsystem class, e.g. Keysight.Voltage.
+        VISA_ADDRESS: The string which contains the VISA Address of an Instrument.
+
+    """
+
+    def __init__(self, Subsystem, VISA_ADDRESS):
+        self.Subsystem = Subsystem
+        self.VISA_ADDRESS = VISA_ADDRESS
+
+    def __getattr__(self, name):
+        if not callable(getattr(self.Subsystem, name)):
+            raise AttributeError(name)
+
+        async def method(*args, **kwargs):
+            return await call(
+                self.VISA_ADDRESS,
+                lambda: getattr(self.Subsystem(self.VISA_ADDRESS), name)(*args, **kwargs),
+            )
+
+        return method
+
+
+def getAsyncClasses(module):
+    """Returns the awaitable counterpart of every Subsystem of a library
+
+    Args:
+        module: The library, e.g. Keysight.
+
+    Returns:
+        Returns a namespace where every Subsystem class is replaced by a function taking the VISA Address
+        and returning its AsyncSubsystem, e.g. getAsyncClasses(Keysight).Voltage(dict["DMM"]).
+    """
+    classes = {}
+    for name, value in vars(module).items():
+        if not isinstance(value, type):
+            continue
+
+        if any(base.__name__ in ("Subsystem", "IEEE_488") for base in value.__mro__[1:]):
+            classes[name] = lambda VISA_ADDRESS, Subsystem=value: AsyncSubsystem(
+                Subsystem, VISA_ADDRESS
+            )
+
+    return types.SimpleNamespace(**classes)
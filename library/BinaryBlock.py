@@ -0,0 +1,115 @@
+"""Library containing the binary transfer of readings and waveforms as IEEE 488.2 Definite Length Blocks.
+
+    In ASCII format every reading is formatted into text by the Instrument, transferred as roughly 16 bytes
+    and converted back with float() by the program. In binary format (e.g. FORM:DATA REAL,64 on the DMM or
+    WAV:FORM WORD on the Oscilloscope) the readings are transferred as packed bytes in a block with the
+    header #<number of digits><number of bytes>, e.g. #18<8 bytes>. The bytes of the block are decoded by
+    NumPy directly into an array, so there is no parsing of every single value in Python.
+
+"""
+
+import numpy
+
+
+# Datatype of every binary format mapped to the struct datatype used by PyVisa and the NumPy dtype
+DATATYPES = {
+    "REAL,64": ("d", "f8"),
+    "REAL,32": ("f", "f4"),
+    "REAL": ("d", "f8"),
+    "WORD": ("H", "u2"),
+    "BYTE": ("B", "u1"),
+}
+
+
+def getDatatype(mode):
+    """Returns the struct datatype and the NumPy dtype of a binary format
+
+    Args:
+        mode: String containing the binary format, e.g. "REAL,64", "WORD" or "BYTE".
+
+    Raises:
+        ValueError: The binary format is not supported.
+    """
+    key = str(mode).upper().replace(" ", "")
+    if key not in DATATYPES:
+        raise ValueError(f"Unsupported binary format: {mode}")
+
+    return DATATYPES[key]
+
+
+def query(instr, command, mode="REAL,64", is_big_endian=False):
+    """Queries an Instrument and decodes the Definite Length Block of the response into a NumPy array
+
+    Args:
+        instr: VISA Session of the Instrument.
+        command: String containing the SCPI Query, e.g. "FETC?".
+        mode: String containing the binary format the Instrument has been set to.
+        is_big_endian: Boolean determining the byte order of the block, which is little endian
+            (e.g. FORM:BORD SWAP) unless specified.
+
+    Returns:
+        Returns a NumPy array containing every value of the block.
+
+    Raises:
+        VisaIOError: An error occured when reading the block.
+    """
+    datatype, dtype = getDatatype(mode)
+    return instr.query_binary_values(
+        command,
+        datatype=datatype,
+        is_big_endian=is_big_endian,
+        container=numpy.array,
+    )
+
+
+def parse(block, mode="REAL,64", is_big_endian=False):
+    """Decodes the raw bytes of a Definite Length Block into a NumPy array
+
+    Args:
+        block: Bytes starting with the header of the block, a trailing termination character is ignored.
+        mode: String containing the binary format of the block.
+        is_big_endian: Boolean determining the byte order of the block.
+
+    Returns:
+        Returns a NumPy array containing every value of the block.
+
+    Raises:
+        ValueError: The bytes do not start with a valid header.
+    """
+    datatype, dtype = getDatatype(mode)
+    start = block.find(b"#")
+    if start < 0 or not block[start + 1 : start + 2].isdigit():
+        raise ValueError("Missing Definite Length Block header")
+
+    digits = int(block[start + 1 : start + 2])
+    if digits == 0:
+        # Indefinite Length Block, the data ends at the single NL terminating it, the bytes before it
+        # are data even when they have the value of a termination character
+        data = block[start + 2 :]
+        if data.endswith(b"\n"):
+            data = data[:-1]
+
+    else:
+        length = int(block[start + 2 : start + 2 + digits])
+        offset = start + 2 + digits
+        data = block[offset : offset + length]
+
+    return numpy.frombuffer(data, dtype=(">" if is_big_endian else "<") + dtype)
+
+
+def build(values, mode="REAL,64", is_big_endian=False):
+    """Encodes values into a Definite Length Block, the inverse of parse()
+
+    Args:
+        values: Sequence of values to encode.
+        mode: String containing the binary format of the block.
+        is_big_endian: Boolean determining the byte order of the block.
+
+    Returns:
+        Returns the bytes of the block including its header.
+    """
+    datatype, dtype = getDatatype(mode)
+    dtype = (">" if is_big_endian else "<") + dtype
+    data = numpy.asarray(values, dtype=dtype).tobytes()
+    length = str(len(data))
+    return f"#{len(length)}{length}".encode() + data
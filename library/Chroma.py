@@ -10,6 +10,7 @@
 """
 
 import pyvisa
+from SessionPool import SessionPool
 
 
 class Subsystem(object):
@@ -26,19 +27,18 @@ class Subsystem(object):
     def __init__(self, VISA_ADDRESS):
         """Initialize the instance where the Instrument is ready to receive commands
 
-        Object rm is created where the backend will find the shared VISA Library. VISA_Address are given as arguements to declare
-        which resources (in this case the instruments) to use.
+        The session is taken from the SessionPool where the backend will find the shared VISA Library. The
+        VISA Resource is only opened the first time its VISA Address is given, every other Subsystem reuses
+        the same session.
 
         Args:
             VISA_ADDRESS: String Literal of VISA Address of the Instrument
         """
 
         self.VISA_ADDRESS = VISA_ADDRESS
-        # ResourceManager Setup
-        rm = pyvisa.ResourceManager()
         try:
             # Visa Address is found under Keysight Connection Expert
-            self.instr = rm.open_resource(self.VISA_ADDRESS)
+            self.instr = SessionPool.open(self.VISA_ADDRESS)
 
         except pyvisa.VisaIOError as e:
             print(e.args)
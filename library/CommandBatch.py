@@ -0,0 +1,199 @@
+"""Library containing the coalescing of SCPI Commands into compound messages sent in one write per Instrument.
+
+    Every Subsystem method (e.g. Trigger.setSource, Voltage.setNPLC) is a separate write, and so a separate
+    bus transaction. Inside a CommandBatch, the sessions handed out by the SessionPool are replaced by a
+    BatchSession which collects the commands written to it instead of sending them. The commands are then
+    joined into compound SCPI messages (e.g. "CONF:VOLT:DC;:TRIG:SOUR BUS;:VOLT:NPLC 10") no longer than
+    the maximum length, and the last message of every Instrument ends with a single *OPC? barrier. Hence,
+    the setup of an Instrument costs a single round trip regardless of the number of settings. The batches
+    of different Instruments are sent concurrently on their executors (see AsyncDriver.py).
+
+    A query sent inside the batch flushes the commands collected so far before it is sent, so the order
+    of the commands is always kept. When the session is wrapped by a ShadowSession, the batch is placed
+    below it so that redundant commands are dropped before they are batched.
+
+"""
+
+from SessionPool import SessionPool
+from StateCache import ShadowSession
+from AsyncDriver import InstrumentExecutor
+
+
+class BatchSession(object):
+    """Session which collects the commands of a single Instrument while a CommandBatch is active
+
+    Every attribute that is not defined here (e.g. read_stb, timeout) is taken from the VISA Session,
+    after the commands collected so far have been sent.
+
+    Attributes:
+        instr: The VISA Session of the Instrument.
+        maxLength: Integer containing the longest compound message in characters.
+        commands: List containing the commands collected and not sent yet.
+        collected: Integer containing the number of commands collected by the batch.
+        messages: Integer containing the number of messages actually sent.
+        active: Boolean determining whether commands are collected, once the batch has ended the
+            commands are written straight to the VISA Session.
+
+    """
+
+    def __init__(self, instr, maxLength):
+        self.instr = instr
+        self.maxLength = int(maxLength)
+        self.commands = []
+        self.collected = 0
+        self.messages = 0
+        self.active = True
+
+    def write(self, command):
+        if not self.active:
+            return self.instr.write(command)
+
+        self.commands.append(str(command).strip())
+        self.collected += 1
+
+    def query(self, command):
+        self.flush()
+        self.messages += 1
+        return self.instr.query(command)
+
+    def __getattr__(self, name):
+        self.flush()
+        return getattr(self.instr, name)
+
+    def join(self):
+        """Joins the commands collected into compound messages no longer than the maximum length
+
+        Commands are separated by ";:" so that every command starts again from the root of the
+        command tree, and common commands (e.g. *CLS) are separated by ";" only.
+
+        Returns:
+            Returns a list containing the compound messages.
+        """
+        messages = []
+        message = ""
+        for command in self.commands:
+            separator = ";" if command.startswith(("*", ":")) else ";:"
+            length = len(message) + len(separator) + len(command)
+            if message and length <= self.maxLength:
+                message += separator + command
+
+            else:
+                if message:
+                    messages.append(message)
+
+                message = command
+
+        if message:
+            messages.append(message)
+
+        return messages
+
+    def flush(self, barrier=False):
+        """Sends the commands collected so far
+
+        Args:
+            barrier: Boolean determining whether *OPC? is appended to the last message, which returns
+                once the Instrument has executed every command.
+        """
+        messages = self.join()
+        self.commands = []
+
+        if barrier and messages:
+            last = messages.pop()
+            if len(last) + len(";*OPC?") <= self.maxLength:
+                messages.append(last + ";*OPC?")
+
+            else:
+                messages.extend([last, "*OPC?"])
+
+            for message in messages[:-1]:
+                self.instr.write(message)
+
+            self.instr.query(messages[-1])
+
+        else:
+            for message in messages:
+                self.instr.write(message)
+
+        self.messages += len(messages)
+
+
+class CommandBatch(object):
+    """Context in which the commands written to one or more Instruments are coalesced
+
+    Subsystems have to be declared inside the context to write into the batch, e.g.
+
+        with CommandBatch(dict["DMM"], dict["PSU"]):
+            Trigger(dict["DMM"]).setSource("BUS")
+            Voltage(dict["DMM"]).setNPLC(10)
+
+    Attributes:
+        VISA_ADDRESSES: Tuple containing the VISA Address of every Instrument batched.
+        maxLength: Integer containing the longest compound message in characters.
+        enabled: Boolean determining whether the commands are batched or sent one by one.
+        batches: Dictionary mapping the VISA Address to its BatchSession.
+
+    """
+
+    def __init__(self, *VISA_ADDRESSES, maxLength=256, enabled=True):
+        self.VISA_ADDRESSES = VISA_ADDRESSES
+        self.maxLength = maxLength
+        self.enabled = enabled
+        self.batches = {}
+
+    def __enter__(self):
+        if self.enabled:
+            with SessionPool.lock:
+                for VISA_ADDRESS in self.VISA_ADDRESSES:
+                    if VISA_ADDRESS in self.batches:
+                        continue
+
+                    instr = SessionPool.open(VISA_ADDRESS)
+                    if isinstance(instr, ShadowSession):
+                        batch = BatchSession(instr.instr, self.maxLength)
+                        instr.instr = batch
+
+                    else:
+                        batch = BatchSession(instr, self.maxLength)
+                        SessionPool.sessions[VISA_ADDRESS] = batch
+
+                    self.batches[VISA_ADDRESS] = batch
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with SessionPool.lock:
+            for VISA_ADDRESS, batch in self.batches.items():
+                instr = SessionPool.sessions.get(VISA_ADDRESS)
+                if isinstance(instr, ShadowSession):
+                    instr.instr = batch.instr
+
+                    # The shadow already holds the commands that are dropped below
+                    if exc_type is not None:
+                        instr.clear()
+
+                else:
+                    SessionPool.sessions[VISA_ADDRESS] = batch.instr
+
+        # Commands collected before an error are dropped instead of being sent half way
+        if exc_type is None:
+            InstrumentExecutor.map(
+                [
+                    (VISA_ADDRESS, batch.flush, True)
+                    for VISA_ADDRESS, batch in self.batches.items()
+                ]
+            )
+
+        for batch in self.batches.values():
+            batch.commands = []
+            batch.active = False
+
+    def report(self):
+        """Returns a summary of the commands collected and the messages sent for every Instrument"""
+        lines = ["Command Batch:"]
+        for VISA_ADDRESS, batch in self.batches.items():
+            lines.append(
+                f"  {VISA_ADDRESS}: {batch.collected} commands in {batch.messages} messages"
+            )
+
+        return "\n".join(lines)
@@ -7,6 +7,7 @@
 """
 
 import pyvisa
+from SessionPool import SessionPool
 
 
 class IEEE_488(object):
@@ -23,19 +24,18 @@ class IEEE_488(object):
     def __init__(self, VISA_ADDRESS):
         """Initialize the instance where the Instrument is ready to receive commands
 
-        Object rm is created where the backend will find the shared VISA Library. VISA_Address are given as arguements to declare
-        which resources (in this case the instruments) to use.
+        The session is taken from the SessionPool where the backend will find the shared VISA Library. The
+        VISA Resource is only opened the first time its VISA Address is given, every other Subsystem reuses
+        the same session.
 
         Args:
             VISA_ADDRESS: String Literal of VISA Address of the Instrument
         """
 
         self.VISA_ADDRESS = VISA_ADDRESS
-        # ResourceManager Setup
-        rm = pyvisa.ResourceManager()
         try:
             # Visa Address is found under Keysight Connection Expert
-            self.instr = rm.open_resource(self.VISA_ADDRESS)
+            self.instr = SessionPool.open(self.VISA_ADDRESS)
 
         except pyvisa.VisaIOError as e:
             print(e.args)
@@ -56,10 +56,10 @@ class ESE(IEEE_488):
         return self.instr.query("*ESE?")
 
     def write(self, *args):
-        if len(*args) == 0:
+        if len(args) == 0:
             self.instr.write("*ESE")
 
-        if len(*args) == 1:
+        if len(args) == 1:
             self.instr.write(f"*ESE {args[0]}")
 
 
@@ -67,6 +67,7 @@ class ESR(IEEE_488):
     def __init__(self, VISA_ADDRESS):
         super().__init__(VISA_ADDRESS)
 
+    def query(self):
         return self.instr.query("*ESR?")
 
 
@@ -119,10 +120,10 @@ class SRE(IEEE_488):
         return self.instr.query("*SRE?")
 
     def write(self, *args):
-        if len(*args) == 0:
+        if len(args) == 0:
             self.instr.write("*SRE")
 
-        if len(*args) == 1:
+        if len(args) == 1:
             self.instr.write(f"*SRE {args[0]}")
 
 
@@ -170,3 +171,130 @@ class SAV(IEEE_488):
     def write(self, *args):
         if len(*args) == 1:
             self.instr.write(f"*SAV {args[0]}")
+
+
+class OperationComplete(IEEE_488):
+    """Waits for the pending operations of an Instrument to complete without flooding the bus
+
+    The Operation Complete (OPC) bit of the Standard Event Status Register is enabled into the Event
+    Summary Bit (ESB) of the Status Byte using *ESE, and the ESB is enabled to request service using *SRE.
+    After *OPC is sent, the program either waits for the Service Request (SRQ) or reads the Status Byte
+    with a serial poll, which does not go through the SCPI parser of the Instrument. The interval between
+    serial polls grows by the back-off factor after every poll until it reaches the maximum interval.
+
+    Attributes:
+        method: String determining whether "SRQ" or "OPC" (serial poll of the Status Byte) is used.
+        interval: Float containing the first interval between polls in seconds.
+        backoff: Float multiplying the interval after every poll.
+        maxInterval: Float containing the longest interval between polls in seconds.
+        timeout: Float containing the longest time in seconds to wait for completion.
+        history: List containing the method, elapsed time and number of polls of every wait.
+
+    """
+
+    OPC_BIT = 1
+    ESB_BIT = 32
+
+    def __init__(
+        self,
+        VISA_ADDRESS,
+        method="OPC",
+        interval=0.001,
+        backoff=2,
+        maxInterval=0.05,
+        timeout=60,
+    ):
+        super().__init__(VISA_ADDRESS)
+
+        self.method = str(method).upper()
+        self.interval = float(interval)
+        self.backoff = float(backoff)
+        self.maxInterval = float(maxInterval)
+        self.timeout = float(timeout)
+        self.history = []
+
+    def arm(self):
+        """Enables the OPC bit into the Status Byte, and the Service Request event if SRQ is used
+
+        Interfaces which are unable to deliver Service Requests fall back to polling the Status Byte.
+        """
+        CLS(self.VISA_ADDRESS)
+        ESE(self.VISA_ADDRESS).write(self.OPC_BIT)
+        SRE(self.VISA_ADDRESS).write(self.ESB_BIT)
+
+        if self.method == "SRQ":
+            try:
+                self.instr.enable_event(
+                    pyvisa.constants.EventType.service_request,
+                    pyvisa.constants.EventMechanism.queue,
+                )
+
+            except (pyvisa.VisaIOError, AttributeError) as e:
+                print(e.args)
+                self.method = "OPC"
+
+    def wait(self, expected=0):
+        """Waits until every pending operation of the Instrument (e.g. INIT) has completed
+
+        Args:
+            expected: Float containing the expected duration in seconds (e.g. the integration time of
+                the DMM), which is waited before the first poll.
+
+        Returns:
+            Returns a dictionary containing the method used, the elapsed time and the number of polls.
+
+        Raises:
+            VisaIOError: The operations did not complete before the timeout.
+        """
+        start = SessionPool.now()
+        polls = 0
+        OPC(self.VISA_ADDRESS).write()
+
+        if self.method == "SRQ":
+            self.instr.wait_on_event(
+                pyvisa.constants.EventType.service_request, int(self.timeout * 1000)
+            )
+            # Serial poll to clear the Request Service bit of the Status Byte
+            self.instr.read_stb()
+            polls += 1
+
+        else:
+            if expected > 0:
+                SessionPool.sleep(expected)
+
+            interval = self.interval
+            while 1:
+                polls += 1
+                if self.instr.read_stb() & self.ESB_BIT:
+                    break
+
+                if SessionPool.now() - start > self.timeout:
+                    raise pyvisa.VisaIOError(pyvisa.constants.StatusCode.error_timeout)
+
+                SessionPool.sleep(interval)
+                interval = min(interval * self.backoff, self.maxInterval)
+
+        # Reading the Standard Event Status Register clears the OPC bit for the next wait
+        ESR(self.VISA_ADDRESS).query()
+
+        result = {
+            "method": self.method,
+            "elapsed": SessionPool.now() - start,
+            "polls": polls,
+        }
+        self.history.append(result)
+        return result
+
+    def report(self):
+        """Returns a summary of the time taken and the polls made by every wait"""
+        waits = len(self.history)
+        if waits == 0:
+            return f"{self.VISA_ADDRESS} ({self.method}): no completion waits"
+
+        elapsed = sum(x["elapsed"] for x in self.history)
+        polls = sum(x["polls"] for x in self.history)
+        return (
+            f"{self.VISA_ADDRESS} ({self.method}): {waits} completion waits, "
+            f"{polls} polls ({polls / waits:.1f} per wait), "
+            f"{elapsed / waits * 1000:.2f} ms per wait"
+        )
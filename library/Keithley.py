@@ -11,6 +11,8 @@
 
 
 import pyvisa
+from SessionPool import SessionPool
+import BinaryBlock
 
 
 class Subsystem(object):
@@ -27,19 +29,18 @@ class Subsystem(object):
     def __init__(self, VISA_ADDRESS):
         """Initialize the instance where the Instrument is ready to receive commands
 
-        Object rm is created where the backend will find the shared VISA Library. VISA_Address are given as arguements to declare
-        which resources (in this case the instruments) to use.
+        The session is taken from the SessionPool where the backend will find the shared VISA Library. The
+        VISA Resource is only opened the first time its VISA Address is given, every other Subsystem reuses
+        the same session.
 
         Args:
             VISA_ADDRESS: String Literal of VISA Address of the Instrument
         """
 
         self.VISA_ADDRESS = VISA_ADDRESS
-        # ResourceManager Setup
-        rm = pyvisa.ResourceManager()
         try:
             # Visa Address is found under Keysight Connection Expert
-            self.instr = rm.open_resource(self.VISA_ADDRESS)
+            self.instr = SessionPool.open(self.VISA_ADDRESS)
 
         except pyvisa.VisaIOError as e:
             print(e.args)
@@ -193,13 +194,22 @@ class Data(Subsystem):
     def datapoints(self):
         return self.instr.query("DATA:POIN? NVMEM")
 
+    def dataBinary(self, mode="REAL,64"):
+        return BinaryBlock.query(self.instr, "DATA:DATA? NVMEM", mode)
+
+    def removeBinary(self, num, mode="REAL,64", wait=False):
+        wait = ",WAIT" if wait else ""
+        return BinaryBlock.query(self.instr, f"DATA:REM? {num}{wait}", mode)
+
 
 class Delay(Subsystem):
     def __init__(self, VISA_ADDRESS):
         super().__init__(VISA_ADDRESS)
 
     def write(self, time):
-        self.instr.timeout = int(time)
+        # The session is shared through the SessionPool, so the settling time is waited on the
+        # host instead of being written into the timeout of the session.
+        SessionPool.sleep(float(time) / 1000)
 
     def inf(self):
         del self.instr.timeout
@@ -230,6 +240,9 @@ class Fetch(Subsystem):
     def query(self):
         return self.instr.query("FETC?")
 
+    def queryBinary(self, mode="REAL,64"):
+        return BinaryBlock.query(self.instr, "FETC?", mode)
+
     def query2(self, ChannelNumber, *args):
         if len(args) == 1:
             return self.instr.query(f"FETC:{args[0]}? (@{ChannelNumber})")
@@ -248,6 +261,22 @@ class Function(Subsystem):
         self.instr.write(f"FUNC {MODE} ,(@{ChannelNumber})")
 
 
+class Format(Subsystem):
+    """Child Class for Format Subsystem"""
+
+    def __init__(self, VISA_ADDRESS):
+        super().__init__(VISA_ADDRESS)
+
+    def setDataFormat(self, mode):
+        self.instr.write(f"FORM:DATA {mode}")
+
+    def queryDataFormat(self):
+        return self.instr.query("FORM:DATA?")
+
+    def setByteOrder(self, order):
+        self.instr.write(f"FORM:BORD {order}")
+
+
 class Initiate(Subsystem):
     """Child Class for Initiate Subsystem"""
 
@@ -480,7 +509,7 @@ class Sense(Subsystem):
     def setCapacitanceRange(self, range):
         self.instr.write(f"CAP:RANG {range}")
 
-    def enableCurrentDataLogging(self, state, ChannelNumber):
+    def enableVoltageDataLogging(self, state, ChannelNumber):
         self.instr.write(f"SENS:DLOG:FUNC:VOLT {state},(@{ChannelNumber})")
 
     def enableCurrentDataLogging(self, state, ChannelNumber):
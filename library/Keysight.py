@@ -10,6 +10,9 @@
 """
 
 import pyvisa
+from SessionPool import SessionPool
+import BinaryBlock
+import numpy
 
 
 class Subsystem(object):
@@ -26,19 +29,18 @@ class Subsystem(object):
     def __init__(self, VISA_ADDRESS):
         """Initialize the instance where the Instrument is ready to receive commands
 
-        Object rm is created where the backend will find the shared VISA Library. VISA_Address are given as arguements to declare
-        which resources (in this case the instruments) to use.
+        The session is taken from the SessionPool where the backend will find the shared VISA Library. The
+        VISA Resource is only opened the first time its VISA Address is given, every other Subsystem reuses
+        the same session.
 
         Args:
             VISA_ADDRESS: String Literal of VISA Address of the Instrument
         """
 
         self.VISA_ADDRESS = VISA_ADDRESS
-        # ResourceManager Setup
-        rm = pyvisa.ResourceManager()
         try:
             # Visa Address is found under Keysight Connection Expert
-            self.instr = rm.open_resource(self.VISA_ADDRESS)
+            self.instr = SessionPool.open(self.VISA_ADDRESS)
 
         except pyvisa.VisaIOError as e:
             print(e.args)
@@ -238,6 +240,26 @@ class Data(Subsystem):
     def datapoints(self):
         return self.instr.query("DATA:POIN? NVMEM")
 
+    def dataBinary(self, mode="REAL,64"):
+        return BinaryBlock.query(self.instr, "DATA:DATA? NVMEM", mode)
+
+    def removeBinary(self, num, mode="REAL,64", wait=False):
+        wait = ",WAIT" if wait else ""
+        return BinaryBlock.query(self.instr, f"DATA:REM? {num}{wait}", mode)
+
+
+class Digital(Subsystem):
+    """Child Class for Digital Subsystem"""
+
+    def __init__(self, VISA_ADDRESS):
+        super().__init__(VISA_ADDRESS)
+
+    def setPinFunction(self, function, PinNumber):
+        self.instr.write(f"DIG:PIN{PinNumber}:FUNC {function}")
+
+    def setPinPolarity(self, polarity, PinNumber):
+        self.instr.write(f"DIG:PIN{PinNumber}:POL {polarity}")
+
 
 class Display(Subsystem):
     """Child Class for Display Subsystem"""
@@ -274,6 +296,9 @@ class Fetch(Subsystem):
     def query(self):
         return self.instr.query("FETC?")
 
+    def queryBinary(self, mode="REAL,64"):
+        return BinaryBlock.query(self.instr, "FETC?", mode)
+
     def query2(self, ChannelNumber, *args):
         if len(args) == 1:
             return self.instr.query(f"FETC:{args[0]}? (@{ChannelNumber})")
@@ -304,6 +329,15 @@ class Format(Subsystem):
     def write(self, mode):
         self.instr.write(f"FORM:OUTP {mode}")
 
+    def setDataFormat(self, mode):
+        self.instr.write(f"FORM:DATA {mode}")
+
+    def queryDataFormat(self):
+        return self.instr.query("FORM:DATA?")
+
+    def setByteOrder(self, order):
+        self.instr.write(f"FORM:BORD {order}")
+
 
 class Initiate(Subsystem):
     """Child Class for Initiate Subsystem"""
@@ -323,6 +357,9 @@ class Initiate(Subsystem):
     def initiateContinuous(self, state, ChannelNumber):
         self.instr.write(f"INIT:CONT:TRAN {state},(@{ChannelNumber})")
 
+    def initiateTransient(self, ChannelNumber):
+        self.instr.write(f"INIT:TRAN (@{ChannelNumber})")
+
 
 class Output(Subsystem):
     """Child Class for Output Subsystem"""
@@ -377,7 +414,28 @@ class List(Subsystem):
         self.instr.write(f"LIST:CURR {list},(@{ChannelNumber})")
 
     def queryCurrentPoints(self, ChannelNumber):
-        self.instr.write(f"LIST:CURR:POIN? (@{ChannelNumber})")
+        return self.instr.query(f"LIST:CURR:POIN? (@{ChannelNumber})")
+
+    def setVoltageList(self, list, ChannelNumber):
+        self.instr.write(f"LIST:VOLT {list},(@{ChannelNumber})")
+
+    def queryVoltagePoints(self, ChannelNumber):
+        return self.instr.query(f"LIST:VOLT:POIN? (@{ChannelNumber})")
+
+    def setDwellList(self, list, ChannelNumber):
+        self.instr.write(f"LIST:DWEL {list},(@{ChannelNumber})")
+
+    def setStepMode(self, mode, ChannelNumber):
+        self.instr.write(f"LIST:STEP {mode},(@{ChannelNumber})")
+
+    def setTerminateLast(self, state, ChannelNumber):
+        self.instr.write(f"LIST:TERM:LAST {state},(@{ChannelNumber})")
+
+    def setBeginStepTriggerOutput(self, list, ChannelNumber):
+        self.instr.write(f"LIST:TOUT:BOST {list},(@{ChannelNumber})")
+
+    def setEndStepTriggerOutput(self, list, ChannelNumber):
+        self.instr.write(f"LIST:TOUT:EOST {list},(@{ChannelNumber})")
 
 
 class LXI(Subsystem):
@@ -435,7 +493,7 @@ class Measure(Subsystem):
 
     def multipleChannelQuery(self, ChannelNumber, *args):
         if len(args) == 1:
-            return self.instr.query(f"MEAS:{args}? (@{ChannelNumber})")
+            return self.instr.query(f"MEAS:{args[0]}? (@{ChannelNumber})")
 
         elif len(args) == 2:
             return self.instr.query(f"MEAS:{args[0]}:{args[1]}?(@{ChannelNumber})")
@@ -471,6 +529,10 @@ class MMemory(Subsystem):
     def exportData(self, filename):
         self.instr.write(f"MMEM:EXP:DLOG {filename}")
 
+    def getData(self, filename):
+        # The file is read back in a single Definite Length Block
+        return BinaryBlock.query(self.instr, f"MMEM:DATA? {filename}", "BYTE").tobytes()
+
 
 class Power(Subsystem):
     """Child Class for Power Subsystem"""
@@ -532,7 +594,9 @@ class Delay(Subsystem):
         super().__init__(VISA_ADDRESS)
 
     def write(self, time):
-        self.instr.timeout = int(time)
+        # The session is shared through the SessionPool, so the settling time is waited on the
+        # host instead of being written into the timeout of the session.
+        SessionPool.sleep(float(time) / 1000)
 
     def inf(self):
         del self.instr.timeout
@@ -660,7 +724,7 @@ class Sense(Subsystem):
     def setCapacitanceRange(self, range):
         self.instr.write(f"CAP:RANG {range}")
 
-    def enableCurrentDataLogging(self, state, ChannelNumber):
+    def enableVoltageDataLogging(self, state, ChannelNumber):
         self.instr.write(f"SENS:DLOG:FUNC:VOLT {state},(@{ChannelNumber})")
 
     def enableCurrentDataLogging(self, state, ChannelNumber):
@@ -870,6 +934,18 @@ class Trigger(Subsystem):
     def setTriggerDelay(self, time):
         self.instr.write(f"TRIG:DEL {time}")
 
+    def setTransientSource(self, source, ChannelNumber):
+        self.instr.write(f"TRIG:TRAN:SOUR {source},(@{ChannelNumber})")
+
+    def triggerTransient(self, ChannelNumber):
+        self.instr.write(f"TRIG:TRAN (@{ChannelNumber})")
+
+    def setDLogSource(self, source):
+        self.instr.write(f"TRIG:DLOG:SOUR {source}")
+
+    def triggerDLog(self):
+        self.instr.write("TRIG:DLOG")
+
 
 class Unit(Subsystem):
     """Child Class for Unit Subsystem"""
@@ -1028,3 +1104,55 @@ class Oscilloscope(Subsystem):
 
     def setVerticalOffset(self, value, ChannelNumber):
         self.instr.write(f"CHANNEL{ChannelNumber}:OFFSET {value}")
+
+    def setWaveformSource(self, ChannelNumber):
+        self.instr.write(f"WAVEFORM:SOURCE CHANNEL{ChannelNumber}")
+
+    def setWaveformFormat(self, mode):
+        self.instr.write(f"WAVEFORM:FORMAT {mode}")
+
+    def setWaveformByteOrder(self, order):
+        self.instr.write(f"WAVEFORM:BYTEORDER {order}")
+
+    def setWaveformUnsigned(self, state):
+        self.instr.write(f"WAVEFORM:UNSIGNED {state}")
+
+    def setWaveformPointsMode(self, mode):
+        self.instr.write(f"WAVEFORM:POINTS:MODE {mode}")
+
+    def setWaveformPoints(self, value):
+        self.instr.write(f"WAVEFORM:POINTS {value}")
+
+    def getWaveformPreamble(self):
+        return self.instr.query("WAVEFORM:PREAMBLE?")
+
+    def getWaveformData(self, mode="WORD"):
+        return BinaryBlock.query(self.instr, "WAVEFORM:DATA?", mode)
+
+    def getWaveform(self, ChannelNumber, mode="WORD"):
+        """Reads a waveform in binary format and scales it into time and voltage arrays
+
+        The waveform is transferred as unsigned WORD (or BYTE) values in least significant byte first
+        order and scaled with the origin, increment and reference of the preamble using NumPy.
+
+        Args:
+            ChannelNumber: Integer containing the channel number of the waveform.
+            mode: String determining whether "WORD" or "BYTE" is transferred.
+
+        Returns:
+            Returns two NumPy arrays, the time in seconds and the voltage of every point.
+        """
+        self.setWaveformSource(ChannelNumber)
+        self.setWaveformFormat(mode)
+        self.setWaveformByteOrder("LSBFIRST")
+        self.setWaveformUnsigned("ON")
+
+        preamble = [float(x) for x in self.getWaveformPreamble().split(",")]
+        x_increment, x_origin, x_reference = preamble[4:7]
+        y_increment, y_origin, y_reference = preamble[7:10]
+
+        data = self.getWaveformData(mode)
+        index = numpy.arange(len(data))
+        time = (index - x_reference) * x_increment + x_origin
+        voltage = (data - y_reference) * y_increment + y_origin
+        return time, voltage
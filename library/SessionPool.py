@@ -0,0 +1,193 @@
+"""Library containing the process-wide pool of VISA Sessions shared by every SCPI Commands Subsystem.
+
+    Every Subsystem (e.g. Voltage, Fetch, Output) used to create its own Resource Manager and open the
+    VISA Resource again whenever it was declared, which meant hundreds of opens during a single sweep.
+    The pool opens each Instrument once, keyed by its VISA Address, and hands the same session to every
+    Subsystem that asks for it. The sessions stay open across DUT Tests, so that the shadow of every
+    Instrument is kept from one DUT Test to the next, and are closed when the process exits (or by closeAll,
+    e.g. before switching to another backend). A session is only opened again after close, i.e. on a
+    reconnect.
+
+    Every session is wrapped by a ShadowSession (see StateCache.py) unless stateCache is disabled, so that
+    writes of values the Instrument already holds are not sent again.
+
+    The backend is the VISA Library found by PyVisa unless specified. Setting backend to "@sim" opens every
+    VISA Address as a simulated Instrument (see Simulator.py), so the DUT Tests run without any hardware.
+
+"""
+
+import atexit
+import threading
+import pyvisa
+from time import perf_counter, sleep
+from StateCache import ShadowSession
+import Simulator
+
+
+class SessionPool(object):
+    """Process-wide pool of VISA Sessions keyed by VISA Address
+
+    The class is never instantiated, the pool is shared by the whole process through class attributes.
+
+    Attributes:
+        rm: Resource Manager shared by every session in the pool.
+        sessions: Dictionary mapping the VISA Address to the opened VISA Session.
+        opened: Dictionary counting how many times each VISA Address was actually opened.
+        requested: Dictionary counting how many times a session was requested for each VISA Address.
+        lock: Lock guarding the pool when sessions are requested from several threads.
+        stateCache: Boolean determining whether the sessions are wrapped by a ShadowSession.
+        backend: String containing the PyVisa backend (e.g. "@py"), "@sim" for the simulator.
+        timeScale: Float containing the real seconds per simulated second of the simulator, 0 for
+            virtual time.
+
+    """
+
+    rm = None
+    sessions = {}
+    opened = {}
+    requested = {}
+    lock = threading.RLock()
+    stateCache = True
+    backend = ""
+    timeScale = 0
+
+    @classmethod
+    def resourceManager(cls):
+        """Returns the shared Resource Manager, creating it on first use"""
+        with cls.lock:
+            if cls.rm is None:
+                if cls.backend == "@sim":
+                    cls.rm = Simulator.ResourceManager(timeScale=cls.timeScale)
+
+                elif cls.backend:
+                    cls.rm = pyvisa.ResourceManager(cls.backend)
+
+                else:
+                    cls.rm = pyvisa.ResourceManager()
+
+            return cls.rm
+
+    @classmethod
+    def open(cls, VISA_ADDRESS):
+        """Returns the session of an Instrument, opening the VISA Resource only if it is not open yet
+
+        Args:
+            VISA_ADDRESS: String Literal of VISA Address of the Instrument
+
+        Returns:
+            The VISA Session shared by every Subsystem of the Instrument.
+
+        Raises:
+            VisaIOError: An error occured when opening PyVisa Resources
+        """
+        with cls.lock:
+            cls.requested[VISA_ADDRESS] = cls.requested.get(VISA_ADDRESS, 0) + 1
+
+            if VISA_ADDRESS not in cls.sessions:
+                instr = cls.resourceManager().open_resource(VISA_ADDRESS)
+                if cls.stateCache:
+                    instr = ShadowSession(instr)
+
+                cls.sessions[VISA_ADDRESS] = instr
+                cls.opened[VISA_ADDRESS] = cls.opened.get(VISA_ADDRESS, 0) + 1
+
+            return cls.sessions[VISA_ADDRESS]
+
+    @classmethod
+    def close(cls, VISA_ADDRESS):
+        """Closes the session of a single Instrument, the next request will open it again
+
+        Args:
+            VISA_ADDRESS: String Literal of VISA Address of the Instrument
+        """
+        with cls.lock:
+            session = cls.sessions.pop(VISA_ADDRESS, None)
+
+            if session is not None:
+                try:
+                    session.close()
+
+                except pyvisa.VisaIOError as e:
+                    print(e.args)
+
+    @classmethod
+    def closeAll(cls):
+        """Closes every session in the pool followed by the Resource Manager"""
+        with cls.lock:
+            for VISA_ADDRESS in list(cls.sessions):
+                cls.close(VISA_ADDRESS)
+
+            if cls.rm is not None:
+                cls.rm.close()
+                cls.rm = None
+
+    @classmethod
+    def sleep(cls, seconds):
+        """Waits on the host, e.g. for the settling time of an Instrument
+
+        The simulator in virtual time only advances its clock, so waiting costs no real time. The wait is
+        accounted as settling time by the simulator.
+
+        Args:
+            seconds: Float containing the time to wait in seconds.
+        """
+        if isinstance(cls.rm, Simulator.ResourceManager):
+            cls.rm.bench.wait(seconds)
+
+        else:
+            sleep(seconds)
+
+    @classmethod
+    def now(cls):
+        """Returns the time in seconds on the clock of the Instruments, used to time waits
+
+        Returns:
+            Returns the simulated time when the simulator is used, otherwise the host performance counter.
+        """
+        if isinstance(cls.rm, Simulator.ResourceManager):
+            return cls.rm.bench.clock.now()
+
+        return perf_counter()
+
+    @classmethod
+    def savedOpens(cls):
+        """Returns a dictionary with the number of opens saved by the pool for each VISA Address"""
+        with cls.lock:
+            return {
+                VISA_ADDRESS: count - cls.opened.get(VISA_ADDRESS, 0)
+                for VISA_ADDRESS, count in cls.requested.items()
+            }
+
+    @classmethod
+    def report(cls):
+        """Returns a summary of the opens saved by the pool since the statistics were last reset"""
+        saved = cls.savedOpens()
+        lines = ["VISA Session Pool:"]
+
+        for VISA_ADDRESS, count in saved.items():
+            lines.append(
+                f"  {VISA_ADDRESS}: {cls.opened.get(VISA_ADDRESS, 0)} opened, {count} opens saved"
+            )
+
+        lines.append(f"  Total opens saved: {sum(saved.values())}")
+
+        for VISA_ADDRESS, instr in cls.sessions.items():
+            if isinstance(instr, ShadowSession):
+                lines.append(f"  {VISA_ADDRESS}: {instr.report()}")
+
+        return "\n".join(lines)
+
+    @classmethod
+    def resetStatistics(cls):
+        """Clears the open and write counters, usually done at the start of every DUT Test"""
+        with cls.lock:
+            cls.opened.clear()
+            cls.requested.clear()
+
+            for instr in cls.sessions.values():
+                if isinstance(instr, ShadowSession):
+                    instr.sent = 0
+                    instr.suppressed = 0
+
+
+atexit.register(SessionPool.closeAll)
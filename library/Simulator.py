@@ -0,0 +1,1287 @@
+"""Library containing a simulated backend for the Instruments, used to run the DUT Tests without any hardware.
+
+    The simulator replaces the VISA Library behind the SessionPool. It is selected with
+
+        SessionPool.backend = "@sim"
+
+    after which the VISA Addresses of the DUT Test are opened as simulated Instruments sharing a single
+    Bench. The Bench models the DUT (a power supply with gain and offset errors, output resistance and
+    reading noise), the ELoad drawing from it, the DMM measuring it and the Oscilloscope capturing its
+    transients. The role of every VISA Address is either given through Bench.assign(dict) or inferred
+    from the first command that only one kind of Instrument understands (e.g. APPL for the PSU).
+
+    Every transaction is charged with the latency of the interface found in the VISA Address (GPIB, USB,
+    TCPIP or ASRL) and the time taken by the Instrument to execute every command. Time is kept by a Clock
+    which either sleeps (timeScale 1 is real time, 0.1 is ten times faster) or, with timeScale 0, only
+    advances a virtual clock so that a DUT Test runs as fast as the host allows while the bus time it
+    would have taken is still reported.
+
+    Only the SCPI Commands used by Keysight.py, Keithley.py, Chroma.py and IEEEStandard.py are modelled,
+    other commands are accepted and counted as unknown, other queries return 0.
+
+"""
+
+import math
+import re
+from time import perf_counter, sleep
+
+import numpy
+import pyvisa
+import BinaryBlock
+
+
+# Latency of every interface in seconds, the turnaround is charged on every query and the throughput
+# in bytes per second is charged on the bytes transferred in both directions
+LATENCY = {
+    "GPIB": {"transaction": 0.4e-3, "turnaround": 0.6e-3, "throughput": 1.0e6},
+    "USB": {"transaction": 0.15e-3, "turnaround": 0.3e-3, "throughput": 20.0e6},
+    "TCPIP": {"transaction": 0.5e-3, "turnaround": 0.7e-3, "throughput": 10.0e6},
+    "ASRL": {"transaction": 1.0e-3, "turnaround": 2.0e-3, "throughput": 960.0},
+}
+
+# Time taken by the Instrument to parse and execute a single command of a message
+COMMAND_TIME = 50e-6
+
+# Behaviour of the simulated DUT
+DUT = {
+    "VoltageGain": 1e-4,
+    "VoltageOffset": 1e-3,
+    "VoltageNoise": 20e-6,
+    "CurrentGain": 2e-4,
+    "CurrentOffset": 1e-3,
+    "CurrentNoise": 10e-6,
+    "OutputResistance": 2e-3,
+    "SettlingTime": 5e-3,
+    "RiseTime": 0.5e-3,
+    "FallTime": 0.8e-3,
+    "Overshoot": 0.02,
+}
+
+# Ranges of the simulated DMM and its noise floor at 1 NPLC as a fraction of the range, a reading above
+# 120% of the range overloads
+METER = {
+    "VOLT": {"Ranges": (0.1, 1, 10, 100, 1000), "RangeNoise": 1e-6},
+    "CURR": {"Ranges": (1e-4, 1e-3, 1e-2, 0.1, 1, 3, 10), "RangeNoise": 5e-6},
+}
+OVERLOAD = 9.9e37
+
+# Long forms of the nodes used by the libraries, mapped to their short forms
+SHORT = {
+    "VOLTAGE": "VOLT",
+    "CURRENT": "CURR",
+    "CONFIGURE": "CONF",
+    "INITIATE": "INIT",
+    "TRIGGER": "TRIG",
+    "SOURCE": "SOUR",
+    "OUTPUT": "OUTP",
+    "MEASURE": "MEAS",
+    "WAVEFORM": "WAV",
+    "TIMEBASE": "TIM",
+    "PREAMBLE": "PRE",
+    "FORMAT": "FORM",
+    "POINTS": "POIN",
+    "RISETIME": "RIS",
+    "FALLTIME": "FALL",
+    "SINGLE": "SING",
+    "SENSE": "SENS",
+    "FETCH": "FETC",
+}
+
+# Headers marking the phase of the DUT Test a transaction belongs to, fetch is checked before measure
+# so that the measurements read back from the Oscilloscope count as fetched. Synchronization with the
+# DMM counts as measure, with any other Instrument as settle, anything else is setup.
+PHASES = ("setup", "settle", "measure", "fetch")
+FETCH = (
+    "FETC",
+    "DATA:REM",
+    "MMEM:DATA",
+    "WAV:DATA",
+    "WAV:PRE",
+    "MEAS:RIS",
+    "MEAS:FALL",
+    "MEAS:VMAX",
+)
+MEASURE = ("INIT", "*TRG", "TRIG:TRAN", "READ", "MEAS", "SING", "DIG")
+SYNC = ("*WAI", "*OPC", "*ESR", "*STB")
+
+NUMBER = re.compile(r"[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?")
+CHANNEL = re.compile(r"\(@([^)]*)\)")
+
+
+def getInterface(VISA_ADDRESS):
+    """Returns the interface of a VISA Address, e.g. "GPIB" for GPIB0::22::INSTR"""
+    for interface in LATENCY:
+        if str(VISA_ADDRESS).upper().startswith(interface):
+            return interface
+
+    return "USB"
+
+
+def normalize(header):
+    """Returns the header in upper case short form without the leading colon, e.g. VOLT:DC:NPLC"""
+    nodes = header.strip().lstrip(":").upper().split(":")
+    return ":".join(SHORT.get(node, node) for node in nodes)
+
+
+def split(message):
+    """Splits a compound message into its commands, ignoring semicolons inside quoted strings"""
+    commands = []
+    command = ""
+    quoted = False
+    for character in message:
+        if character == '"':
+            quoted = not quoted
+
+        if character == ";" and not quoted:
+            commands.append(command)
+            command = ""
+
+        else:
+            command += character
+
+    commands.append(command)
+    return [x.strip() for x in commands if x.strip()]
+
+
+def getNumbers(args):
+    return [float(x.group(0)) for x in NUMBER.finditer(CHANNEL.sub("", args))]
+
+
+def getChannel(args):
+    match = CHANNEL.search(args)
+    if match:
+        return int(match.group(1).split(",")[0].split(":")[0])
+
+    match = re.search(r"CH(ANNEL)?\s*(\d+)", args.upper())
+    if match:
+        return int(match.group(2))
+
+    return None
+
+
+def getChannels(args):
+    """Returns every channel of a channel list, e.g. [1, 2, 3, 4] for (@1,2) or (@1:4), or [None]"""
+    match = CHANNEL.search(args)
+    if not match:
+        return [getChannel(args)]
+
+    channels = []
+    for item in match.group(1).split(","):
+        first, _, last = item.partition(":")
+        if first.strip().isdigit():
+            channels.extend(range(int(first), int(last or first) + 1))
+
+    return channels or [None]
+
+
+def getState(args):
+    value = args.upper().split(",")[0].strip()
+    return value in ("ON", "1")
+
+
+class Clock(object):
+    """Clock shared by every simulated Instrument of a Bench
+
+    Attributes:
+        timeScale: Float containing the real seconds slept for every simulated second, 0 for virtual time.
+        virtual: Float containing the simulated time in seconds when virtual time is used.
+
+    """
+
+    def __init__(self, timeScale=0):
+        self.timeScale = float(timeScale)
+        self.virtual = 0.0
+        self.start = perf_counter()
+
+    def now(self):
+        if self.timeScale > 0:
+            return (perf_counter() - self.start) / self.timeScale
+
+        return self.virtual
+
+    def advance(self, seconds):
+        if seconds <= 0:
+            return
+
+        if self.timeScale > 0:
+            sleep(seconds * self.timeScale)
+
+        else:
+            self.virtual += seconds
+
+    def waitUntil(self, time):
+        # Waiting for an operation that never completes (e.g. a trigger that is never sent)
+        if math.isinf(time):
+            raise pyvisa.VisaIOError(pyvisa.constants.StatusCode.error_timeout)
+
+        self.advance(time - self.now())
+
+
+class DMM(object):
+    """Simulated Digital Multimeter measuring the output of the DUT"""
+
+    def __init__(self, bench):
+        self.bench = bench
+        self.reset()
+
+    def reset(self):
+        self.function = "VOLT"
+        self.nplc = 10.0
+        self.range = {"VOLT": None, "CURR": None}
+        self.autoZero = True
+        self.lineFrequency = 50.0
+        self.source = "IMM"
+        self.triggerCount = 1
+        self.sampleCount = 1
+        self.remaining = 0
+        self.readings = []
+        self.times = []
+        self.done = 0.0
+        self.format = "ASC"
+        self.bigEndian = True
+
+    def measureTime(self):
+        time = self.nplc / self.lineFrequency + 0.5e-3
+        return time * 2 if self.autoZero else time
+
+    def busyUntil(self):
+        # An initiated measurement waiting for triggers never completes on its own
+        if self.remaining > 0:
+            return math.inf
+
+        return self.done
+
+    def sample(self, delay=0.0):
+        for i in range(self.sampleCount):
+            start = max(self.bench.clock.now() + delay, self.done)
+            self.done = start + self.measureTime()
+            self.times.append(self.done)
+            self.readings.append(
+                self.bench.reading(
+                    self.function, self.nplc, self.range[self.function], delay
+                )
+            )
+
+    def initiate(self):
+        self.readings = []
+        self.times = []
+        self.remaining = self.triggerCount
+        if self.source not in ("BUS", "EXT"):
+            while self.remaining > 0:
+                self.remaining -= 1
+                self.sample()
+
+    def trigger(self, instrument, delay=0.0):
+        if self.remaining <= 0 or self.bench.clock.now() < self.done:
+            # A trigger received while measuring or not initiated is ignored
+            if instrument is not None:
+                instrument.errors.append('-211,"Trigger ignored"')
+
+            return
+
+        self.remaining -= 1
+        self.sample(delay)
+
+    def fetch(self, instrument):
+        if self.remaining > 0:
+            raise pyvisa.VisaIOError(pyvisa.constants.StatusCode.error_timeout)
+
+        self.bench.clock.waitUntil(self.done)
+        return self.respond(self.readings)
+
+    def remove(self, count, wait, instrument):
+        # Without WAIT only the readings completed so far can be removed, as on the 34465A
+        if wait and count > 0:
+            self.bench.clock.waitUntil(
+                self.times[count - 1] if count <= len(self.times) else math.inf
+            )
+
+        elif sum(1 for x in self.times if x <= self.bench.clock.now()) < count:
+            instrument.errors.append('-222,"Data out of range"')
+            return self.respond([])
+
+        readings = self.readings[:count]
+        self.readings = self.readings[count:]
+        self.times = self.times[count:]
+        return self.respond(readings)
+
+    def respond(self, readings):
+        if self.format.startswith("REAL"):
+            return BinaryBlock.build(readings, "REAL,64", self.bigEndian)
+
+        return ",".join(f"{x:+.15E}" for x in readings)
+
+    def write(self, header, args, instrument):
+        if header.startswith("CONF"):
+            self.function = "CURR" if "CURR" in header else "VOLT"
+            self.source = "IMM"
+            self.triggerCount = 1
+            self.sampleCount = 1
+            self.autoZero = True
+            self.range = {"VOLT": None, "CURR": None}
+
+        elif header.endswith("RANG:AUTO") and ":AC" not in header:
+            if getState(args):
+                self.range["CURR" if "CURR" in header else "VOLT"] = None
+
+        elif header.endswith("RANG") and ":AC" not in header:
+            self.range["CURR" if "CURR" in header else "VOLT"] = getNumbers(args)[0]
+
+        elif header.endswith("NPLC"):
+            self.nplc = getNumbers(args)[0]
+
+        elif header.endswith("ZERO:AUTO"):
+            self.autoZero = getState(args)
+
+        elif header == "TRIG:SOUR":
+            self.source = args.strip().upper()[:3]
+
+        elif header == "TRIG:COUN":
+            self.triggerCount = int(getNumbers(args)[0])
+
+        elif header == "SAMP:COUN":
+            self.sampleCount = int(getNumbers(args)[0])
+
+        elif header == "INIT":
+            self.initiate()
+
+        elif header == "FORM:DATA":
+            self.format = args.strip().upper()
+
+        elif header == "FORM:BORD":
+            self.bigEndian = args.strip().upper().startswith("NORM")
+
+        elif header == "SYST:LFR":
+            self.lineFrequency = getNumbers(args)[0]
+
+    def query(self, header, args, instrument):
+        if header == "FETC":
+            return self.fetch(instrument)
+
+        if header == "READ":
+            self.initiate()
+            return self.fetch(instrument)
+
+        if header == "DATA:REM":
+            wait = "WAIT" in args.upper()
+            return self.remove(int(getNumbers(args)[0]), wait, instrument)
+
+        if header == "R":
+            return self.remove(len(self.readings), True, instrument)
+
+        if header in ("DATA:POIN", "DATA:POIN:NVMEM"):
+            return str(len(self.readings))
+
+        if header == "STAT:OPER:COND":
+            return "0" if self.bench.clock.now() >= self.busyUntil() else "16"
+
+        if header.startswith("MEAS"):
+            self.function = "CURR" if "CURR" in header else "VOLT"
+            self.source = "IMM"
+            self.triggerCount = 1
+            self.initiate()
+            return self.fetch(instrument)
+
+        if header == "TRIG:COUN":
+            return str(self.triggerCount)
+
+        if header == "TRIG:SOUR":
+            return self.source
+
+        return None
+
+
+class PSU(object):
+    """Simulated DUT, a power supply whose channels are programmed with APPL, VOLT, CURR and OUTP
+
+    The mainframe of the DUT also has a datalogger (SENS:DLOG, INIT:DLOG and TRIG:DLOG) logging the
+    voltage and current of a channel every period for the duration of the log. The log is exported to
+    a CSV file held in the memory of the mainframe (MMEM:EXP:DLOG) and read back with MMEM:DATA?.
+    """
+
+    def __init__(self, bench):
+        self.bench = bench
+        self.files = {}
+        self.reset()
+
+    def reset(self):
+        self.channels = {}
+        self.transitions = []
+        self.dlog = {
+            "VOLT": False,
+            "CURR": False,
+            "channel": None,
+            "period": 0.1,
+            "time": 1.0,
+            "source": "IMM",
+            "armed": False,
+            "start": None,
+            "samples": [],
+        }
+
+    def log(self):
+        """Appends the samples of the datalogger completed so far
+
+        The output of the DUT only changes on a command, hence the samples are appended before every
+        command is executed.
+        """
+        start = self.dlog["start"]
+        if start is None:
+            return
+
+        elapsed = min(self.bench.clock.now() - start, self.dlog["time"])
+        count = int(elapsed / self.dlog["period"] + 1e-9)
+        samples = self.dlog["samples"]
+        while len(samples) < count:
+            voltage, current = self.bench.output(self.dlog["channel"])
+            samples.append(
+                (
+                    voltage + self.bench.rng.normal(0, DUT["VoltageNoise"]),
+                    current + self.bench.rng.normal(0, DUT["CurrentNoise"]),
+                )
+            )
+
+    def export(self, filename):
+        """Exports the log to a CSV file in the format of the mainframe"""
+        self.log()
+        channel = self.dlog["channel"] or 1
+        columns = [x for x in ("VOLT", "CURR") if self.dlog[x]]
+        names = {"VOLT": f"Volt avg {channel}", "CURR": f"Curr avg {channel}"}
+        lines = ["Sample," + ",".join(names[x] for x in columns)]
+        for i, (voltage, current) in enumerate(self.dlog["samples"]):
+            values = {"VOLT": voltage, "CURR": current}
+            lines.append(f"{i + 1}," + ",".join(f"{values[x]:+.6E}" for x in columns))
+
+        self.files[filename] = ("\n".join(lines) + "\n").encode()
+
+    def getChannel(self, number):
+        if number is not None:
+            self.bench.channels.setdefault("PSU", number)
+
+        number = number or self.bench.channels.get("PSU") or 1
+        if number not in self.channels:
+            self.channels[number] = {"VOLT": 0.0, "CURR": 0.0, "OUTP": False}
+
+        return self.channels[number]
+
+    def change(self, channel, key, value):
+        before = self.bench.output()[0]
+        channel[key] = value
+        after = self.bench.output()[0]
+        if before != after:
+            self.transitions.append((self.bench.clock.now(), before, after))
+            self.transitions = self.transitions[-16:]
+
+    def write(self, header, args, instrument):
+        number = getChannel(args)
+        numbers = getNumbers(re.sub(r"CH(ANNEL)?\s*\d+", "", args, flags=re.I))
+
+        if header.startswith("SENS:DLOG:FUNC:"):
+            self.dlog[header.split(":")[-1]] = getState(args)
+            self.dlog["channel"] = number or self.dlog["channel"]
+
+        elif header == "SENS:DLOG:PER" and numbers:
+            self.dlog["period"] = numbers[0]
+
+        elif header == "SENS:DLOG:TIME" and numbers:
+            self.dlog["time"] = numbers[0]
+
+        elif header == "TRIG:DLOG:SOUR":
+            self.dlog["source"] = args.strip().upper()[:3]
+
+        elif header == "INIT:DLOG":
+            self.dlog["samples"] = []
+            self.dlog["start"] = None
+            self.dlog["armed"] = self.dlog["source"] != "IMM"
+            if not self.dlog["armed"]:
+                self.dlog["start"] = self.bench.clock.now()
+
+        elif header == "TRIG:DLOG" and self.dlog["armed"]:
+            self.dlog["armed"] = False
+            self.dlog["start"] = self.bench.clock.now()
+
+        elif header == "ABOR:DLOG":
+            self.log()
+            self.dlog["armed"] = False
+            self.dlog["start"] = None
+
+        elif header == "MMEM:EXP:DLOG":
+            self.export(args.strip())
+
+        elif header == "APPL":
+            channel = self.getChannel(number)
+            if len(numbers) > 0:
+                self.change(channel, "VOLT", numbers[0])
+
+            if len(numbers) > 1:
+                self.change(channel, "CURR", numbers[1])
+
+        elif header in ("VOLT", "CURR") and numbers:
+            for number in getChannels(args):
+                self.change(self.getChannel(number), header, numbers[0])
+
+        elif header == "OUTP":
+            if number is None:
+                for key in list(self.channels) or [None]:
+                    self.change(self.getChannel(key), "OUTP", getState(args))
+
+            else:
+                for number in getChannels(args):
+                    self.change(self.getChannel(number), "OUTP", getState(args))
+
+    def query(self, header, args, instrument):
+        if header == "MMEM:DATA":
+            data = self.files.get(args.strip(), b"")
+            return BinaryBlock.build(numpy.frombuffer(data, dtype=numpy.uint8), "BYTE")
+
+        # The readback of every channel in the list is returned in a single response
+        values = []
+        for number in getChannels(args):
+            voltage, current = self.bench.output(number)
+            if header.startswith("MEAS:VOLT"):
+                values.append(voltage + self.bench.rng.normal(0, DUT["VoltageNoise"]))
+
+            elif header.startswith("MEAS:CURR"):
+                values.append(current + self.bench.rng.normal(0, DUT["CurrentNoise"]))
+
+            else:
+                return None
+
+        return ",".join(f"{x:+.6E}" for x in values)
+
+
+class ELoad(object):
+    """Simulated Electronic Load drawing a constant current or holding a constant voltage"""
+
+    def __init__(self, bench):
+        self.bench = bench
+        self.reset()
+
+    def reset(self):
+        self.channels = {}
+        self.pins = {}
+
+    def getChannel(self, number):
+        if number is not None:
+            self.bench.channels.setdefault("ELoad", number)
+
+        number = number or self.bench.channels.get("ELoad") or 1
+        if number not in self.channels:
+            self.channels[number] = {
+                "FUNC": "CURR",
+                "CURR": 0.0,
+                "VOLT": 0.0,
+                "OUTP": False,
+                "MODE": "FIX",
+                "LIST": [],
+                "DWEL": [],
+                "EOST": [],
+                "INDEX": -1,
+                "TRIG": {},
+            }
+
+        return self.channels[number]
+
+    def setpoint(self, channel):
+        if channel["MODE"] == "LIST" and 0 <= channel["INDEX"] < len(channel["LIST"]):
+            return channel["LIST"][channel["INDEX"]]
+
+        return channel[channel["FUNC"]]
+
+    def write(self, header, args, instrument):
+        # The pins of the Digital Port belong to the mainframe, e.g. DIG:PIN1:FUNC TOUT
+        if header.startswith("DIG:PIN") and header.endswith("FUNC"):
+            self.pins[header] = args.strip().upper()
+            return
+
+        for number in getChannels(args):
+            self.writeChannel(header, args, self.getChannel(number))
+
+    def triggerOut(self, channel):
+        """Triggers the DMM at the end of a list step whose trigger output is routed to a pin"""
+        index = channel["INDEX"]
+        if "TOUT" not in self.pins.values() or index >= len(channel["EOST"]):
+            return
+
+        if channel["EOST"][index] and self.bench.dmm.source == "EXT":
+            dwell = channel["DWEL"][index] if index < len(channel["DWEL"]) else 0.0
+            self.bench.dmm.trigger(None, dwell)
+
+    def writeChannel(self, header, args, channel):
+        numbers = getNumbers(args)
+        psu = self.bench.psu
+
+        def change(key, value):
+            psu.change(channel, key, value)
+
+        if header == "FUNC":
+            change("FUNC", "VOLT" if "VOLT" in args.upper() else "CURR")
+
+        elif header in ("CURR", "VOLT") and numbers:
+            change(header, numbers[0])
+
+        elif header in ("CURR:MODE", "VOLT:MODE"):
+            change("MODE", args.split(",")[0].strip().upper()[:4])
+
+        # Every setpoint has its own triggered level, applied to that setpoint whatever the function
+        elif header in ("CURR:TRIG", "VOLT:TRIG") and numbers:
+            channel["TRIG"][header[:4]] = numbers[0]
+
+        elif header in ("LIST:CURR", "LIST:VOLT"):
+            channel["LIST"] = numbers
+
+        elif header == "LIST:DWEL":
+            channel["DWEL"] = numbers
+
+        elif header == "LIST:TOUT:EOST":
+            channel["EOST"] = [bool(x) for x in numbers]
+
+        elif header == "INIT:TRAN":
+            channel["INDEX"] = -1
+
+        elif header == "TRIG:TRAN":
+            if channel["MODE"] == "STEP" and channel["TRIG"]:
+                for key, value in channel["TRIG"].items():
+                    change(key, value)
+
+                channel["TRIG"] = {}
+
+            else:
+                change("INDEX", channel["INDEX"] + 1)
+                self.triggerOut(channel)
+
+        elif header in ("OUTP", "INP"):
+            change("OUTP", getState(args))
+
+    def query(self, header, args, instrument):
+        if header.startswith("LIST:") and header.endswith("POIN"):
+            return str(len(self.getChannel(getChannel(args))["LIST"]))
+
+        return None
+
+
+class Oscilloscope(object):
+    """Simulated Oscilloscope capturing the transitions of the output of the DUT"""
+
+    POINTS = 1000
+
+    def __init__(self, bench):
+        self.bench = bench
+        self.reset()
+
+    def reset(self):
+        self.timeScale = 1e-3
+        self.format = "BYTE"
+        self.upper = None
+        self.lower = None
+        self.captured = None
+
+    def getTransition(self):
+        if self.captured is not None:
+            return self.captured
+
+        transitions = self.bench.psu.transitions
+        if transitions:
+            return transitions[-1]
+
+        voltage = self.bench.output()[0]
+        return (self.bench.clock.now(), voltage, voltage)
+
+    def waveform(self):
+        """Returns the time and voltage of the last transition, a first order step with overshoot"""
+        start, before, after = self.getTransition()
+        tau = (DUT["RiseTime"] if after >= before else DUT["FallTime"]) / 2.197
+        time = numpy.linspace(-2, 8, self.POINTS) * self.timeScale
+        step = 1 - numpy.exp(-numpy.clip(time, 0, None) / tau)
+        ring = DUT["Overshoot"] * numpy.exp(-numpy.clip(time, 0, None) / (3 * tau))
+        ring *= numpy.sin(numpy.clip(time, 0, None) / tau)
+        voltage = before + (after - before) * (step + ring)
+        voltage += self.bench.rng.normal(0, DUT["VoltageNoise"] * 10, self.POINTS)
+        return time, voltage
+
+    def preamble(self):
+        time, voltage = self.waveform()
+        y_increment = (voltage.max() - voltage.min() or 1) / 60000
+        y_origin = voltage.min()
+        return [
+            1 if self.format == "WORD" else 0,
+            0,
+            self.POINTS,
+            1,
+            time[1] - time[0],
+            time[0],
+            0,
+            y_increment,
+            y_origin,
+            0,
+        ]
+
+    def write(self, header, args, instrument):
+        if header == "TIM:MAIN:SCAL" or header == "TIM:SCAL":
+            self.timeScale = getNumbers(args)[0]
+
+        elif header == "WAV:FORM":
+            self.format = args.strip().upper()
+
+        elif header == "MEAS:UPP":
+            self.upper = getNumbers(args)[0]
+
+        elif header == "MEAS:LOW":
+            self.lower = getNumbers(args)[0]
+
+        elif header in ("SING", "RUN"):
+            self.captured = None
+
+    def query(self, header, args, instrument):
+        start, before, after = self.getTransition()
+        if header == "MEAS:RIS":
+            return f"{DUT['RiseTime']:+.6E}"
+
+        if header == "MEAS:FALL":
+            return f"{DUT['FallTime']:+.6E}"
+
+        if header == "MEAS:VMAX":
+            return f"{max(before, after) * (1 + DUT['Overshoot']):+.6E}"
+
+        if header == "WAV:PRE":
+            return ",".join(f"{x:+.9E}" for x in self.preamble())
+
+        if header == "WAV:DATA":
+            time, voltage = self.waveform()
+            values = self.preamble()
+            codes = numpy.round((voltage - values[8]) / values[7])
+            if self.format == "BYTE":
+                codes = numpy.round(codes / 256)
+
+            mode = "WORD" if self.format == "WORD" else "BYTE"
+            return BinaryBlock.build(numpy.clip(codes, 0, 65535), mode)
+
+        return None
+
+
+class Bench(object):
+    """Simulated bench shared by every simulated Instrument
+
+    Attributes:
+        clock: Clock shared by every Instrument.
+        rng: Random number generator of the reading noise, seeded for repeatable runs.
+        roles: Dictionary mapping the VISA Address to a set of roles ("PSU", "ELoad", "DMM", "OSC").
+        channels: Dictionary mapping the role to the channel it uses.
+        pairs: Dictionary mapping every PSU channel to the ELoad channel loading it.
+        instruments: Dictionary mapping the VISA Address to its SimulatedInstrument.
+        phases: Dictionary mapping every phase of the DUT Test to the simulated time, transactions and
+            bytes spent in it.
+        faultRate: Float containing the probability that a response of the DMM times out, set by the
+            key SimFaultRate, used to exercise the recovery of the DUT Tests.
+        faults: Integer containing the number of timeouts simulated.
+
+    """
+
+    # Commands only understood by one kind of Instrument, used to infer the role of a VISA Address
+    INFER = (
+        ("APPL", "PSU"),
+        ("VOLT:SENS", "PSU"),
+        ("SENS:DLOG", "PSU"),
+        ("INIT:DLOG", "PSU"),
+        ("TRIG:DLOG", "PSU"),
+        ("MMEM", "PSU"),
+        ("FUNC", "ELoad"),
+        ("DISP:CHAN", "ELoad"),
+        ("LIST", "ELoad"),
+        ("INIT:TRAN", "ELoad"),
+        ("TRIG:TRAN", "ELoad"),
+        ("DIG", "ELoad"),
+        ("CONF", "DMM"),
+        ("FETC", "DMM"),
+        ("READ", "DMM"),
+        ("SAMP", "DMM"),
+        ("VOLT:DC", "DMM"),
+        ("CURR:DC", "DMM"),
+        ("CHAN", "OSC"),
+        ("TIM", "OSC"),
+        ("WAV", "OSC"),
+        ("MEAS:RIS", "OSC"),
+        ("MEAS:FALL", "OSC"),
+        ("MEAS:VMAX", "OSC"),
+        ("SING", "OSC"),
+    )
+
+    def __init__(self, timeScale=0, seed=0):
+        self.clock = Clock(timeScale)
+        self.rng = numpy.random.default_rng(seed)
+        self.roles = {}
+        self.channels = {}
+        self.instruments = {}
+        self.phases = {}
+        self.pairs = {}
+        self.faultRate = 0.0
+        self.faults = 0
+        self.faultRng = numpy.random.default_rng(seed + 1)
+        self.psu = PSU(self)
+        self.eload = ELoad(self)
+        self.dmm = DMM(self)
+        self.osc = Oscilloscope(self)
+
+    def assign(self, dict):
+        """Declares the role of every VISA Address from the settings of a DUT Test
+
+        Args:
+            dict: Dictionary containing the settings of the DUT Test (PSU, ELoad, DMM, OSC and channels).
+        """
+        for role in ("PSU", "ELoad", "DMM", "OSC"):
+            if dict.get(role):
+                self.roles.setdefault(dict[role], set()).add(role)
+
+        for role in ("PSU", "ELoad", "OSC"):
+            if dict.get(f"{role}_Channel"):
+                channels = getChannels(f"(@{dict[f'{role}_Channel']})")
+                self.channels[role] = channels[0]
+
+        # With channel lists, every PSU channel is loaded by the ELoad channel in the same position
+        if dict.get("PSU_Channel") and dict.get("ELoad_Channel"):
+            PSU_Channels = getChannels(f"(@{dict['PSU_Channel']})")
+            ELoad_Channels = getChannels(f"(@{dict['ELoad_Channel']})")
+            self.pairs = {x: y for x, y in zip(PSU_Channels, ELoad_Channels)}
+
+        self.faultRate = float(dict.get("SimFaultRate", 0))
+
+    def isFault(self, instrument):
+        """Determines whether the response of an Instrument times out"""
+        if self.faultRate > 0 and "DMM" in instrument.getRoles():
+            if self.faultRng.random() < self.faultRate:
+                self.faults += 1
+                return True
+
+        return False
+
+    def getRole(self, VISA_ADDRESS, header, channel):
+        """Returns the role that executes a command sent to a VISA Address"""
+        roles = self.roles.setdefault(VISA_ADDRESS, set())
+
+        if not roles:
+            for prefix, role in self.INFER:
+                if header.startswith(prefix):
+                    roles.add(role)
+                    break
+
+        if len(roles) > 1 and "ELoad" in roles and "PSU" in roles:
+            # PSU and ELoad in the same mainframe are told apart by their channel
+            if channel is not None and channel == self.channels.get("ELoad"):
+                return "ELoad"
+
+            if header.startswith(
+                ("FUNC", "LIST", "INIT:TRAN", "TRIG:TRAN", "DISP", "DIG")
+            ):
+                return "ELoad"
+
+            return "PSU"
+
+        return next(iter(roles)) if roles else None
+
+    def getModel(self, role):
+        return {"PSU": self.psu, "ELoad": self.eload, "DMM": self.dmm, "OSC": self.osc}.get(
+            role
+        )
+
+    def output(self, number=None):
+        """Returns the voltage across and the current through the output of the DUT
+
+        Args:
+            number: Integer containing the channel of the PSU, the channel of the DUT Test if None.
+        """
+        psu = self.psu.getChannel(number)
+        eload = self.eload.getChannel(self.pairs.get(number))
+
+        if not psu["OUTP"]:
+            return 0.0, 0.0
+
+        voltage = psu["VOLT"] * (1 + DUT["VoltageGain"]) + DUT["VoltageOffset"]
+        limit = psu["CURR"] * (1 + DUT["CurrentGain"]) + DUT["CurrentOffset"]
+
+        if not eload["OUTP"]:
+            return voltage, 0.0
+
+        setpoint = self.eload.setpoint(eload)
+        if eload["FUNC"] == "VOLT":
+            # The ELoad holds its voltage, the DUT enters CC Mode when it is below the DUT voltage
+            if setpoint < voltage:
+                return setpoint, limit
+
+            return voltage, 0.0
+
+        if setpoint <= limit:
+            return voltage - DUT["OutputResistance"] * setpoint, setpoint
+
+        # The DUT enters CC Mode and its voltage collapses
+        return 0.0, limit
+
+    def transient(self, delay=0.0):
+        """Returns the part of the last voltage step of the DUT that has not settled yet after a delay"""
+        if not self.psu.transitions:
+            return 0.0
+
+        time, before, after = self.psu.transitions[-1]
+        elapsed = max(self.clock.now() + delay - time, 0.0)
+        return (before - after) * math.exp(-elapsed / DUT["SettlingTime"])
+
+    def reading(self, function, nplc, range=None, delay=0.0):
+        """Returns a reading of the DUT, the noise of the DUT adding to the noise floor of the range"""
+        voltage, current = self.output()
+        voltage += self.transient(delay)
+        scale = 1 / math.sqrt(max(nplc, 0.02))
+        if function == "CURR":
+            value, noise = current, DUT["CurrentNoise"]
+
+        else:
+            value, noise = voltage, DUT["VoltageNoise"]
+
+        # Autoranging selects the smallest range covering the reading
+        ranges = METER[function]["Ranges"]
+        if range is None:
+            range = next((x for x in ranges if abs(value) <= x), ranges[-1])
+
+        elif abs(value) > range * 1.2:
+            return OVERLOAD
+
+        noise = math.hypot(noise, METER[function]["RangeNoise"] * range)
+        return value + self.rng.normal(0, noise * scale)
+
+    def getPhase(self, headers, roles):
+        """Returns the phase of the DUT Test a transaction belongs to from the headers of its commands"""
+        if any(header.startswith(FETCH) for header in headers):
+            return "fetch"
+
+        if any(header.startswith(MEASURE) for header in headers):
+            return "measure"
+
+        if any(header.startswith(SYNC) for header in headers):
+            return "measure" if "DMM" in roles else "settle"
+
+        return "setup"
+
+    def account(self, phase, time, transferred=0, transactions=1):
+        """Adds the simulated time, bytes and transactions spent to a phase"""
+        entry = self.phases.setdefault(
+            phase, {"time": 0.0, "transactions": 0, "bytes": 0}
+        )
+        entry["time"] += time
+        entry["transactions"] += transactions
+        entry["bytes"] += transferred
+
+    def wait(self, seconds):
+        """Waits on the host, the time is spent settling (e.g. Delay or SessionPool.sleep)"""
+        start = self.clock.now()
+        self.clock.advance(seconds)
+        self.account("settle", self.clock.now() - start, transactions=0)
+
+    def statistics(self):
+        """Returns the transactions, bytes and bus time of every simulated Instrument"""
+        return {
+            VISA_ADDRESS: instrument.statistics()
+            for VISA_ADDRESS, instrument in self.instruments.items()
+        }
+
+    def phaseStatistics(self):
+        """Returns the simulated time, transactions and bytes spent in every phase of the DUT Test"""
+        statistics = {}
+        for phase in PHASES:
+            entry = self.phases.get(phase, {})
+            statistics[phase] = {
+                "time": entry.get("time", 0.0),
+                "transactions": entry.get("transactions", 0),
+                "bytes": entry.get("bytes", 0),
+            }
+
+        return statistics
+
+    def resetStatistics(self):
+        self.phases = {}
+        for instrument in self.instruments.values():
+            instrument.resetStatistics()
+
+
+class SimulatedInstrument(object):
+    """Simulated VISA Session of an Instrument, with the same methods as a PyVisa Resource
+
+    Attributes:
+        VISA_ADDRESS: The string which contains the VISA Address of an Instrument.
+        bench: The Bench the Instrument belongs to.
+        interface: String containing the interface of the VISA Address used by the latency model.
+        errors: List containing the error queue of the Instrument.
+
+    """
+
+    def __init__(self, VISA_ADDRESS, bench):
+        self.VISA_ADDRESS = VISA_ADDRESS
+        self.resource_name = VISA_ADDRESS
+        self.bench = bench
+        self.interface = getInterface(VISA_ADDRESS)
+        self.timeout = 2000
+        self.baud_rate = 9600
+        self.read_termination = "\n"
+        self.write_termination = "\n"
+        self.errors = []
+        self.ese = 0
+        self.sre = 0
+        self.esr = 0
+        self.opc = False
+        self.response = None
+        self.phase = "setup"
+        self.resetStatistics()
+
+    def resetStatistics(self):
+        self.transactions = 0
+        self.writes = 0
+        self.queries = 0
+        self.commands = 0
+        self.unknown = 0
+        self.bytesWritten = 0
+        self.bytesRead = 0
+        self.busTime = 0.0
+        self.headers = {}
+
+    def statistics(self):
+        return {
+            "interface": self.interface,
+            "roles": sorted(self.bench.roles.get(self.VISA_ADDRESS, [])),
+            "transactions": self.transactions,
+            "writes": self.writes,
+            "queries": self.queries,
+            "commands": self.commands,
+            "unknown": self.unknown,
+            "bytesWritten": self.bytesWritten,
+            "bytesRead": self.bytesRead,
+            "busTime": self.busTime,
+            "headers": dict(self.headers),
+        }
+
+    def charge(self, written, read, commands):
+        """Charges the latency of a transaction to the clock"""
+        latency = LATENCY[self.interface]
+        time = latency["transaction"] + COMMAND_TIME * commands
+        time += (written + read) / latency["throughput"]
+        if read:
+            time += latency["turnaround"]
+
+        self.transactions += 1
+        self.bytesWritten += written
+        self.bytesRead += read
+        self.busTime += time
+        self.bench.clock.advance(time)
+
+    def busyUntil(self):
+        return max(
+            self.bench.dmm.busyUntil() if "DMM" in self.getRoles() else 0,
+            self.bench.clock.now(),
+        )
+
+    def getRoles(self):
+        return self.bench.roles.get(self.VISA_ADDRESS, set())
+
+    def updateOPC(self):
+        if self.opc and self.bench.clock.now() >= self.busyUntil():
+            self.esr |= 1
+            self.opc = False
+
+    def getSTB(self):
+        self.updateOPC()
+        stb = 0
+        if self.esr & self.ese:
+            stb |= 32
+
+        if self.errors:
+            stb |= 4
+
+        if stb & self.sre:
+            stb |= 64
+
+        return stb
+
+    def execute(self, message):
+        """Executes every command of a message and returns the response of the last query"""
+        response = None
+        headers = []
+        for command in split(message):
+            token, _, args = command.partition(" ")
+            query = "?" in token
+            header, _, rest = token.partition("?")
+            args = f"{rest} {args}".strip()
+            header = normalize(header)
+            headers.append(header)
+            self.commands += 1
+            self.headers[header] = self.headers.get(header, 0) + 1
+            self.bench.psu.log()
+            result = self.common(header, args, query)
+
+            if result is NotImplemented:
+                role = self.bench.getRole(self.VISA_ADDRESS, header, getChannel(args))
+                model = self.bench.getModel(role)
+                result = None
+                if model is None:
+                    self.unknown += 1
+
+                elif query:
+                    result = model.query(header, args, self)
+                    if result is None:
+                        self.unknown += 1
+                        result = "0"
+
+                else:
+                    model.write(header, args, self)
+
+            if query:
+                response = result
+
+        self.phase = self.bench.getPhase(headers, self.getRoles())
+        return response
+
+    def common(self, header, args, query):
+        """Executes the IEEE 488.2 Common Commands, returns NotImplemented for any other command"""
+        if header == "*CLS":
+            self.esr = 0
+            self.errors = []
+
+        elif header == "*ESE":
+            if query:
+                return str(self.ese)
+
+            self.ese = int(getNumbers(args)[0]) if getNumbers(args) else 0
+
+        elif header == "*SRE":
+            if query:
+                return str(self.sre)
+
+            self.sre = int(getNumbers(args)[0]) if getNumbers(args) else 0
+
+        elif header == "*ESR":
+            self.updateOPC()
+            esr, self.esr = self.esr, 0
+            return str(esr)
+
+        elif header == "*OPC":
+            if query:
+                self.bench.clock.waitUntil(self.busyUntil())
+                return "1"
+
+            self.opc = True
+
+        elif header == "*WAI":
+            self.bench.clock.waitUntil(self.busyUntil())
+
+        elif header == "*STB":
+            return str(self.getSTB())
+
+        elif header == "*IDN":
+            roles = "/".join(sorted(self.getRoles())) or "INSTRUMENT"
+            return f"DUT-TestBot,Simulated {roles},SIM0001,1.0"
+
+        elif header == "*TRG":
+            if "DMM" in self.getRoles() or not self.getRoles():
+                self.bench.roles.setdefault(self.VISA_ADDRESS, set()).add("DMM")
+                self.bench.dmm.trigger(self)
+
+        elif header in ("*RST", "SYST:PRES"):
+            for role in self.getRoles():
+                self.bench.getModel(role).reset()
+
+        elif header == "SYST:ERR":
+            return self.errors.pop(0) if self.errors else '+0,"No error"'
+
+        elif header in ("*RCL", "*SAV", "*PSC", "*TST"):
+            return "0" if query else None
+
+        else:
+            return NotImplemented
+
+        return None
+
+    def write(self, message):
+        message = str(message)
+        start = self.bench.clock.now()
+        self.writes += 1
+        commands = len(split(message))
+        self.charge(len(message) + 1, 0, commands)
+        self.response = self.execute(message)
+        self.bench.account(self.phase, self.bench.clock.now() - start, len(message) + 1)
+        return len(message) + 1
+
+    def read_raw(self):
+        if self.response is not None and self.bench.isFault(self):
+            self.bench.clock.advance(self.timeout / 1000)
+            raise pyvisa.VisaIOError(pyvisa.constants.StatusCode.error_timeout)
+
+        response = self.response if self.response is not None else ""
+        self.response = None
+        if isinstance(response, str):
+            response = (response + "\n").encode()
+
+        start = self.bench.clock.now()
+        self.charge(0, len(response), 0)
+        self.bench.account(self.phase, self.bench.clock.now() - start, len(response))
+        return response
+
+    def read(self):
+        return self.read_raw().decode(errors="replace").rstrip("\r\n")
+
+    def query(self, message):
+        self.queries += 1
+        self.write(message)
+        return self.read()
+
+    def query_binary_values(
+        self, message, datatype="f", is_big_endian=False, container=list, **kwargs
+    ):
+        self.queries += 1
+        self.write(message)
+        mode = {"d": "REAL,64", "f": "REAL,32", "H": "WORD", "B": "BYTE"}[datatype]
+        values = BinaryBlock.parse(self.read_raw(), mode, is_big_endian)
+        return container(values)
+
+    def query_ascii_values(self, message, converter="f", separator=",", container=list):
+        return container([float(x) for x in self.query(message).split(separator)])
+
+    def read_stb(self):
+        start = self.bench.clock.now()
+        # In virtual time a serial poll waits for the pending operation, as the host would have
+        if self.bench.clock.timeScale == 0 and self.opc:
+            self.bench.clock.waitUntil(self.busyUntil())
+
+        self.charge(0, 1, 0)
+        phase = self.bench.getPhase(["*STB"], self.getRoles())
+        self.bench.account(phase, self.bench.clock.now() - start, 1)
+        return self.getSTB()
+
+    def enable_event(self, *args, **kwargs):
+        raise pyvisa.VisaIOError(pyvisa.constants.StatusCode.error_nonsupported_operation)
+
+    def clear(self):
+        self.response = None
+
+    def close(self):
+        pass
+
+
+class ResourceManager(object):
+    """Simulated Resource Manager handing out SimulatedInstruments of a single Bench
+
+    Attributes:
+        bench: The Bench shared by every Instrument opened.
+
+    """
+
+    def __init__(self, bench=None, timeScale=0):
+        self.bench = bench if bench is not None else Bench(timeScale)
+
+    def open_resource(self, VISA_ADDRESS, **kwargs):
+        if VISA_ADDRESS not in self.bench.instruments:
+            self.bench.instruments[VISA_ADDRESS] = SimulatedInstrument(
+                VISA_ADDRESS, self.bench
+            )
+
+        return self.bench.instruments[VISA_ADDRESS]
+
+    def list_resources(self, query="?*::INSTR"):
+        return tuple(self.bench.instruments)
+
+    def close(self):
+        pass
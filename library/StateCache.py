@@ -0,0 +1,193 @@
+"""Library containing the shadow of the settable state of an Instrument, used to skip redundant SCPI writes.
+
+    The test loops write values the Instrument already holds (e.g. the same current limit on every point
+    of a voltage sweep, or the same NPLC on every DUT Test). Every VISA Session handed out by the SessionPool
+    is wrapped by a ShadowSession which remembers the last value written to every settable command, keyed by
+    its header and channel list. A write whose value is already known to be applied is not sent.
+
+    The voltage and current of APPL CHn,V,I are shadowed apart, as VOLT and CURR of the channel, so that a
+    sweep of one of them with the other held (e.g. the current limit of a voltage sweep) only sends VOLT or
+    CURR for the part that changed.
+
+    The shadow only holds what has been written through it, so the first write of every setting is always
+    sent. The sessions stay open across DUT Tests (see SessionPool), hence so does the shadow. It is cleared
+    on *RST, *RCL and SYST:PRES, and a reconnect starts with an empty shadow. CONF, FUNC and MEAS? preset
+    part of the state of the Instrument, so they clear the shadow when they are sent, but a CONF or FUNC
+    identical to the last one is skipped like any other setting. The settings written after it are then
+    still held by the Instrument, and are written again (and skipped) by the setup of the next DUT Test.
+
+"""
+
+import re
+
+
+class ShadowSession(object):
+    """Session which skips writes of values that have already been applied to the Instrument
+
+    Every attribute that is not defined here (e.g. read_stb, timeout) is taken from the VISA Session.
+
+    Attributes:
+        instr: The VISA Session of the Instrument.
+        shadow: Dictionary mapping the header and channel list of a command to the last value written.
+        sent: Integer containing the number of writes sent to the Instrument.
+        suppressed: Integer containing the number of writes skipped.
+
+    """
+
+    # Settable state that is shadowed (range, NPLC, autozero, sense mode, output state, setpoints)
+    CACHED = (
+        "APPL",
+        "CONF",
+        "VOLT",
+        "CURR",
+        "RES",
+        "POW",
+        "OUTP",
+        "SENS",
+        "FUNC",
+        "TRIG:SOUR",
+        "TRIG:COUN",
+        "SAMP:COUN",
+        "FORM",
+        "DISP:CHAN",
+        "CHANNEL",
+        "TIMEBASE",
+        "TRIGGER:MODE",
+        "TRIGGER:EDGE",
+        "TRIGGER:SWEEP",
+        "WAVEFORM",
+    )
+
+    # Commands after which the state of the Instrument is no longer known
+    RESETS = ("*RST", "*RCL", "SYST:PRES")
+
+    # Commands presetting part of the state of the Instrument when they are sent
+    PRESETS = ("CONF", "MEAS", "FUNC")
+
+    CHANNEL = re.compile(r"\s*,?\s*(\(@[^)]*\))\s*$")
+    APPLY = re.compile(r"^CH(\d+)\s*,\s*([^,\s]+)\s*,\s*([^,\s]+)$", re.IGNORECASE)
+
+    def __init__(self, instr):
+        self.instr = instr
+        self.shadow = {}
+        self.sent = 0
+        self.suppressed = 0
+
+    def __getattr__(self, name):
+        return getattr(self.instr, name)
+
+    def parse(self, command):
+        """Splits a command into its key (header and channel list) and its value
+
+        Args:
+            command: String containing a single SCPI Command, e.g. "CURR 1.5,(@1)".
+
+        Returns:
+            Returns the header, the key and the value of the command.
+        """
+        command = command.strip().lstrip(":")
+        header, _, value = command.partition(" ")
+        header = header.upper()
+        channel = None
+
+        match = self.CHANNEL.search(value)
+        if match:
+            channel = match.group(1)
+            value = value[: match.start()]
+
+        return header, (header, channel), value.strip()
+
+    def isCached(self, header, value):
+        if header.startswith("CONF"):
+            return True
+
+        return value != "" and header.startswith(self.CACHED)
+
+    def invalidate(self, header):
+        """Drops the shadow of every command above or below the header in the command tree
+
+        e.g. a write to VOLT:RANG also drops VOLT:RANG:AUTO, and a write to CURR:MODE drops CURR.
+        """
+        for key in list(self.shadow):
+            if key[0].startswith(header + ":") or header.startswith(key[0] + ":"):
+                del self.shadow[key]
+
+            # APPL programs the voltage and current setpoints of the channel at once
+            elif header == "APPL" and key[0] in ("VOLT", "CURR"):
+                del self.shadow[key]
+
+            elif key[0] == "APPL" and header in ("VOLT", "CURR"):
+                del self.shadow[key]
+
+    def clear(self):
+        """Clears the whole shadow, e.g. after the Instrument has been reset"""
+        self.shadow.clear()
+
+    def write(self, command):
+        header, key, value = self.parse(str(command))
+        if header == "APPL" and self.APPLY.match(value):
+            return self.apply(command, *self.APPLY.match(value).groups())
+
+        if header.startswith(self.RESETS):
+            self.clear()
+
+        elif self.isCached(header, value) and self.shadow.get(key) == value:
+            self.suppressed += 1
+            return
+
+        elif header.startswith(self.PRESETS):
+            self.clear()
+
+        else:
+            self.invalidate(header)
+
+        # The shadow is only updated once the write has been accepted by the VISA Session
+        self.shadow.pop(key, None)
+        result = self.instr.write(command)
+        self.sent += 1
+
+        if self.isCached(header, value):
+            self.shadow[key] = value
+
+        return result
+
+    def apply(self, command, channel, voltage, current):
+        """Writes APPL CHn,V,I as the VOLT or CURR of the channel that changed, or skips it
+
+        Args:
+            command: String containing the APPL Command.
+            channel: String containing the channel number.
+            voltage: String containing the voltage setpoint.
+            current: String containing the current setpoint.
+        """
+        channel = f"(@{channel})"
+        changed = [
+            (header, value)
+            for header, value in (("VOLT", voltage), ("CURR", current))
+            if self.shadow.get((header, channel)) != value
+        ]
+        if not changed:
+            self.suppressed += 1
+            return
+
+        if len(changed) == 1:
+            header, value = changed[0]
+            return self.write(f"{header} {value},{channel}")
+
+        self.invalidate("APPL")
+        result = self.instr.write(command)
+        self.sent += 1
+        self.shadow[("VOLT", channel)] = voltage
+        self.shadow[("CURR", channel)] = current
+        return result
+
+    def query(self, command):
+        header, key, value = self.parse(str(command))
+        if header.startswith(self.RESETS + self.PRESETS):
+            self.clear()
+
+        return self.instr.query(command)
+
+    def report(self):
+        """Returns a summary of the writes sent and suppressed"""
+        return f"{self.sent} writes sent, {self.suppressed} redundant writes suppressed"
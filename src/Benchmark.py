@@ -0,0 +1,532 @@
+"""Module containing the benchmark of the sweep throughput and the overhead of every phase of the DUT Tests
+
+    Every DUT Test of DUT_Test.py is run against the simulated backend (see Simulator.py) in virtual time,
+    so the benchmark needs no hardware and a run of 10,000 points takes seconds. The sweep tests (Voltage
+    and Current Accuracy) are run at every sweep size, from 10 to 10,000 points, while the Load Regulation,
+    Transient Recovery Time and Programming Speed tests have a fixed number of points and are run once.
+
+    For every run the benchmark reports the points per second on the simulated bench and on the host, the
+    bus transactions and bytes moved, and the time spent in every phase of the DUT Test:
+
+        setup:   Configuration of the Instruments.
+        settle:  Waits for the DUT to settle (Delay, synchronization with the PSU and ELoad).
+        measure: Triggering of the DMM and ELoad, waits for the DMM to complete a reading.
+        fetch:   Readings and waveforms transferred back from the Instruments.
+        post:    Host time spent on the post processing of the data (see Data.py).
+
+    The results are written to a JSON file. When a baseline file from a previous version is given, every
+    run that lost more than the tolerance of its throughput or needs more transactions is reported.
+
+    Usage:
+        python Benchmark.py --sizes 10 100 1000 10000 --output benchmark.json --baseline old.json
+        python Benchmark.py Acquisition=BUFFERED DataFormat=REAL
+
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+import types
+from time import perf_counter
+import numpy
+
+sys.path.insert(
+    1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "library")
+)
+
+from SessionPool import SessionPool
+from DUT_Test import (
+    VoltageMeasurement,
+    CurrentMeasurement,
+    VisaResourceManager,
+    LoadRegulation,
+    RiseFallTime,
+    ProgrammingSpeedTest,
+)
+
+
+SIZES = (10, 100, 1000, 10000)
+
+# Settings shared by every DUT Test, the PSU and ELoad are channels of the same mainframe
+SETTINGS = {
+    "Instrument": "Keysight",
+    "PSU": "USB0::0x2A8D::0x0F02::SIM0001::0::INSTR",
+    "ELoad": "USB0::0x2A8D::0x0F02::SIM0001::0::INSTR",
+    "DMM": "GPIB0::22::INSTR",
+    "OSC": "USB0::0x0957::0x1796::SIM0002::0::INSTR",
+    "PSU_Channel": 1,
+    "ELoad_Channel": 2,
+    "OSC_Channel": 1,
+    "Error_Gain": 0.01,
+    "Error_Offset": 0.01,
+    "V_Rating": 30,
+    "I_Rating": 5,
+    "P_Rating": 100,
+    "setFunction": "Current",
+    "VoltageSense": "INT",
+    "CurrentSense": "INT",
+    "VoltageRes": "SLOW",
+    "CurrentRes": "SLOW",
+    "Range": "Auto",
+    "Aperture": 1,
+    "AutoZero": "ON",
+    "InputZ": "ON",
+    "Terminal": "3A",
+    "UpTime": 50,
+    "DownTime": 50,
+    "Channel_CouplingMode": "DC",
+    "Trigger_Mode": "EDGE",
+    "Trigger_CouplingMode": "DC",
+    "Trigger_SweepMode": "NORM",
+    "Trigger_SlopeMode": "EITH",
+    "TimeScale": 1e-3,
+    "VerticalScale": 1,
+    "I_Step": 2,
+    "V_Settling_Band": 0.8,
+    "V_Lower": 5,
+    "V_Upper": 10,
+    "Upper_Bound": 90,
+    "Lower_Bound": 10,
+}
+
+# Function of the ELoad in every DUT Test, as set by its dialog in the GUI: the ELoad draws a current
+# when the DUT regulates its voltage and holds a voltage when the DUT regulates its current
+FUNCTIONS = {
+    "VoltageMeasurementA": "Current",
+    "VoltageMeasurementB": "Current",
+    "CurrentMeasurementA": "Voltage",
+    "CurrentMeasurementB": "Voltage",
+    "CV_LoadRegulationA": "Current",
+    "CV_LoadRegulationB": "Current",
+    "CC_LoadRegulationA": "Voltage",
+    "CC_LoadRegulationB": "Voltage",
+}
+
+PHASES = ("setup", "settle", "measure", "fetch", "post")
+
+
+def getSettings(name, settings=SETTINGS):
+    """Returns the settings of a DUT Test with the function of the ELoad it needs
+
+    Args:
+        name: String containing the name of the DUT Test, e.g. "CurrentMeasurementA".
+        settings: Dictionary containing the settings shared by every DUT Test.
+    """
+    return dict(settings, setFunction=FUNCTIONS.get(name, settings["setFunction"]))
+
+
+def getSweep(points, V_Rating, I_Rating):
+    """Returns the sweep settings of a Voltage or Current Accuracy test with the number of points given
+
+    The current sweep takes the largest divisor of the points not above its fourth root and the voltage
+    sweep the rest. The step sizes are powers of two so that the sweeps are exact in floating point.
+
+    Args:
+        points: Integer containing the number of points of the sweep.
+        V_Rating: Float containing the Rated Voltage of the DUT.
+        I_Rating: Float containing the Rated Current of the DUT.
+
+    Returns:
+        Returns a dictionary containing the sweep settings.
+    """
+    current_iter = max(
+        i for i in range(1, int(points**0.25) + 1) if points % i == 0
+    )
+    voltage_iter = points // current_iter
+    voltage_step = 2.0 ** math.floor(math.log2(V_Rating / voltage_iter))
+    current_step = 2.0 ** math.floor(math.log2(I_Rating / current_iter))
+
+    return {
+        "minVoltage": voltage_step,
+        "maxVoltage": voltage_step * voltage_iter,
+        "voltage_step_size": voltage_step,
+        "minCurrent": current_step,
+        "maxCurrent": current_step * current_iter,
+        "current_step_size": current_step,
+    }
+
+
+def postAccuracy(infoList, dataList):
+    """Post processing of the Voltage and Current Accuracy tests, as done by the GUI"""
+    from Data import datatoCSV_Accuracy
+
+    with tempfile.TemporaryDirectory() as directory:
+        cwd = os.getcwd()
+        os.makedirs(os.path.join(directory, "csv"))
+        os.chdir(directory)
+        try:
+            datatoCSV_Accuracy(infoList, dataList)
+
+        finally:
+            os.chdir(cwd)
+
+
+def checkReadings(name, result, settings):
+    """Raises an error when the readings of a DUT Test are trivially zero or outside the specification
+
+    A sweep is trivially zero when a measured column stays below 0.1 % of its largest set value, and a
+    Load Regulation test when both readings are below 1 mV (or 1 mA). This happens when the ELoad is in
+    the wrong mode, so the DUT Test runs but measures nothing.
+
+    A point of a sweep is outside the specification when its error is above Error_Gain * set +
+    Error_Offset, and a Load Regulation test when the difference between its readings is above Rating *
+    Error_Gain + Error_Offset. This happens when the readings are taken before the DUT settles, e.g.
+    without UpTime.
+
+    Args:
+        name: String containing the name of the DUT Test.
+        result: The infoList and dataList of a sweep (in either order), the no load and full load
+            readings of a Load Regulation test, or None for the other DUT Tests.
+        settings: Dictionary containing the settings the DUT Test was run with.
+
+    Raises:
+        RuntimeError: The readings of the DUT Test are trivially zero or outside the specification.
+    """
+    gain = float(settings["Error_Gain"])
+    offset = float(settings["Error_Offset"])
+    failed = 0
+
+    if isinstance(result, tuple):
+        # The Current Accuracy tests return the dataList first, it has a column less than the infoList
+        info, data = sorted(
+            (numpy.asarray(x, dtype=float) for x in result),
+            key=lambda x: -x.shape[1],
+        )
+        trivial = len(data) and any(
+            numpy.nanmax(numpy.abs(data[:, i])) < 1e-3 * numpy.abs(info[:, i]).max()
+            for i in range(2)
+        )
+
+        i = 0 if name.startswith("Voltage") else 1
+        x, measured = info[: len(data), i], data[:, i]
+        valid = ~numpy.isnan(measured)
+        x, measured = x[valid], measured[valid]
+        error = numpy.abs(x - measured)
+        failed = int(numpy.count_nonzero(error > gain * numpy.abs(x) + offset))
+
+    elif isinstance(result, list):
+        trivial = max(abs(x) for x in result) < 1e-3
+
+        rating = float(settings["V_Rating" if name.startswith("CV") else "I_Rating"])
+        failed = int(abs(result[0] - result[-1]) > rating * gain + offset)
+
+    else:
+        trivial = False
+
+    if trivial:
+        raise RuntimeError(f"{name}: the readings are trivially zero, check setFunction")
+
+    if failed:
+        raise RuntimeError(
+            f"{name}: {failed} readings are outside the specification, check UpTime"
+        )
+
+
+def runRegulation(method):
+    """Returns a function running a Load Regulation test and returning its readings"""
+
+    def execute(dict):
+        test = LoadRegulation()
+        getattr(test, method)(dict)
+        return test.regulationList
+
+    return execute
+
+
+def runFormat(DataFormat):
+    """Returns a function running a buffered Voltage Accuracy test with the readings in a data format"""
+
+    def execute(dict):
+        settings = {**dict, "Acquisition": "BUFFERED", "DataFormat": DataFormat}
+        return VoltageMeasurement().executeVoltageMeasurementB(settings)
+
+    return execute
+
+
+# Every DUT Test, its function and its number of points, None for the sweep tests. The buffered
+# segments of the Voltage Accuracy test are also compared when transferred in ASCII and in binary.
+TESTS = (
+    (
+        "VoltageMeasurementA",
+        lambda dict: VoltageMeasurement().executeVoltageMeasurementA(dict),
+        None,
+    ),
+    (
+        "VoltageMeasurementB",
+        lambda dict: VoltageMeasurement().executeVoltageMeasurementB(dict),
+        None,
+    ),
+    (
+        "CurrentMeasurementA",
+        lambda dict: CurrentMeasurement().executeCurrentMeasurementA(dict),
+        None,
+    ),
+    (
+        "CurrentMeasurementB",
+        lambda dict: CurrentMeasurement().executeCurrentMeasurementB(dict),
+        None,
+    ),
+    (
+        "VoltageMeasurementB_ASCII",
+        runFormat("ASCII"),
+        None,
+    ),
+    (
+        "VoltageMeasurementB_REAL",
+        runFormat("REAL"),
+        None,
+    ),
+    (
+        "CV_LoadRegulationA",
+        runRegulation("executeCV_LoadRegulationA"),
+        2,
+    ),
+    (
+        "CV_LoadRegulationB",
+        runRegulation("executeCV_LoadRegulationB"),
+        2,
+    ),
+    (
+        "CC_LoadRegulationA",
+        runRegulation("executeCC_LoadRegulationA"),
+        2,
+    ),
+    (
+        "CC_LoadRegulationB",
+        runRegulation("executeCC_LoadRegulationB"),
+        2,
+    ),
+    (
+        "RiseFallTime",
+        lambda dict: RiseFallTime.execute(types.SimpleNamespace(), dict),
+        1,
+    ),
+    (
+        "ProgrammingSpeedTest",
+        lambda dict: ProgrammingSpeedTest.execute(types.SimpleNamespace(), dict),
+        2,
+    ),
+)
+
+
+class Benchmark(object):
+    """Runs the DUT Tests against the simulated backend and collects the statistics of every run
+
+    Attributes:
+        settings: Dictionary containing the settings of every DUT Test, overriding SETTINGS.
+        overrides: Dictionary containing the settings given, a setFunction given overrides FUNCTIONS.
+        post: Boolean determining whether the post processing is timed, it needs pandas and matplotlib.
+        results: List containing the statistics of every run.
+
+    """
+
+    def __init__(self, settings=None, post=True):
+        self.settings = dict(SETTINGS, **(settings or {}))
+        self.overrides = settings or {}
+        self.post = post
+        self.results = []
+
+    def run(self, name, function, size, points=None):
+        """Runs a single DUT Test against a fresh simulated bench
+
+        Args:
+            name: String containing the name of the DUT Test.
+            function: Function executing the DUT Test with its settings.
+            size: Integer containing the number of points of a sweep test, None for the others.
+            points: Integer containing the number of points of a DUT Test that is not a sweep.
+
+        Returns:
+            Returns a dictionary containing the statistics of the run.
+        """
+        settings = dict(self.settings)
+        if "setFunction" not in self.overrides:
+            settings = getSettings(name, settings)
+
+        if size is not None:
+            settings.update(
+                getSweep(size, float(settings["V_Rating"]), float(settings["I_Rating"]))
+            )
+
+        SessionPool.backend = "@sim"
+        SessionPool.timeScale = 0
+        SessionPool.closeAll()
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            A = VisaResourceManager()
+            bench = A.rm.bench
+            bench.assign(settings)
+            A.openRM(settings["PSU"], settings["DMM"], settings["ELoad"])
+            bench.resetStatistics()
+
+            start = perf_counter()
+            result = function(settings)
+            wall = perf_counter() - start
+            time = bench.clock.now()
+
+            post = None
+            if self.post and size is not None:
+                start = perf_counter()
+                postAccuracy(*result)
+                post = perf_counter() - start
+
+            statistics = bench.statistics()
+            phases = bench.phaseStatistics()
+            A.closeRM()
+
+        checkReadings(name, result, settings)
+        if size is not None:
+            points = len(result[0])
+
+        phases["post"] = {"time": post, "transactions": 0, "bytes": 0}
+
+        return {
+            "test": name,
+            "size": size,
+            "points": points,
+            "time": time,
+            "wall": wall,
+            "pointsPerSecond": points / time if time else None,
+            "hostPointsPerSecond": points / wall if wall else None,
+            "transactions": sum(x["transactions"] for x in statistics.values()),
+            "bytes": sum(
+                x["bytesWritten"] + x["bytesRead"] for x in statistics.values()
+            ),
+            "phases": phases,
+            "instruments": {
+                VISA_ADDRESS: {
+                    "roles": x["roles"],
+                    "transactions": x["transactions"],
+                    "bytes": x["bytesWritten"] + x["bytesRead"],
+                    "busTime": x["busTime"],
+                    "headers": x["headers"],
+                }
+                for VISA_ADDRESS, x in statistics.items()
+            },
+        }
+
+    def runAll(self, sizes=SIZES, tests=None):
+        """Runs every DUT Test at every sweep size
+
+        Args:
+            sizes: Sequence of the number of points of the sweep tests.
+            tests: Sequence of the names of the DUT Tests to run, every DUT Test unless specified.
+
+        Returns:
+            Returns a list containing the statistics of every run.
+        """
+        if self.post:
+            try:
+                import Data
+
+            except ImportError as e:
+                print(f"Post processing is not timed: {e.args[0]}")
+                self.post = False
+
+        for name, function, points in TESTS:
+            if tests and name not in tests:
+                continue
+
+            for size in sizes if points is None else (None,):
+                result = self.run(name, function, size, points)
+                self.results.append(result)
+                print(self.format(result))
+
+        return self.results
+
+    def format(self, result):
+        """Returns a single line summary of a run"""
+        phases = ", ".join(
+            f"{phase} {result['phases'][phase]['time']:.3f}s"
+            for phase in PHASES
+            if result["phases"][phase]["time"] is not None
+        )
+        return (
+            f"{result['test']:<26}{result['points']:>6} points: "
+            f"{result['pointsPerSecond']:10.1f} points/s, "
+            f"{result['hostPointsPerSecond']:10.1f} host points/s, "
+            f"{result['transactions']:>7} transactions, {result['bytes']:>8} bytes ({phases})"
+        )
+
+    def save(self, path):
+        """Writes the results to a JSON file"""
+        report = {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "settings": self.settings,
+            "results": self.results,
+        }
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+def compare(baseline, results, tolerance=0.1):
+    """Compares the results with those of a previous version
+
+    Args:
+        baseline: List containing the statistics of every run of the previous version.
+        results: List containing the statistics of every run of this version.
+        tolerance: Float containing the fraction of throughput that may be lost before it is reported.
+
+    Returns:
+        Returns a list of strings describing every regression.
+    """
+    previous = {(x["test"], x["points"]): x for x in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get((result["test"], result["points"]))
+        if old is None:
+            continue
+
+        for key in ("pointsPerSecond", "hostPointsPerSecond"):
+            if old[key] and result[key] < old[key] * (1 - tolerance):
+                regressions.append(
+                    f"{result['test']} ({result['points']} points): {key} "
+                    f"{old[key]:.1f} -> {result[key]:.1f}"
+                )
+
+        if result["transactions"] > old["transactions"]:
+            regressions.append(
+                f"{result['test']} ({result['points']} points): transactions "
+                f"{old['transactions']} -> {result['transactions']}"
+            )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("settings", nargs="*", help="Settings overridden as Key=Value")
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--tests", nargs="+", default=None)
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument("--no-post", dest="post", action="store_false")
+    args = parser.parse_args()
+
+    settings = dict(setting.split("=", 1) for setting in args.settings)
+    benchmark = Benchmark(settings, args.post)
+    benchmark.runAll(args.sizes, args.tests)
+    benchmark.save(args.output)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+        regressions = compare(baseline, benchmark.results, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
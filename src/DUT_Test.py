@@ -7,16 +7,25 @@
 
 """
 
+import json
+import os
 import pyvisa
 import sys
-from time import sleep
+import time
+from math import ceil, log1p
+from statistics import NormalDist
+import numpy
 
 sys.path.insert(
     1,
     r"C://Users//zhiywong//OneDrive - Keysight Technologies//Documents//GitHub//PyVisa//library",
 )
 
-from IEEEStandard import OPC, WAI, TRG, RST
+from IEEEStandard import OPC, WAI, TRG, RST, IDN, CLS, OperationComplete
+from AsyncDriver import InstrumentExecutor
+from SessionPool import SessionPool
+from CommandBatch import CommandBatch
+import Keysight
 
 
 class Dimport:
@@ -72,10 +81,2346 @@ class Dimport:
             Oscilloscope,
         )
 
+    def getClass(module_name, class_name):
+        """Declare a single class that is not part of the set returned by getClasses
+
+        Args:
+            module_name: Determines which library will the program import from
+            class_name: Name of the Subsystem to import (e.g. "Format")
+
+        Returns:
+            Returns the Subsystem imported from the library
+        """
+
+        return getattr(__import__(module_name), class_name)
+
+
+class Completion:
+    """Class to declare how the program waits for the DMM to complete a measurement"""
+
+    def __init__():
+        pass
+
+    def getWait(dict):
+        """Declare the completion wait of the DMM based on the settings of the DUT Test
+
+        The DMM is armed so that the Status Byte reports when the measurement has completed,
+        which replaces the busy-wait on STAT:OPER:COND?. The keys Synchronization ("OPC" or "SRQ"),
+        PollInterval, PollBackoff, PollMaxInterval and PollTimeout are optional in dict.
+
+        Args:
+            dict: Dictionary containing the settings of the DUT Test.
+
+        Returns:
+            Returns the armed OperationComplete of the DMM and the expected integration time in seconds.
+        """
+        DMM_Sync = OperationComplete(
+            dict["DMM"],
+            dict.get("Synchronization", "OPC"),
+            dict.get("PollInterval", 0.001),
+            dict.get("PollBackoff", 2),
+            dict.get("PollMaxInterval", 0.05),
+            dict.get("PollTimeout", 60),
+        )
+        DMM_Sync.arm()
+
+        # Shortest power line cycle (60 Hz) so that the first poll is never later than the reading
+        integration_time = float(dict["Aperture"]) / 60
+        return DMM_Sync, integration_time
+
+
+class Batch:
+    """Class to declare how the setup commands of the Instruments are sent"""
+
+    def __init__():
+        pass
+
+    def getBatch(dict, *VISA_ADDRESSES):
+        """Declare the CommandBatch of the Instruments based on the settings of the DUT Test
+
+        The setup commands written inside the batch are coalesced into compound messages, sent in one
+        write per Instrument. The keys Batch ("ON" or "OFF") and BatchLength, the longest compound
+        message in characters, are optional in dict.
+
+        Args:
+            dict: Dictionary containing the settings of the DUT Test.
+            *VISA_ADDRESSES: VISA Address of every Instrument to batch.
+
+        Returns:
+            Returns the CommandBatch to be used as a context.
+        """
+        return CommandBatch(
+            *VISA_ADDRESSES,
+            maxLength=int(dict.get("BatchLength", 256)),
+            enabled=str(dict.get("Batch", "ON")).upper() == "ON",
+        )
+
+
+class BufferedAcquisition:
+    """Class to acquire a whole sweep segment from the reading memory of the DMM in one transfer
+
+    Instead of initiating, triggering, waiting and fetching once per sweep point, the DMM is armed once
+    for a segment of N triggers (SAMP:COUN 1, TRIG:COUN N, INIT). Every sweep point then only costs a
+    single *TRG write, and the readings of the whole segment are read back with a single FETC? once
+    the last trigger of the segment has been sent. The readings are mapped back to the sweep points in
+    the order they were triggered. Segments are limited to BufferSize readings so that the reading
+    memory of the DMM never overflows, the DMM is armed again for the next segment automatically.
+
+    The buffered mode is used when the key Acquisition is set to "BUFFERED". The optional keys
+    BufferSize and TriggerMargin set the number of readings per segment and the extra time in seconds
+    waited after every trigger. When the key DataFormat is set to "REAL", the segment is transferred
+    as a binary block of 64-bit floats and decoded by NumPy instead of being parsed from ASCII.
+
+    Attributes:
+        DMM: String containing the VISA Address of the DMM used.
+        size: Integer containing the largest number of readings in a segment.
+        measure_time: Float containing the time in seconds waited after every trigger.
+        remaining: Integer containing the number of points that have not been triggered yet.
+        count: Integer containing the number of triggers the DMM is armed for.
+        binary: Boolean determining whether the readings are transferred in binary format.
+        pending: List containing the sweep points triggered in the current segment.
+        readings: List containing every sweep point paired with its reading.
+        fetches: Integer containing the number of bulk transfers made.
+
+    """
+
+    def __init__(self, dict):
+        (
+            Read,
+            Apply,
+            Display,
+            Function,
+            Output,
+            Sense,
+            Configure,
+            Delay,
+            Trigger,
+            Sample,
+            Initiate,
+            Fetch,
+            Status,
+            Voltage,
+            Current,
+            Oscilloscope,
+        ) = Dimport.getClasses(dict["Instrument"])
+
+        self.Trigger = Trigger
+        self.Sample = Sample
+        self.Initiate = Initiate
+        self.Fetch = Fetch
+        self.Format = Dimport.getClass(dict["Instrument"], "Format")
+
+        self.DMM = dict["DMM"]
+        self.size = int(dict.get("BufferSize", 512))
+        self.binary = str(dict.get("DataFormat", "ASCII")).upper() == "REAL"
+
+        # Triggers sent while the DMM is still measuring are ignored, hence the trigger spacing is
+        # taken from the longest power line cycle (50 Hz) and doubled when AutoZero is enabled
+        self.measure_time = float(dict["Aperture"]) / 50
+        if str(dict.get("AutoZero", "")).upper() == "ON":
+            self.measure_time *= 2
+
+        self.measure_time += float(dict.get("TriggerMargin", 0.002))
+        self.remaining = 0
+        self.count = 0
+        self.pending = []
+        self.readings = []
+        self.fetches = 0
+
+    def arm(self, points):
+        """Arms the DMM for the sweep, a segment of at most BufferSize triggers at a time
+
+        The readings fetched are kept when the DMM is armed again for the points refined by an
+        adaptive sweep.
+
+        Args:
+            points: Integer containing the number of sweep points that will be triggered.
+        """
+        self.remaining = int(points)
+        self.Sample(self.DMM).setSampleCount(1)
+
+        if self.binary:
+            self.Format(self.DMM).setDataFormat("REAL,64")
+            self.Format(self.DMM).setByteOrder("SWAP")
+
+        if self.remaining > 0:
+            self.armSegment()
+
+    def armSegment(self):
+        """Arms the DMM for the next segment of the sweep"""
+        self.count = min(self.remaining, self.size)
+        self.pending = []
+        self.Trigger(self.DMM).setCount(self.count)
+        self.Initiate(self.DMM).initiate()
+
+    def trigger(self, point):
+        """Triggers a single reading for a sweep point
+
+        Args:
+            point: Any value identifying the sweep point (e.g. the programmed current), which is
+                paired with its reading once the segment is fetched.
+        """
+        TRG(self.DMM)
+        SessionPool.sleep(self.measure_time)
+        self.pending.append(point)
+        self.remaining -= 1
+
+        if len(self.pending) == self.count:
+            self.fetch()
+            if self.remaining > 0:
+                self.armSegment()
+
+    def fetch(self):
+        """Reads the readings of the current segment back in one transfer
+
+        Returns:
+            Returns a list containing every sweep point triggered so far paired with its reading.
+        """
+        if len(self.pending) > 0:
+            if self.binary:
+                values = self.Fetch(self.DMM).queryBinary("REAL,64").tolist()
+
+            else:
+                response = self.Fetch(self.DMM).query()
+                values = [float(x) for x in response.split(",")]
+
+            self.readings.extend(zip(self.pending, values))
+            self.pending = []
+            self.fetches += 1
+
+        return self.readings
+
+    def close(self):
+        """Returns the DMM to a single reading per trigger in ASCII format"""
+        self.Trigger(self.DMM).setCount(1)
+
+        if self.binary:
+            self.Format(self.DMM).setDataFormat("ASC")
+
+    def report(self):
+        """Returns a summary of the readings acquired and the bulk transfers made"""
+        return (
+            f"{self.DMM} (BUFFERED, {'REAL' if self.binary else 'ASCII'}): "
+            f"{len(self.readings)} readings in "
+            f"{self.fetches} transfers"
+        )
+
+
+class RepeatAcquisition:
+    """Class to measure every point N times in one acquisition and keep streaming statistics of the readings
+
+    By default every point is a single reading, so a single noisy reading fails the point. When the
+    key Repeat is set to N greater than 1, the DMM takes N readings per trigger (SAMP:COUN N) and the
+    readings are removed from its reading memory RepeatChunk at a time in binary format (DATA:REM?
+    with WAIT, so that every transfer waits for its readings instead of returning short).
+    Every chunk is merged into the running mean and sum of squares of the point (Welford's method
+    combined per chunk), so the memory used does not grow with N. The mean is the reading of the point,
+    and its standard deviation, minimum, maximum and the confidence interval of the mean (normal, at the
+    Confidence level) are kept for the pass/fail decisions of Data.py.
+
+    Buffered acquisition already takes a single reading per trigger for the whole sweep, hence the
+    points are not repeated when the key Acquisition is set to "BUFFERED".
+
+    Attributes:
+        DMM: String containing the VISA Address of the DMM used.
+        enabled: Boolean determining whether the points are repeated.
+        count: Integer containing the number of readings per point, 1 when not repeated.
+        chunk: Integer containing the largest number of readings removed in a single transfer.
+        z: Float containing the coverage of the confidence interval in standard deviations.
+        transfers: Integer containing the number of transfers made.
+        statistics: Dictionary mapping every point to its number of readings, standard deviation,
+            minimum, maximum and the low and high ends of the confidence interval of its mean.
+
+    """
+
+    def __init__(self, dict):
+        self.Sample = Dimport.getClass(dict["Instrument"], "Sample")
+        self.Fetch = Dimport.getClass(dict["Instrument"], "Fetch")
+        self.Data = Dimport.getClass(dict["Instrument"], "Data")
+        self.Format = Dimport.getClass(dict["Instrument"], "Format")
+
+        self.DMM = dict["DMM"]
+        self.count = max(int(dict.get("Repeat", 1)), 1)
+        buffered = str(dict.get("Acquisition", "")).upper() == "BUFFERED"
+        self.enabled = self.count > 1 and not buffered
+        if not self.enabled:
+            self.count = 1
+
+        self.chunk = max(int(dict.get("RepeatChunk", 64)), 1)
+        self.z = NormalDist().inv_cdf(0.5 + float(dict.get("Confidence", 0.95)) / 2)
+        self.transfers = 0
+        self.statistics = {}
+
+    def arm(self):
+        """Sets the DMM to N readings per trigger in binary format, before a point is initiated"""
+        if self.enabled:
+            self.Sample(self.DMM).setSampleCount(self.count)
+            self.Format(self.DMM).setDataFormat("REAL,64")
+            self.Format(self.DMM).setByteOrder("SWAP")
+
+    def fetch(self, point):
+        """Returns the reading of a point, the mean of its N readings when repeated
+
+        Args:
+            point: Any value identifying the point, its statistics are kept under it.
+
+        Raises:
+            RuntimeError: The DMM returned fewer than N readings for the point.
+        """
+        if not self.enabled:
+            return float(self.Fetch(self.DMM).query())
+
+        count, mean, m2 = 0, 0.0, 0.0
+        minimum, maximum = float("inf"), float("-inf")
+        while count < self.count:
+            size = min(self.chunk, self.count - count)
+            values = self.Data(self.DMM).removeBinary(size, "REAL,64", wait=True)
+            self.transfers += 1
+            if len(values) < size:
+                raise RuntimeError(
+                    f"{self.DMM} returned {count + len(values)} of {self.count} "
+                    f"readings of point {point}"
+                )
+
+            # The chunk is merged into the running statistics (Chan et al.)
+            size = len(values)
+            chunk_mean = float(values.mean())
+            delta = chunk_mean - mean
+            m2 += float(((values - chunk_mean) ** 2).sum())
+            m2 += delta**2 * count * size / (count + size)
+            count += size
+            mean += delta * size / count
+            minimum = min(minimum, float(values.min()))
+            maximum = max(maximum, float(values.max()))
+
+        deviation = (m2 / (count - 1)) ** 0.5 if count > 1 else 0.0
+        half = self.z * deviation / count**0.5 if count else 0.0
+        self.statistics[point] = [
+            count,
+            deviation,
+            minimum,
+            maximum,
+            mean - half,
+            mean + half,
+        ]
+        return mean
+
+    def getRegulation(self):
+        """Returns the half width in percent of the confidence interval of a load regulation
+
+        The interval is propagated from the intervals of the "No Load" and "Full Load" readings of
+        the regulation, (NL - FL) / FL * 100.
+        """
+        no_load, full_load = self.statistics["No Load"], self.statistics["Full Load"]
+        NL, FL = (no_load[4] + no_load[5]) / 2, (full_load[4] + full_load[5]) / 2
+        NL_half, FL_half = (no_load[5] - no_load[4]) / 2, (full_load[5] - full_load[4]) / 2
+        return 100 * ((NL_half / FL) ** 2 + (NL * FL_half / FL**2) ** 2) ** 0.5
+
+    def close(self):
+        """Returns the DMM to a single reading per trigger in ASCII format"""
+        if self.enabled:
+            self.Sample(self.DMM).setSampleCount(1)
+            self.Format(self.DMM).setDataFormat("ASC")
+
+    def report(self):
+        """Returns a summary of the readings taken and the widest confidence interval"""
+        if not self.enabled:
+            return f"{self.DMM} (SINGLE): 1 reading per point"
+
+        if not self.statistics:
+            return f"{self.DMM} (REPEAT {self.count}): no points measured"
+
+        widest = max(self.statistics.items(), key=lambda x: x[1][5] - x[1][4])
+        return (
+            f"{self.DMM} (REPEAT {self.count}): {len(self.statistics)} points in "
+            f"{self.transfers} transfers, widest interval "
+            f"{widest[1][5] - widest[1][4]:.3g} at {widest[0]}"
+        )
+
+
+class ListSweep:
+    """Class to step the ELoad through a profile that is downloaded once into its List Subsystem
+
+    Instead of programming every setpoint with a separate CURR/VOLT command, the whole profile is
+    written into the List Subsystem of the N6700 ELoad in a single command. The list is stepped once
+    per trigger (LIST:STEP ONCE) with the Transient Trigger Source set to BUS, so every step costs a
+    single short write. The List Mode is used when the key ELoadSweep is set to "LIST", otherwise every
+    setpoint is programmed separately. The optional key ListDwell sets the dwell time of every step in
+    seconds.
+
+    With the key ListTrigger set to "ELOAD" the trigger output of the ELoad is routed to the external
+    trigger input of the DMM, through the pin of the Digital Port given by the key ListPin (1 unless
+    specified). The ELoad then steps once per point and triggers the DMM at the end of every step, so
+    a single TRIG:TRAN both advances the ELoad and starts the reading, the dwell time being the settle
+    time of the ELoad. A point measured again (e.g. on a retry) is triggered on the bus instead, so the
+    ELoad stays on its step.
+
+    The N6700 accepts up to 512 points in a list, a longer profile is downloaded in segments of 512
+    points, the next segment being downloaded when the last step of the previous one is done.
+
+    Attributes:
+        ELoad: String containing the VISA Address of the ELoad used.
+        DMM: String containing the VISA Address of the DMM triggered by the ELoad.
+        Channel: Integer containing the channel number that the ELoad is using.
+        Function: String determining whether a "Current" or "Voltage" list is used.
+        profile: List containing the setpoints of the ELoad in the order they are stepped.
+        dwell: Float containing the dwell time of every step in seconds.
+        routed: Boolean determining whether the ELoad triggers the DMM through its trigger output.
+        pin: Integer containing the pin of the Digital Port wired to the external trigger of the DMM.
+        start: Integer containing the index of the first step of the segment downloaded.
+        index: Integer containing the index of the current step, -1 before the first step.
+        point: The point last triggered by the ELoad, None before the first point.
+
+    """
+
+    # Largest number of points the List Subsystem of the N6700 accepts
+    POINTS = 512
+
+    def __init__(self, dict, Function, profile, trigger="BUS"):
+        self.ELoad = dict["ELoad"]
+        self.DMM = dict.get("DMM")
+        self.Channel = dict["ELoad_Channel"]
+        self.Function = Function
+        self.profile = profile
+        self.dwell = dict.get("ListDwell", 0)
+        self.routed = str(trigger).upper() == "ELOAD"
+        self.pin = dict.get("ListPin", 1)
+        self.start = 0
+        self.index = -1
+        self.point = None
+
+        self.List = Dimport.getClass(dict["Instrument"], "List")
+        self.Current = Dimport.getClass(dict["Instrument"], "Current")
+        self.Voltage = Dimport.getClass(dict["Instrument"], "Voltage")
+        self.Trigger = Dimport.getClass(dict["Instrument"], "Trigger")
+        self.Initiate = Dimport.getClass(dict["Instrument"], "Initiate")
+        if self.routed:
+            self.Digital = Dimport.getClass(dict["Instrument"], "Digital")
+
+    @staticmethod
+    def getProfile(minimum, step_size, iterations):
+        """Returns the setpoints of a sweep in the same order as the test loops step through them
+
+        Args:
+            minimum: Float containing the first setpoint of the sweep.
+            step_size: Float containing the step size of the sweep.
+            iterations: Float containing the number of iterations of the sweep.
+        """
+        profile = []
+        value = float(minimum)
+        while len(profile) < iterations:
+            profile.append(value)
+            value += float(step_size)
+
+        return profile
+
+    def plan(self, points):
+        """Sets the profile to the ELoad setpoints of the points of a sweep, in the order they are stepped
+
+        The ELoad steps once per outer setpoint, or once per point when it triggers the DMM.
+
+        Args:
+            points: List containing the points of the sweep as (index, iteration, outer, inner).
+        """
+        if self.routed:
+            outer = [x[2] for x in points]
+
+        else:
+            outer = SweepPlanner.getOuterProfile(points)
+
+        self.profile = [x - 0.001 * x for x in outer]
+        self.point = None
+
+    def download(self, start=0):
+        """Writes a segment of the profile into the List Subsystem and initiates the transient system
+
+        Args:
+            start: Integer containing the index of the first step of the segment.
+
+        Raises:
+            ValueError: The profile is empty from the start given.
+        """
+        segment = self.profile[start : start + self.POINTS]
+        if not segment:
+            raise ValueError(f"The ELoad list has no points from step {start}")
+
+        values = ",".join(str(x) for x in segment)
+        dwells = ",".join(str(self.dwell) for x in segment)
+
+        if self.Function == "Current":
+            self.List(self.ELoad).setCurrentList(values, self.Channel)
+            self.Current(self.ELoad).setCurrentMode("LIST", self.Channel)
+
+        else:
+            self.List(self.ELoad).setVoltageList(values, self.Channel)
+            self.Voltage(self.ELoad).setVoltageMode("LIST", self.Channel)
+
+        self.List(self.ELoad).setDwellList(dwells, self.Channel)
+        self.List(self.ELoad).setStepMode("ONCE", self.Channel)
+        self.List(self.ELoad).setListCount(1, self.Channel)
+        self.List(self.ELoad).setTerminateLast("ON", self.Channel)
+        if self.routed:
+            # Every step ends with a pulse on the pin wired to the external trigger of the DMM
+            states = ",".join("1" for x in segment)
+            self.List(self.ELoad).setEndStepTriggerOutput(states, self.Channel)
+            self.Digital(self.ELoad).setPinFunction("TOUT", self.pin)
+            self.Digital(self.ELoad).setPinPolarity("POS", self.pin)
+
+        self.Trigger(self.ELoad).setTransientSource("BUS", self.Channel)
+        self.Initiate(self.ELoad).initiateTransient(self.Channel)
+        self.start = start
+        self.index = start - 1
+
+    def step(self):
+        """Steps the ELoad to the next point of the profile
+
+        The step is not waited for, the settling of the DUT follows it before the DMM is triggered.
+
+        Returns:
+            Returns the setpoint of the ELoad after the step.
+        """
+        if self.index + 1 >= self.start + self.POINTS:
+            self.download(self.index + 1)
+
+        self.index += 1
+        self.Trigger(self.ELoad).triggerTransient(self.Channel)
+        return self.profile[self.index]
+
+    def arm(self, point):
+        """Sets the trigger source of the DMM for a point, to be done before the DMM is initiated
+
+        Args:
+            point: Any value identifying the sweep point, the same value for a point measured again.
+        """
+        if self.routed:
+            source = "BUS" if point == self.point else "EXT"
+            self.Trigger(self.DMM).setSource(source)
+
+    def trigger(self, point):
+        """Triggers the reading of a point on the DMM
+
+        When the ELoad triggers the DMM, the ELoad is stepped to the point and triggers the DMM at the
+        end of the step. A point measured again is triggered on the bus, so the ELoad stays on its step.
+
+        Args:
+            point: Any value identifying the sweep point, the same value for a point measured again.
+        """
+        if not self.routed or point == self.point:
+            TRG(self.DMM)
+
+        else:
+            self.point = point
+            self.step()
+
+    def close(self):
+        """Returns the ELoad to fixed mode after the list sweep, and the DMM to the bus trigger"""
+        if self.Function == "Current":
+            self.Current(self.ELoad).setCurrentMode("FIX", self.Channel)
+
+        else:
+            self.Voltage(self.ELoad).setVoltageMode("FIX", self.Channel)
+
+        if self.routed:
+            self.Trigger(self.DMM).setSource("BUS")
+
+
+class DataLogger:
+    """Class to log the output of the DUT on the datalogger of the PSU while the ELoad steps through its profile
+
+    By default the load regulation is taken from a single DMM reading at no load and a single reading
+    at full load. When the key Datalog is set to "ON", the voltage and current of the PSU channel are
+    logged by the datalogger of the N6700 mainframe (SENS:DLOG) every DlogPeriod seconds instead, while
+    the ELoad steps through LoadSteps levels from no load to full load, each held for LoadDwell seconds.
+    The host only programs the ELoad and records when every step was programmed relative to the trigger
+    of the log, so there is no bus traffic per sample. Once the log is complete it is exported to a CSV
+    file in the memory of the mainframe (MMEM:EXP:DLOG), read back in a single transfer (MMEM:DATA?) and
+    every sample is assigned to the load step it was taken in. The log is stopped (ABOR:DLOG) once the
+    last step has been held, its duration only bounds the log. The samples of the first DlogSettle
+    seconds of every step are left out of its statistics, so the transient of the step does not bias
+    the regulation. The optional key DlogFile sets the path of the log in the memory of the mainframe.
+
+    The ELoad is stepped by writing its level, hence a LIST sweep of the ELoad is not used with the
+    datalogger.
+
+    Attributes:
+        PSU: String containing the VISA Address of the PSU used.
+        ELoad: String containing the VISA Address of the ELoad used.
+        Channel: Integer containing the channel number that the PSU is using.
+        ELoad_Channel: Integer containing the channel number that the ELoad is using.
+        enabled: Boolean determining whether the regulation is taken from the datalogger.
+        Function: String containing the function the ELoad steps, "Current" under CV or "Voltage" under CC.
+        period: Float containing the time in seconds between two samples.
+        dwell: Float containing the time in seconds every load step is held.
+        settle: Float containing the time in seconds left out at the start of every load step.
+        steps: Integer containing the number of load steps, from no load to full load.
+        duration: Float containing the longest duration of the log in seconds, with a margin for the
+            bus time of every step.
+        stepTimes: List containing the time in seconds from the trigger of the log to every load step.
+        transferred: Integer containing the number of bytes of the log read back.
+        logList: Array containing the time, voltage, current and load step of every sample.
+        stepList: List containing the level, the number of samples, the mean, minimum and maximum
+            voltage and the mean, minimum and maximum current, for every load step.
+
+    """
+
+    def __init__(self, dict, Function):
+        self.PSU = dict["PSU"]
+        self.ELoad = dict["ELoad"]
+        self.Channel = dict["PSU_Channel"]
+        self.ELoad_Channel = dict["ELoad_Channel"]
+        self.enabled = str(dict.get("Datalog", "OFF")).upper() == "ON"
+        self.Function = Function
+        self.period = float(dict.get("DlogPeriod", 0.001))
+        self.dwell = float(dict.get("LoadDwell", 0.1))
+        self.settle = float(dict.get("DlogSettle", 0.01))
+        self.steps = max(int(dict.get("LoadSteps", 2)), 2)
+        self.file = dict.get("DlogFile", "internal:\\regulation")
+        # The bus time of every step adds to its dwell, the log is aborted once the last step was held
+        self.duration = self.steps * (self.dwell + self.settle) + self.dwell
+        self.stepTimes = []
+        self.transferred = 0
+        self.logList = numpy.empty((0, 4))
+        self.stepList = []
+
+    def getProfile(self, no_load, full_load):
+        """Returns the levels of the ELoad, evenly spaced from no load to full load"""
+        return [
+            no_load + (full_load - no_load) * i / (self.steps - 1)
+            for i in range(self.steps)
+        ]
+
+    def setLevel(self, level):
+        if self.Function == "Current":
+            Keysight.Current(self.ELoad).setOutputCurrent(level, self.ELoad_Channel)
+
+        else:
+            Keysight.Voltage(self.ELoad).setOutputVoltage(level, self.ELoad_Channel)
+
+    def capture(self, no_load, full_load):
+        """Logs the output of the DUT while the ELoad steps from no load to full load
+
+        Args:
+            no_load: Float containing the level of the ELoad at no load.
+            full_load: Float containing the level of the ELoad at full load.
+
+        Returns:
+            Returns the mean voltage (CV) or current (CC) of the first and of the last load step.
+
+        Raises:
+            RuntimeError: A load step has no sample after its settling time.
+        """
+        profile = self.getProfile(no_load, full_load)
+        Keysight.Sense(self.PSU).enableVoltageDataLogging("ON", self.Channel)
+        Keysight.Sense(self.PSU).enableCurrentDataLogging("ON", self.Channel)
+        Keysight.Sense(self.PSU).setSamplePeriod(self.period)
+        Keysight.Sense(self.PSU).setSampleDuration(self.duration)
+        Keysight.Trigger(self.PSU).setDLogSource("BUS")
+        Keysight.Initiate(self.PSU).initiateDLog(f'"{self.file}.dlog"')
+        Keysight.Trigger(self.PSU).triggerDLog()
+        start = SessionPool.now()
+
+        self.stepTimes = []
+        for level in profile:
+            self.stepTimes.append(SessionPool.now() - start)
+            self.setLevel(level)
+            SessionPool.sleep(self.dwell)
+
+        Keysight.Abort(self.PSU).abort_dlog()
+        Keysight.MMemory(self.PSU).exportData(f'"{self.file}.csv"')
+        WAI(self.PSU)
+        data = Keysight.MMemory(self.PSU).getData(f'"{self.file}.csv"')
+        self.transferred = len(data)
+        self.align(profile, self.parse(data))
+
+        column = 2 if self.Function == "Current" else 5
+        return self.stepList[0][column], self.stepList[-1][column]
+
+    @staticmethod
+    def parse(data):
+        """Returns the voltage and current of every sample of an exported log
+
+        Args:
+            data: Bytes containing the CSV file exported, a header row starting with "Sample"
+                followed by a row per sample.
+        """
+        lines = data.decode(errors="replace").splitlines()
+        header = next(
+            i for i, x in enumerate(lines) if x.strip().lower().startswith("sample")
+        )
+        names = [x.strip().lower() for x in lines[header].split(",")]
+        columns = (
+            next(i for i, x in enumerate(names) if x.startswith("volt")),
+            next(i for i, x in enumerate(names) if x.startswith("curr")),
+        )
+        return numpy.loadtxt(
+            lines[header + 1 :], delimiter=",", usecols=columns, ndmin=2
+        )
+
+    def align(self, profile, values):
+        """Assigns every sample to the load step it was taken in and summarises every step
+
+        Args:
+            profile: List containing the level of every load step.
+            values: Array containing the voltage and current of every sample.
+
+        Raises:
+            RuntimeError: A load step has no sample after its settling time.
+        """
+        # Every sample averages the period before its time, so a sample straddling a load step
+        # falls in the settling time of the next step
+        times = (numpy.arange(len(values)) + 1) * self.period
+        step = numpy.searchsorted(self.stepTimes, times, side="right") - 1
+        self.logList = numpy.column_stack([times, values, step])
+
+        self.stepList = []
+        for i, level in enumerate(profile):
+            mask = (step == i) & (times >= self.stepTimes[i] + self.settle)
+            if not mask.any():
+                raise RuntimeError(
+                    f"Load step {level:g} has no sample after {self.settle} s, "
+                    f"increase LoadDwell or reduce DlogSettle"
+                )
+
+            voltage, current = values[mask, 0], values[mask, 1]
+            self.stepList.append(
+                [
+                    level,
+                    int(mask.sum()),
+                    voltage.mean(),
+                    voltage.min(),
+                    voltage.max(),
+                    current.mean(),
+                    current.min(),
+                    current.max(),
+                ]
+            )
+
+    def report(self):
+        """Returns a summary of the samples logged and of every load step"""
+        lines = [
+            f"{self.PSU} (DATALOG): {len(self.logList)} samples every "
+            f"{self.period * 1000:g} ms, read back in 1 transfer of {self.transferred} bytes"
+        ]
+        for level, count, V, V_min, V_max, I, I_min, I_max in self.stepList:
+            lines.append(
+                f"  Load {level:g}: {count} samples, voltage {V:.6f} ({V_min:.6f} to "
+                f"{V_max:.6f}), current {I:.6f} ({I_min:.6f} to {I_max:.6f})"
+            )
+
+        return "\n".join(lines)
+
+
+class TransientAnalysis:
+    """Class to analyse the transient of the output of the DUT on a waveform downloaded from the Oscilloscope
+
+    Instead of measuring the transient on the Oscilloscope, with a query for every measurement and a
+    change of the thresholds between them, the waveform is downloaded once as a binary block (see
+    Oscilloscope.getWaveform) and analysed on the host with NumPy. The time of the waveform is relative
+    to the trigger, which is taken as the start of the transient. The initial value is the median of
+    the waveform before the trigger and the final value the mean of its last SettleTail fraction. The
+    settling time to every band is the time from the trigger to the first point after which the output
+    stays within the band of the final value, so any number of bands is evaluated against one capture.
+
+    The recovery time is the settling time to the band V_Settling_Band. Further bands in volts are given
+    by the optional key V_Settling_Bands, a list or a comma separated string.
+
+    Attributes:
+        OSC: String containing the VISA Address of the Oscilloscope used.
+        Channel: Integer containing the channel number of the waveform.
+        mode: String determining whether the waveform is transferred as "WORD" or "BYTE".
+        bands: Array containing the settling bands in volts.
+        tail: Float containing the fraction of the waveform at its end averaged for the final value.
+        points: Integer containing the number of points of the waveform analysed.
+        initial: Float containing the voltage before the transient.
+        final: Float containing the voltage the transient settles to.
+        overshoot: Float containing the peak of the output above the final value.
+        undershoot: Float containing the trough of the output below the final value.
+        recovery: Float containing the settling time to V_Settling_Band, NaN if it never settles.
+        settleList: List containing the band, the settling time and whether the output settled,
+            for every band.
+
+    """
+
+    def __init__(self, dict):
+        self.OSC = dict["OSC"]
+        self.Channel = dict["OSC_Channel"]
+        self.mode = str(dict.get("WaveformFormat", "WORD")).upper()
+        bands = dict.get("V_Settling_Bands", [])
+        if isinstance(bands, str):
+            bands = bands.split(",") if bands.strip() else []
+
+        self.bands = numpy.asarray([dict["V_Settling_Band"], *bands], dtype=float)
+        self.tail = float(dict.get("SettleTail", 0.1))
+        self.points = 0
+        self.initial = numpy.nan
+        self.final = numpy.nan
+        self.overshoot = numpy.nan
+        self.undershoot = numpy.nan
+        self.recovery = numpy.nan
+        self.settleList = []
+
+    def capture(self):
+        """Downloads the waveform captured by the Oscilloscope and analyses it"""
+        time, voltage = Keysight.Oscilloscope(self.OSC).getWaveform(
+            self.Channel, self.mode
+        )
+        self.analyse(time, voltage)
+
+    def analyse(self, time, voltage):
+        """Computes the overshoot, undershoot and settling time to every band of a waveform
+
+        Args:
+            time: Array containing the time in seconds of every point, relative to the trigger.
+            voltage: Array containing the voltage of every point.
+        """
+        time = numpy.asarray(time, dtype=float)
+        voltage = numpy.asarray(voltage, dtype=float)
+        self.points = len(voltage)
+
+        before = time < 0
+        self.initial = numpy.median(voltage[before]) if before.any() else voltage[0]
+        end = time[-1] - (time[-1] - time[0]) * self.tail
+        self.final = voltage[time >= end].mean()
+
+        after = time >= 0
+        t, v = time[after], voltage[after]
+        self.overshoot = max(v.max() - self.final, 0)
+        self.undershoot = max(self.final - v.min(), 0)
+
+        # One row per band: the last point outside the band ends the settling of the output
+        outside = numpy.abs(v - self.final)[None, :] > self.bands[:, None]
+        last = len(v) - 1 - numpy.argmax(outside[:, ::-1], axis=1)
+        settled = ~outside[:, -1]
+        settle_time = t[numpy.minimum(last + 1, len(t) - 1)]
+        settle_time = numpy.where(outside.any(axis=1), settle_time, 0)
+        settle_time = numpy.where(settled, settle_time, numpy.nan)
+
+        self.settleList = [
+            [band, seconds, ok]
+            for band, seconds, ok in zip(
+                self.bands.tolist(), settle_time.tolist(), settled.tolist()
+            )
+        ]
+        self.recovery = self.settleList[0][1]
+
+    def report(self):
+        """Returns a summary of the transient and of the settling time to every band"""
+        lines = [
+            f"{self.OSC} (WAVEFORM): {self.points} points, {self.initial:.4f} V to "
+            f"{self.final:.4f} V, overshoot {self.overshoot:.4f} V, undershoot "
+            f"{self.undershoot:.4f} V"
+        ]
+        for band, seconds, settled in self.settleList:
+            if settled:
+                lines.append(f"  Band {band:g} V: settled in {seconds:.6g} s")
+
+            else:
+                lines.append(f"  Band {band:g} V: not settled within the capture")
+
+        return "\n".join(lines)
+
+
+class SweepPlanner:
+    """Class to plan the order in which the points of a Voltage or Current Accuracy sweep are measured
+
+    The test loops walk the grid with an outer loop over the setpoints of the ELoad and an inner ramp
+    of the PSU, which jumps from the last setpoint of the ramp back to the first on every outer step.
+    The time taken by the DUT to settle grows with the size of the step from the previous point, so
+    the planner orders the points to keep the steps small. The results are still written back in the
+    canonical order of the test loops, so the data processing is not affected by the order.
+
+    The order is set by the key SweepOrder:
+        CANONICAL: The order of the test loops, the default.
+        SERPENTINE: The inner ramp is walked up and down on alternate outer steps.
+        NEAREST: Starting from the first point, the next point is always the one with the smallest
+            expected settle time from the current point (greedy nearest neighbour).
+
+    A first order response settles within a fixed band in a time proportional to the logarithm of its
+    step, hence the expected settle time of a step is taken as log(1 + step / step size) for both the
+    PSU and the ELoad setpoint. The ELoad setpoint is weighted by the optional key ELoadWeight.
+
+    When the key Sampling is set to "ADAPTIVE", only every CoarseStep-th point of every inner ramp
+    (and its last point) is measured first. The margin of a point is how far its error lies inside
+    the spec limit, 1 - |percentage error| / ((Error_Gain * set + Error_Offset) * 100), the same limit
+    checked by Data.datatoGraph, and is negative for a point outside it. Every interval between two
+    measured neighbours is then halved when either margin is within RefineMargin of the limit, the
+    margins differ by more than RefineChange or the limit is crossed, the closest to the limit first,
+    until no interval qualifies or PointBudget points have been measured. A ramp far inside (or far
+    outside) the limit keeps its coarse grid, while the points near the boundary are measured at the
+    full step size. Only the measured points are written back. A point programmed to 0 has no
+    percentage error, hence no margin: it is ignored, and an interval is judged on its other end.
+
+    The refinement only bisects along the inner axis, i.e. between two measured points of the same
+    inner ramp. Every outer setpoint is always measured, its coarse grid included, and no point is
+    added between two outer setpoints.
+
+    Attributes:
+        points: List containing the index, outer index, outer setpoint and inner setpoint of every
+            point in the canonical order.
+        order: String containing the order of the sweep.
+        weight: Float containing the weight of a step of the ELoad setpoint.
+        outer_step: Float containing the step size of the outer setpoints.
+        inner_step: Float containing the step size of the inner setpoints.
+        adaptive: Boolean determining whether the adaptive sampling is used.
+        coarse: Integer containing the step of the coarse grid in points.
+        budget: Integer containing the largest number of points measured.
+        threshold: Float containing the margin below which an interval is refined.
+        change: Float containing the change of margin above which an interval is refined.
+        rounds: Integer containing the number of refinement rounds.
+
+    """
+
+    def __init__(self, dict, outer, inner):
+        self.order = str(dict.get("SweepOrder", "CANONICAL")).upper()
+        self.weight = float(dict.get("ELoadWeight", 1))
+        self.outer_step = self.getStep(outer)
+        self.inner_step = self.getStep(inner)
+        self.columns = len(inner)
+        self.adaptive = str(dict.get("Sampling", "DENSE")).upper() == "ADAPTIVE"
+        self.coarse = max(int(dict.get("CoarseStep", 8)), 1)
+        self.budget = int(dict.get("PointBudget", len(outer) * len(inner)))
+        self.threshold = float(dict.get("RefineMargin", 0.5))
+        self.change = float(dict.get("RefineChange", 0.25))
+        self.gain = float(dict.get("Error_Gain", 0))
+        self.offset = float(dict.get("Error_Offset", 0))
+        self.measured = set()
+        self.rounds = 0
+        self.points = []
+        for i, outer_value in enumerate(outer):
+            for inner_value in inner:
+                self.points.append((len(self.points), i, outer_value, inner_value))
+
+    @staticmethod
+    def getStep(values):
+        """Returns the smallest step between two setpoints, 1 if there is a single setpoint"""
+        steps = [abs(b - a) for a, b in zip(values, values[1:]) if b != a]
+        return min(steps) if steps else 1.0
+
+    def cost(self, a, b):
+        """Returns the expected settle time of the step from point a to point b"""
+        return log1p(abs(b[3] - a[3]) / self.inner_step) + self.weight * log1p(
+            abs(b[2] - a[2]) / self.outer_step
+        )
+
+    def plan(self, readings=None):
+        """Returns the points measured first in the order they are measured
+
+        Every point of the grid is returned, or only the coarse grid when the adaptive sampling is
+        used, limited to the PointBudget. The points already completed are left out.
+
+        Args:
+            readings: Dictionary mapping the index of every point completed (e.g. by a previous run
+                of the sweep, see Checkpoint) to its reading.
+
+        Raises:
+            ValueError: The SweepOrder is not supported.
+        """
+        readings = readings or {}
+        self.measured.update(readings)
+        points = self.points
+        if self.adaptive:
+            last = self.columns - 1
+            points = [
+                point
+                for point in self.points
+                if (point[0] % self.columns) % self.coarse == 0
+                or point[0] % self.columns == last
+            ][: max(self.budget, 0)]
+
+        points = [point for point in points if point[0] not in readings]
+        if not points and readings:
+            return self.refine(readings)
+
+        self.measured.update(point[0] for point in points)
+        return self.sort(points)
+
+    def sort(self, points):
+        """Returns the points given in the order they are measured
+
+        Raises:
+            ValueError: The SweepOrder is not supported.
+        """
+        if self.order == "CANONICAL" or not points:
+            return list(points)
+
+        if self.order == "SERPENTINE":
+            planned = []
+            rows = {}
+            for point in points:
+                rows.setdefault(point[1], []).append(point)
+
+            for i, row in enumerate(rows.values()):
+                planned.extend(row if i % 2 == 0 else row[::-1])
+
+            return planned
+
+        if self.order == "NEAREST":
+            outer = numpy.array([point[2] for point in points])
+            inner = numpy.array([point[3] for point in points])
+            visited = numpy.zeros(len(points), dtype=bool)
+            planned = []
+            current = 0
+            while True:
+                visited[current] = True
+                planned.append(points[current])
+                if len(planned) == len(points):
+                    return planned
+
+                costs = numpy.log1p(
+                    numpy.abs(inner - inner[current]) / self.inner_step
+                ) + self.weight * numpy.log1p(
+                    numpy.abs(outer - outer[current]) / self.outer_step
+                )
+                costs[visited] = numpy.inf
+                current = int(numpy.argmin(costs))
+
+        raise ValueError(f"Unsupported SweepOrder: {self.order}")
+
+    @staticmethod
+    def getOuterProfile(points):
+        """Returns the outer setpoints in the order the ELoad is stepped through them"""
+        profile = []
+        for point in points:
+            if not profile or profile[-1] != point[2]:
+                profile.append(point[2])
+
+        return profile
+
+    def getMargin(self, setpoint, measured):
+        """Returns how far the error of a point lies inside the spec limit
+
+        Args:
+            setpoint: Float containing the programmed value of the point.
+            measured: Float containing the measured value of the point.
+
+        Returns:
+            Returns 1 for a point without error, 0 on the limit and a negative value outside it, None
+            for a point without a percentage error (setpoint 0) or without a limit.
+        """
+        limit = (self.gain * setpoint + self.offset) * 100
+        if setpoint == 0 or limit <= 0:
+            return None
+
+        return 1 - abs((setpoint - measured) / setpoint * 100) / limit
+
+    def refine(self, readings):
+        """Returns the next points to measure from the readings of the points measured so far
+
+        Args:
+            readings: Dictionary mapping the index of every point measured to its reading.
+
+        Returns:
+            Returns the points in the order they are measured, an empty list once the sweep is done.
+        """
+        remaining = self.budget - len(self.measured)
+        if not self.adaptive or remaining <= 0:
+            return []
+
+        rows = {}
+        for k in sorted(readings):
+            rows.setdefault(self.points[k][1], []).append(k)
+
+        candidates = []
+        for row in rows.values():
+            for k, l in zip(row, row[1:]):
+                if l - k < 2:
+                    continue
+
+                # An end without a margin is ignored, the interval is judged on the other
+                margins = [
+                    self.getMargin(self.points[x][3], readings[x]) for x in (k, l)
+                ]
+                margins = [x for x in margins if x is not None]
+                if not margins:
+                    continue
+
+                closest = min(abs(x) for x in margins)
+                jump = max(margins) - min(margins)
+                if (
+                    closest < self.threshold
+                    or jump > self.change
+                    or min(margins) < 0 <= max(margins)
+                ):
+                    candidates.append((closest - jump, (k + l) // 2))
+
+        candidates.sort()
+        points = [self.points[k] for priority, k in candidates[:remaining]]
+        if points:
+            self.rounds += 1
+            self.measured.update(point[0] for point in points)
+
+        return self.sort(sorted(points))
+
+    def expectedSettle(self, points):
+        """Returns the total expected settle time of the points in the order given"""
+        return sum(self.cost(a, b) for a, b in zip(points, points[1:]))
+
+    def report(self, points):
+        """Returns a summary of the order planned against the canonical order"""
+        return (
+            f"Sweep Order {self.order}: {len(points)} points, expected settle "
+            f"{self.expectedSettle(points):.1f} "
+            f"(canonical {self.expectedSettle(self.points):.1f})"
+        )
+
+    def reportSampling(self):
+        """Returns a summary of the points measured against the full grid"""
+        return (
+            f"Sampling {'ADAPTIVE' if self.adaptive else 'DENSE'}: "
+            f"{len(self.measured)} of {len(self.points)} points measured "
+            f"in {self.rounds} refinement rounds"
+        )
+
+
+class Settling:
+    """Class to wait for the DUT to settle before the final reading of a sweep point
+
+    By default the program waits the fixed UpTime before a reading and the fixed DownTime after it,
+    whether or not the DUT has settled. When the key Settling is set to "ADAPTIVE", the DMM instead
+    takes fast readings at a low NPLC (READ? with the trigger source set to IMM) until the spread of
+    the last SettleWindow readings and the rate of change between the first and last of them both
+    fall below their tolerances. The DMM is then returned to the Aperture of the DUT Test and the
+    trigger source BUS for the final high accuracy reading, and the DownTime is no longer waited since
+    the next point settles on its own. The settling is given up after SettleTimeout seconds, which
+    defaults to the UpTime (at least 1 second), so that a DUT that never settles cannot stall the sweep.
+
+    The optional keys are SettleNPLC, SettleTolerance (Volts or Amperes), SettleRate (Volts or Amperes
+    per second), SettleWindow and SettleTimeout. Since the fast readings would disturb the readings
+    buffered in the DMM, the fixed delays are kept when the key Acquisition is set to "BUFFERED". When
+    the points are repeated (see RepeatAcquisition), the fast readings are single ASCII readings.
+
+    Attributes:
+        PSU: String containing the VISA Address of the PSU used.
+        DMM: String containing the VISA Address of the DMM used.
+        adaptive: Boolean determining whether the adaptive settling is used.
+        repeat: Boolean determining whether the points are repeated.
+        nplc: Float containing the NPLC of the fast readings.
+        aperture: Float containing the NPLC of the final reading.
+        tolerance: Float containing the largest spread of the readings in the window.
+        rate: Float containing the largest rate of change of the readings in the window.
+        window: Integer containing the number of readings checked.
+        timeout: Float containing the longest time in seconds waited for a point to settle.
+        settleList: List containing the point, the settle time in seconds, the number of fast readings
+            and whether the point settled, for every point.
+
+    """
+
+    def __init__(self, dict, Function):
+        self.Read = Dimport.getClass(dict["Instrument"], "Read")
+        self.Delay = Dimport.getClass(dict["Instrument"], "Delay")
+        self.Trigger = Dimport.getClass(dict["Instrument"], "Trigger")
+        self.Sample = Dimport.getClass(dict["Instrument"], "Sample")
+        self.Format = Dimport.getClass(dict["Instrument"], "Format")
+        self.Measurement = Dimport.getClass(dict["Instrument"], Function)
+
+        self.PSU = dict["PSU"]
+        self.DMM = dict["DMM"]
+        self.UpTime = dict["UpTime"]
+        self.DownTime = dict["DownTime"]
+        self.adaptive = (
+            str(dict.get("Settling", "FIXED")).upper() == "ADAPTIVE"
+            and str(dict.get("Acquisition", "")).upper() != "BUFFERED"
+        )
+        self.repeat = int(dict.get("Repeat", 1)) > 1
+        self.nplc = float(dict.get("SettleNPLC", 0.02))
+        self.aperture = float(dict["Aperture"])
+        self.tolerance = float(dict.get("SettleTolerance", 1e-3))
+        self.rate = float(dict.get("SettleRate", 0.05))
+        self.window = max(int(dict.get("SettleWindow", 3)), 2)
+        self.timeout = float(
+            dict.get("SettleTimeout", max(float(self.UpTime) / 1000, 1))
+        )
+        self.settleList = []
+
+    def isSettled(self, readings):
+        """Determines whether the readings in the window have settled
+
+        Args:
+            readings: List containing the time and value of the last readings.
+        """
+        values = [value for time, value in readings]
+        elapsed = readings[-1][0] - readings[0][0]
+        rate = abs(values[-1] - values[0]) / elapsed if elapsed > 0 else 0
+        return max(values) - min(values) <= self.tolerance and rate <= self.rate
+
+    def up(self, point=None):
+        """Waits for the DUT to settle after its setpoint has been changed
+
+        Args:
+            point: Any value identifying the sweep point, recorded with its settle time.
+
+        Returns:
+            Returns the settle time in seconds, the UpTime when the fixed delays are used.
+        """
+        if not self.adaptive:
+            self.Delay(self.PSU).write(self.UpTime)
+            return float(self.UpTime) / 1000
+
+        start = SessionPool.now()
+        readings = []
+        settled = False
+        self.Measurement(self.DMM).setNPLC(self.nplc)
+        self.Trigger(self.DMM).setSource("IMM")
+        if self.repeat:
+            self.Sample(self.DMM).setSampleCount(1)
+            self.Format(self.DMM).setDataFormat("ASC")
+
+        while not settled and SessionPool.now() - start < self.timeout:
+            value = float(self.Read(self.DMM).query())
+            readings.append((SessionPool.now(), value))
+            settled = len(readings) >= self.window and self.isSettled(
+                readings[-self.window :]
+            )
+
+        self.Measurement(self.DMM).setNPLC(self.aperture)
+        self.Trigger(self.DMM).setSource("BUS")
+        elapsed = SessionPool.now() - start
+        self.settleList.append([point, elapsed, len(readings), settled])
+        return elapsed
+
+    def down(self):
+        """Waits after the reading of a sweep point, only when the fixed delays are used"""
+        if not self.adaptive:
+            self.Delay(self.PSU).write(self.DownTime)
+
+    def report(self):
+        """Returns a summary of the settle times of every point"""
+        if not self.adaptive:
+            return f"{self.PSU} (FIXED): UpTime {self.UpTime} ms, DownTime {self.DownTime} ms"
+
+        if not self.settleList:
+            return f"{self.DMM} (ADAPTIVE): no points settled"
+
+        times = [x[1] for x in self.settleList]
+        timeouts = sum(1 for x in self.settleList if not x[3])
+        return (
+            f"{self.DMM} (ADAPTIVE): {len(times)} points, "
+            f"average {sum(times) / len(times) * 1000:.2f} ms, "
+            f"longest {max(times) * 1000:.2f} ms, {timeouts} timeouts"
+        )
+
+
+class RangeOptimizer:
+    """Class to select the fastest NPLC and range of the DMM that meet the uncertainty required by the DUT
+
+    By default every point is measured at the Aperture and Range of the DUT Test, chosen for the
+    hardest point of the sweep. When the key Optimize is set to "ON", the setpoints measured are
+    grouped into regions by the smallest range of the DMM covering them (with 20% overrange), and the
+    noise of the DMM is characterized on the range of every region before the outputs are enabled:
+    NoiseSamples readings are taken at increasing NPLC until their standard deviation, times the
+    CoverageFactor, lies within UncertaintyMargin of the error limit of the smallest setpoint of the
+    region. The error limit is that of the test results, (Error_Gain * x + Error_Offset) * x, and
+    setpoint 0, whose limit is 0, is held to the limit of the smallest non-zero setpoint instead. Every
+    point is then measured at the range and NPLC of its region, the Aperture being the largest NPLC
+    used, and a region that does not meet its margin at the Aperture is measured at the Aperture.
+
+    The readings buffered in the DMM share a single configuration, hence a single region covering every
+    setpoint is used when the key Acquisition is set to "BUFFERED".
+
+    Attributes:
+        DMM: String containing the VISA Address of the DMM used.
+        enabled: Boolean determining whether the NPLC and range are selected per region.
+        single: Boolean determining whether a single region covers every setpoint.
+        aperture: Float containing the largest NPLC used.
+        margin: Float containing the fraction of the error limit the uncertainty of the DMM may use.
+        coverage: Float containing the coverage factor applied to the standard deviation of the noise.
+        samples: Integer containing the number of readings taken per NPLC characterized.
+        ranges: Tuple containing the ranges of the DMM for the function measured.
+        regions: Dictionary mapping the range of every region to its index in rangeList.
+        reads: Integer containing the number of READ? queries spent on the characterization.
+        rangeList: List containing the range, the NPLC selected, the standard deviation of the noise,
+            the standard deviation required, whether it was met and the number of setpoints, for every
+            region.
+
+    """
+
+    NPLC = (0.02, 0.2, 1, 10, 100)
+    RANGES = {
+        "Voltage": (0.1, 1, 10, 100, 1000),
+        "Current": (1e-4, 1e-3, 1e-2, 0.1, 1, 3),
+    }
+    OVERRANGE = 1.2
+
+    def __init__(self, dict, Function):
+        self.Read = Dimport.getClass(dict["Instrument"], "Read")
+        self.Sense = Dimport.getClass(dict["Instrument"], "Sense")
+        self.Sample = Dimport.getClass(dict["Instrument"], "Sample")
+        self.Trigger = Dimport.getClass(dict["Instrument"], "Trigger")
+        self.Measurement = Dimport.getClass(dict["Instrument"], Function)
+
+        self.DMM = dict["DMM"]
+        self.Function = Function
+        self.enabled = str(dict.get("Optimize", "OFF")).upper() == "ON"
+        self.single = str(dict.get("Acquisition", "")).upper() == "BUFFERED"
+        self.aperture = float(dict["Aperture"])
+        self.gain = float(dict.get("Error_Gain", 0))
+        self.offset = float(dict.get("Error_Offset", 0))
+        self.margin = float(dict.get("UncertaintyMargin", 0.1))
+        self.coverage = float(dict.get("CoverageFactor", 2))
+        self.samples = max(int(dict.get("NoiseSamples", 8)), 2)
+        self.ranges = self.RANGES[Function]
+        if Function == "Current" and dict.get("Terminal") == "10A":
+            self.ranges = (10,)
+
+        self.regions = {}
+        self.reads = 0
+        self.rangeList = []
+
+    def getRange(self, value):
+        """Returns the smallest range of the DMM covering a setpoint"""
+        for range in self.ranges:
+            if abs(value) <= range * self.OVERRANGE:
+                return range
+
+        return self.ranges[-1]
+
+    def getLimit(self, setpoint):
+        """Returns the error limit of a setpoint in Volts or Amperes"""
+        return (self.gain * abs(setpoint) + self.offset) * abs(setpoint)
+
+    def setRange(self, range):
+        if self.Function == "Current":
+            self.Sense(self.DMM).setCurrentRangeDC(range)
+
+        else:
+            self.Sense(self.DMM).setVoltageRangeDC(range)
+
+    def plan(self, setpoints):
+        """Characterizes the noise of the DMM on the range of every region, with the outputs disabled
+
+        Args:
+            setpoints: List containing every setpoint measured in the sweep.
+        """
+        if not self.enabled or not setpoints:
+            return
+
+        regions = {}
+        for setpoint in setpoints:
+            range = self.getRange(max(setpoints, key=abs) if self.single else setpoint)
+            regions.setdefault(range, []).append(setpoint)
+
+        self.Trigger(self.DMM).setSource("IMM")
+        self.Sample(self.DMM).setSampleCount(self.samples)
+        nonzero = [abs(x) for x in setpoints if x != 0] or [0]
+        for range, values in sorted(regions.items()):
+            limits = [self.getLimit(x) for x in values if x != 0]
+            required = self.margin * min(limits or [self.getLimit(min(nonzero))])
+            self.regions[range] = len(self.rangeList)
+            result = self.characterize(range, required / self.coverage)
+            self.rangeList.append([range, *result, len(values)])
+
+        self.Sample(self.DMM).setSampleCount(1)
+        self.Trigger(self.DMM).setSource("BUS")
+
+    def characterize(self, range, required):
+        """Returns the lowest NPLC whose noise meets the standard deviation required on a range
+
+        The Aperture is the fallback and is not characterized, its noise is extrapolated from the last
+        NPLC characterized since the noise falls with the square root of the integration time.
+
+        Returns:
+            Returns the NPLC, the standard deviation measured, the standard deviation required and
+            whether it was met.
+        """
+        self.setRange(range)
+        deviation, nplc = float("inf"), self.aperture
+        for nplc in [x for x in self.NPLC if x < self.aperture]:
+            self.Measurement(self.DMM).setNPLC(nplc)
+            values = [float(x) for x in self.Read(self.DMM).query().split(",")]
+            self.reads += 1
+            deviation = float(numpy.std(values, ddof=1))
+            if deviation <= required:
+                return [nplc, deviation, required, True]
+
+        deviation *= (nplc / self.aperture) ** 0.5
+        return [self.aperture, deviation, required, deviation <= required]
+
+    def apply(self, setpoint=None):
+        """Programs the range and NPLC of the region of a setpoint before it is measured
+
+        Args:
+            setpoint: Float containing the setpoint measured, None for the single region.
+
+        Returns:
+            Returns the expected integration time in seconds, the same as Completion.getWait.
+        """
+        if not self.rangeList:
+            return self.aperture / 60
+
+        region = self.rangeList[
+            0 if self.single else self.regions[self.getRange(setpoint)]
+        ]
+        self.setRange(region[0])
+        self.Measurement(self.DMM).setNPLC(region[1])
+        return region[1] / 60
+
+    def getSettings(self, dict):
+        """Returns the settings of the DUT Test with the Aperture of the single region"""
+        if not (self.single and self.rangeList):
+            return dict
+
+        return {**dict, "Aperture": self.rangeList[0][1]}
+
+    def report(self):
+        """Returns a summary of the NPLC and range selected for every region"""
+        if not self.rangeList:
+            return f"{self.DMM} (FIXED): {self.aperture:g} NPLC"
+
+        lines = [f"{self.DMM} (OPTIMIZE): {self.reads} noise characterization reads"]
+        for range, nplc, deviation, required, met, count in self.rangeList:
+            lines.append(
+                f"  {range:g} range: {nplc:g} NPLC, noise {deviation:.3g} "
+                f"{'<=' if met else '>'} {required:.3g}, {count} setpoints"
+            )
+
+        return "\n".join(lines)
+
+
+class Checkpoint:
+    """Class to record the completed points of a sweep in an append log, so that an interrupted sweep resumes
+
+    When the key Checkpoint is set to the path of a log file, the first line of the log records the
+    test, its settings (the configuration applied to the Instruments during the setup), the identity of
+    the DUT (the *IDN? of the PSU, which holds its serial number) and the time the log was started, and
+    every completed point is appended as a line containing its index and reading, followed by its
+    statistics when the point is repeated (see RepeatAcquisition). Every line is written
+    through to the operating system straight away, so a test ended by an error loses nothing, while
+    the log is only synced to the disk (fsync) every CheckpointSync points (default 32) to keep the
+    cost per point low. A partly written last line is ignored.
+
+    When the same test is started again with the same settings on the same DUT, the setup is applied
+    again as usual and the points found in the log are skipped, so the sweep continues from the last good
+    point. A log recorded with different settings, on another DUT, or started more than CheckpointMaxAge
+    seconds ago (default 3600) is discarded, so that a DUT never inherits the readings of another unit.
+    The log is removed once the sweep completes.
+
+    Attributes:
+        path: String containing the path of the log file, None when the checkpoint is disabled.
+        PSU: String containing the VISA Address of the DUT identified in the log.
+        header: Dictionary containing the test and settings recorded in the first line of the log.
+        maxAge: Float containing the age in seconds above which a log is not resumed.
+        sync: Integer containing the number of points appended between two syncs.
+        readings: Dictionary mapping the index of every completed point to its reading.
+        statistics: Dictionary mapping the index of every completed repeated point to its statistics.
+        resumed: Integer containing the number of points found in the log.
+        recorded: Integer containing the number of points appended to the log.
+        syncs: Integer containing the number of syncs made.
+
+    """
+
+    def __init__(self, dict, test):
+        self.path = dict.get("Checkpoint")
+        self.PSU = dict.get("PSU")
+        # The consumers of a MeasurementStream are not settings of the test
+        settings = {key: value for key, value in dict.items() if key != "Consumers"}
+        self.header = json.loads(
+            json.dumps({"test": test, "settings": settings}, sort_keys=True, default=str)
+        )
+        self.maxAge = float(dict.get("CheckpointMaxAge", 3600))
+        self.sync = max(int(dict.get("CheckpointSync", 32)), 1)
+        self.readings = {}
+        self.statistics = {}
+        self.resumed = 0
+        self.recorded = 0
+        self.syncs = 0
+        self.pending = 0
+        self.fetched = 0
+        self.file = None
+
+    def isResumable(self, line, identity):
+        """Determines whether the first line of a log was recorded by the same test on the same DUT
+
+        Args:
+            line: String containing the first line of the log.
+            identity: String containing the *IDN? of the DUT.
+        """
+        try:
+            header = json.loads(line)
+
+        except ValueError:
+            return False
+
+        return (
+            isinstance(header, dict)
+            and {key: header.get(key) for key in self.header} == self.header
+            and header.get("DUT") == identity
+            and 0 <= time.time() - float(header.get("started", 0)) <= self.maxAge
+        )
+
+    def load(self):
+        """Opens the log, reading back the points completed by a previous run of the same test
+
+        Returns:
+            Returns a dictionary mapping the index of every completed point to its reading.
+        """
+        if not self.path:
+            return {}
+
+        identity = IDN(self.PSU).query().strip() if self.PSU else None
+        lines = []
+        if os.path.exists(self.path):
+            with open(self.path) as file:
+                lines = file.read().split("\n")
+
+        if lines and self.isResumable(lines[0], identity):
+            for line in lines[1:]:
+                try:
+                    k, value, *statistics = json.loads(line)
+
+                except (TypeError, ValueError):
+                    continue
+
+                self.readings[k] = value
+                if statistics:
+                    self.statistics[k] = statistics[0]
+
+            self.resumed = len(self.readings)
+            self.file = open(self.path, "a")
+            # A partly written last line is ended so that the next point starts on a new line
+            if lines[-1]:
+                self.file.write("\n")
+
+        else:
+            header = dict(self.header, DUT=identity, started=time.time())
+            self.file = open(self.path, "w")
+            self.file.write(json.dumps(header, sort_keys=True) + "\n")
+
+        self.flush(True)
+        return dict(self.readings)
+
+    def record(self, k, value, statistics=None):
+        """Appends a completed point to the log
+
+        Args:
+            k: Integer containing the index of the point.
+            value: Float containing the reading of the point.
+            statistics: List containing the statistics of the point when repeated, otherwise None.
+        """
+        if self.file is None:
+            return
+
+        line = [k, value] if statistics is None else [k, value, statistics]
+        self.file.write(json.dumps(line) + "\n")
+        self.readings[k] = value
+        if statistics is not None:
+            self.statistics[k] = statistics
+
+        self.recorded += 1
+        self.pending += 1
+        self.flush(self.pending >= self.sync)
+
+    def update(self, readings):
+        """Appends the readings of a BufferedAcquisition that have not been recorded yet
+
+        Args:
+            readings: List containing every sweep point fetched so far paired with its reading.
+        """
+        for k, value in readings[self.fetched :]:
+            self.record(k, value)
+
+        self.fetched = len(readings)
+
+    def flush(self, sync=False):
+        """Writes the lines appended through to the operating system, and syncs them to the disk"""
+        self.file.flush()
+        if sync:
+            os.fsync(self.file.fileno())
+            self.pending = 0
+            self.syncs += 1
+
+    def close(self):
+        """Closes the log once the sweep is complete and removes it"""
+        if self.file is None:
+            return
+
+        self.file.close()
+        self.file = None
+        os.remove(self.path)
+
+    def report(self):
+        """Returns a summary of the points resumed and recorded"""
+        if not self.path:
+            return "Checkpoint: disabled"
+
+        return (
+            f"Checkpoint {self.path}: {self.resumed} points resumed, "
+            f"{self.recorded} points recorded in {self.syncs} syncs"
+        )
+
+
+class MeasurementStream:
+    """Class to stream every point of a Voltage or Current Accuracy sweep to its consumers as it is measured
+
+    The results of the sweep are otherwise only available once the test returns its infoList and
+    dataList. The consumers in the optional key Consumers (a list) receive every point as soon as its
+    reading is known, in the order the points are measured, e.g. a live plot, a CSV file written point
+    by point or running statistics (see Data.py). A consumer is any object with a method
+    write(info, data), which takes the rows the point adds to the infoList and dataList, and an
+    optional method close() called once the sweep is complete. The points resumed from a checkpoint
+    are streamed first.
+
+    When the key KeepResults is set to "OFF", the infoList and dataList are not built, and the reading
+    of every point is dropped once it is streamed unless the adaptive sampling still needs it. Hence
+    the memory used by a long sweep stays flat, apart from the readings of a BufferedAcquisition.
+
+    Attributes:
+        consumers: List containing the consumers subscribed to the stream.
+        function: String containing the quantity measured by the DMM, "Voltage" or "Current".
+        keep: Boolean determining whether the infoList and dataList are built.
+        evict: Boolean determining whether the readings are dropped once streamed.
+        streamed: Integer containing the number of points streamed.
+
+    """
+
+    def __init__(self, dict, Sweep, function):
+        self.consumers = list(dict.get("Consumers", []))
+        self.points = Sweep.points
+        self.function = function
+        self.keep = str(dict.get("KeepResults", "ON")).upper() == "ON"
+        self.evict = not self.keep and not Sweep.adaptive
+        self.streamed = 0
+        self.fetched = 0
+
+    def subscribe(self, consumer):
+        self.consumers.append(consumer)
+
+    def emit(self, k, value):
+        """Streams a point to every consumer
+
+        Args:
+            k: Integer containing the index of the point.
+            value: Float containing the reading of the point.
+        """
+        k, i, outer, inner = self.points[k]
+        if self.function == "Voltage":
+            info, data = [inner, outer, i], [value, outer]
+
+        else:
+            info, data = [outer, inner, i], [outer, value]
+
+        for consumer in self.consumers:
+            consumer.write(info, data)
+
+        self.streamed += 1
+
+    def resume(self, readings):
+        """Streams the points resumed from a checkpoint in the canonical order of the sweep"""
+        for k in sorted(readings):
+            self.record(readings, k)
+
+    def record(self, readings, k):
+        """Streams the reading of a point measured, dropping it when the results are not kept"""
+        self.emit(k, readings[k])
+        if self.evict:
+            del readings[k]
+
+    def update(self, readings):
+        """Streams the readings of a BufferedAcquisition that have not been streamed yet
+
+        Args:
+            readings: List containing every sweep point fetched so far paired with its reading.
+        """
+        for k, value in readings[self.fetched :]:
+            self.emit(k, value)
+
+        self.fetched = len(readings)
+
+    def close(self):
+        for consumer in self.consumers:
+            if hasattr(consumer, "close"):
+                consumer.close()
+
+    def report(self):
+        """Returns a summary of the points streamed"""
+        return (
+            f"Measurement Stream: {self.streamed} points streamed to "
+            f"{len(self.consumers)} consumers"
+        )
+
+
+class SweepBuffer:
+    """Class to hold the results of a Voltage or Current Accuracy sweep in preallocated typed columns
+
+    The columns are NumPy arrays sized from the points of the sweep (current_iter * voltage_iter), so
+    no object is allocated per point. The set values and key of every point are filled when the
+    buffer is declared, the time and settle time when the point is triggered and the reading once it
+    is known. The infoList and dataList returned by the test are column-major views of the buffer,
+    whose columns (see Data.py) are handed to pandas without a copy. When only part of the points is
+    measured (adaptive sampling), the measured rows are copied once at the end of the test. A point
+    whose reading failed after its retries (see RetryPolicy) keeps its row, with a NaN reading, so
+    that the gap shows in the results.
+
+    When the key KeepResults is set to "OFF", nothing is allocated (see MeasurementStream).
+
+    Attributes:
+        info: Array containing the Voltage Set, Current Set and key of every point.
+        data: Array containing the Voltage Measured and Current Measured of every point.
+        time: Array containing the time in seconds every point was triggered, NaN until then.
+        settle: Array containing the settle time in seconds of every point, NaN until triggered.
+        measured: Boolean array determining whether the reading of every point is known.
+        stats: Array containing the statistics of every point when the points are repeated (see
+            RepeatAcquisition), empty otherwise.
+        retries: Integer array containing the number of retries of every point.
+        failed: Boolean array determining whether the reading of every point failed.
+        column: Integer containing the column of data measured by the DMM, 0 for Voltage.
+
+    """
+
+    def __init__(self, dict, Sweep, Function):
+        keep = str(dict.get("KeepResults", "ON")).upper() == "ON"
+        size = len(Sweep.points) if keep else 0
+        self.column = 0 if Function == "Voltage" else 1
+        self.info = numpy.empty((size, 3), order="F")
+        self.data = numpy.empty((size, 2), order="F")
+        self.time = numpy.full(size, numpy.nan)
+        self.settle = numpy.full(size, numpy.nan)
+        self.measured = numpy.zeros(size, dtype=bool)
+        self.retries = numpy.zeros(size, dtype=int)
+        self.failed = numpy.zeros(size, dtype=bool)
+        buffered = str(dict.get("Acquisition", "")).upper() == "BUFFERED"
+        repeat = int(dict.get("Repeat", 1)) > 1 and not buffered
+        self.stats = numpy.full((size if repeat else 0, 6), numpy.nan, order="F")
+
+        if size:
+            points = numpy.array(Sweep.points, dtype=float)
+            outer, inner = points[:, 2], points[:, 3]
+            self.info[:, 0] = inner if Function == "Voltage" else outer
+            self.info[:, 1] = outer if Function == "Voltage" else inner
+            self.info[:, 2] = points[:, 1]
+            self.data[:, 1 - self.column] = outer
+            self.data[:, self.column] = numpy.nan
+
+    def mark(self, k, settle):
+        """Records the time a point is triggered and its settle time"""
+        if len(self.time):
+            self.time[k] = SessionPool.now()
+            self.settle[k] = settle
+
+    def retry(self, k, retries, failed):
+        """Records the number of retries of a point and whether its reading failed"""
+        if len(self.failed):
+            self.retries[k] = retries
+            self.failed[k] = failed
+
+    def update(self, readings, statistics=None):
+        """Records the readings of the points measured
+
+        Args:
+            readings: Dictionary mapping the index of every point measured to its reading.
+            statistics: Dictionary mapping the index of every point repeated to its statistics.
+        """
+        if not len(self.measured) or not readings:
+            return
+
+        index = numpy.fromiter(readings.keys(), dtype=int, count=len(readings))
+        self.data[index, self.column] = numpy.fromiter(
+            readings.values(), dtype=float, count=len(readings)
+        )
+        self.measured[index] = True
+
+        if statistics and len(self.stats):
+            index = numpy.fromiter(statistics.keys(), dtype=int, count=len(statistics))
+            self.stats[index] = numpy.array(list(statistics.values()), dtype=float)
+
+    def getLists(self):
+        """Returns the infoList and dataList of the points measured or failed, in the canonical order of the sweep"""
+        rows = self.measured | self.failed
+        if rows.all():
+            return self.info, self.data
+
+        return (
+            numpy.asfortranarray(self.info[rows]),
+            numpy.asfortranarray(self.data[rows]),
+        )
+
+    def getStatistics(self):
+        """Returns the statistics of the points measured in the order of getLists, None when not repeated"""
+        if not len(self.stats):
+            return None
+
+        rows = self.measured | self.failed
+        if rows.all():
+            return self.stats
+
+        return numpy.asfortranarray(self.stats[rows])
+
+    def getFailures(self):
+        """Returns the retries and failure of the points in the order of getLists, None when none was retried"""
+        if not self.retries.any():
+            return None
+
+        rows = self.measured | self.failed
+        return numpy.column_stack((self.retries[rows], self.failed[rows]))
+
+
+class Pipeline:
+    """Class to overlap the host work of a Voltage or Current Accuracy sweep with the integration of the DMM
+
+    By default every point is strictly serial: the setpoints are applied, the DUT settles, the DMM is
+    triggered, the integration time is waited and the reading is fetched and recorded before the next
+    point starts. At 10 to 100 NPLC the integration time dominates while the PSU, the ELoad and the
+    host sit idle. When the key Pipeline is set to "ON", the work that does not disturb the reading in
+    progress is moved into its integration time, i.e. the reading of a point is recorded (checkpoint
+    log and MeasurementStream) while the DMM integrates the next point.
+
+    The ELoad setpoints are not queued: the ELoad only steps once the reading of the last point of an
+    outer step is known, so a queued step would never overlap an integration and would cost a
+    triggered level, an INIT:TRAN and a TRIG:TRAN in place of a single write.
+
+    The expected integration time waited before the first poll of the DMM (or before *OPC?) is
+    shortened by the time spent on that work, so the work is hidden behind the integration instead of
+    added to it. The checkpoint log lags the sweep by a single point. Buffered acquisition triggers the
+    DMM without waiting for the readings, hence there is nothing left to overlap and the pipeline is not
+    used.
+
+    The timing trace of every point is recorded whether or not the pipeline is used, the report
+    compares the time of the sweep with the time it would have taken with the hidden work added.
+
+    Attributes:
+        enabled: Boolean determining whether the host work is moved into the integration time.
+        integration: Float containing the expected integration time of the DMM in seconds.
+        traceList: List containing the point, the time in seconds from its first command to its reading
+            recorded, the integration time, the time hidden behind the integration and the fraction of
+            the integration time overlapped.
+
+    """
+
+    def __init__(self, dict):
+        self.enabled = (
+            str(dict.get("Pipeline", "OFF")).upper() == "ON"
+            and str(dict.get("Acquisition", "")).upper() != "BUFFERED"
+        )
+        self.integration = 0.0
+        self.pending = []
+        self.start = 0.0
+        self.hidden = 0.0
+        self.traceList = []
+
+    def defer(self, function, *args):
+        """Runs the host work of a point, or keeps it until the integration of the next point"""
+        if self.enabled:
+            self.pending.append((function, args))
+
+        else:
+            function(*args)
+
+    def flush(self):
+        """Runs the host work kept so far, once the last point of a sweep round has been read"""
+        for function, args in self.pending:
+            function(*args)
+
+        self.pending = []
+
+    def begin(self):
+        """Marks the first command of a point"""
+        self.start = SessionPool.now()
+        self.hidden = 0.0
+
+    def overlap(self, integration_time):
+        """Runs the host work kept while the DMM integrates
+
+        Args:
+            integration_time: Float containing the expected integration time of the point in seconds.
+
+        Returns:
+            Returns the time in seconds left of the expected integration time.
+        """
+        start = SessionPool.now()
+        self.integration = integration_time
+        self.flush()
+        self.hidden += SessionPool.now() - start
+        return max(self.integration - self.hidden, 0)
+
+    def end(self, point):
+        """Records the timing trace of a point once its reading is known"""
+        elapsed = SessionPool.now() - self.start
+        overlap = min(self.hidden / self.integration, 1) if self.integration else 0
+        self.traceList.append([point, elapsed, self.integration, self.hidden, overlap])
+
+    def close(self):
+        """Runs the host work left"""
+        self.flush()
+
+    def getGain(self):
+        """Returns the time of the sweep, the time it takes with the hidden work added, and the gain
+
+        Returns:
+            Returns the time in seconds of the points traced, the time in seconds they take when the
+            host work hidden behind the integration is done after it, and the fraction of that time saved.
+        """
+        elapsed = sum(x[1] for x in self.traceList)
+        serial = elapsed + sum(x[3] for x in self.traceList)
+        return elapsed, serial, 1 - elapsed / serial if serial else 0.0
+
+    def report(self):
+        """Returns a summary of the timing trace of every point"""
+        if not self.traceList:
+            return "Pipeline: no points traced"
+
+        elapsed, serial, gain = self.getGain()
+        overlap = sum(x[4] for x in self.traceList) / len(self.traceList)
+        return (
+            f"Pipeline ({'ON' if self.enabled else 'OFF'}): {len(self.traceList)} points in "
+            f"{elapsed:.3f} s against {serial:.3f} s without overlap ({gain:.1%} saved), "
+            f"{overlap:.0%} of the integration time overlapped on average"
+        )
+
+
+class RetryPolicy:
+    """Class to retry the reading of a sweep point in place when a VISA transaction fails
+
+    Without a retry, a single VisaIOError (e.g. a timeout on FETC?) ends the whole DUT Test. The
+    reading of a point is instead repeated in a loop of the form
+
+        while DMM_Retry.attempt(point):
+            try:
+                ...
+                DMM_Retry.done()
+
+            except pyvisa.VisaIOError as e:
+                DMM_Retry.error(e)
+
+    Errors are sorted into the classes TIMEOUT, IO (I/O errors and lost connections) and VISA (any
+    other VisaIOError). Every class is retried up to its limit, waiting its back-off before the first
+    retry and doubling it on every further retry. The limits and back-offs are set by the keys
+    Retries and RetryBackoff, and for every class by TimeoutRetries, TimeoutBackoff, IORetries,
+    IOBackoff, VISARetries and VISABackoff. Retries default to 0, which keeps the DUT Test ending on
+    the first error. Unless the key RetryRearm is set to "OFF", the DMM is re-armed before a retry
+    with a Device Clear, which aborts the measurement in progress and empties its output queue, and
+    *CLS. A point which still fails is kept in the results without a reading (see SweepBuffer), listed
+    with its last error by report(), and the sweep carries on. Readings buffered in the DMM (key Acquisition set to "BUFFERED") are not retried.
+
+    Attributes:
+        DMM: String containing the VISA Address of the DMM used.
+        limits: Dictionary mapping the class of error to the number of retries.
+        backoffs: Dictionary mapping the class of error to the first back-off in seconds.
+        rearm: Boolean determining whether the DMM is re-armed before a retry.
+        retryList: List containing the point, the number of retries, the last error, the time lost
+            in seconds and whether the point was recovered, for every point retried.
+        retries: Integer containing the number of retries of the last point attempted.
+        failed: Boolean determining whether the last point attempted failed.
+
+    """
+
+    CLASSES = {
+        pyvisa.constants.StatusCode.error_timeout: "TIMEOUT",
+        pyvisa.constants.StatusCode.error_io: "IO",
+        pyvisa.constants.StatusCode.error_connection_lost: "IO",
+    }
+
+    def __init__(self, dict):
+        self.DMM = dict["DMM"]
+        retries = int(dict.get("Retries", 0))
+        backoff = float(dict.get("RetryBackoff", 0.1))
+        self.limits = {}
+        self.backoffs = {}
+        for name, prefix in (("TIMEOUT", "Timeout"), ("IO", "IO"), ("VISA", "VISA")):
+            self.limits[name] = int(dict.get(f"{prefix}Retries", retries))
+            self.backoffs[name] = float(dict.get(f"{prefix}Backoff", backoff))
+
+        self.rearm = str(dict.get("RetryRearm", "ON")).upper() != "OFF"
+        self.retryList = []
+        self.retries = 0
+        self.failed = False
+        self.point = None
+        self.state = None
+        self.start = 0.0
+
+    def getClass(self, e):
+        """Returns the class of a VisaIOError, "TIMEOUT", "IO" or "VISA" """
+        return self.CLASSES.get(getattr(e, "error_code", None), "VISA")
+
+    def attempt(self, point):
+        """Determines whether the reading of a point is attempted (again)
+
+        Args:
+            point: Any value identifying the sweep point, recorded when it is retried.
+
+        Returns:
+            Returns True when the reading has to be attempted, False once it succeeded or failed.
+        """
+        if self.state is None:
+            self.point = point
+            self.retries = 0
+            self.failed = False
+            self.lost = 0.0
+            self.last = None
+
+        if self.state in (None, "RETRY"):
+            self.state = "RUNNING"
+            self.start = SessionPool.now()
+            return True
+
+        if self.retries > 0:
+            self.retryList.append(
+                [self.point, self.retries, self.last, self.lost, self.state == "DONE"]
+            )
+
+        self.failed = self.state == "FAILED"
+        self.state = None
+        return False
+
+    def done(self):
+        """Marks the reading of the point as successful"""
+        self.state = "DONE"
+
+    def error(self, exception):
+        """Handles an error raised by the reading of the point, waiting and re-arming before a retry
+
+        The time lost is counted from the start of the failed attempt to the end of the re-arm.
+
+        Args:
+            exception: The VisaIOError raised.
+
+        Raises:
+            VisaIOError: Retries are disabled for the class of the error.
+        """
+        name = self.getClass(exception)
+        if self.limits[name] == 0:
+            self.state = None
+            raise exception
+
+        self.last = f"{name}: {exception}"
+        if self.retries >= self.limits[name]:
+            self.lost += SessionPool.now() - self.start
+            self.state = "FAILED"
+            return
+
+        SessionPool.sleep(self.backoffs[name] * 2**self.retries)
+        if self.rearm:
+            try:
+                instr = SessionPool.open(self.DMM)
+                getattr(instr, "instr", instr).clear()
+                CLS(self.DMM)
+
+            except pyvisa.VisaIOError as e:
+                print(e.args)
+
+        self.retries += 1
+        self.lost += SessionPool.now() - self.start
+        self.state = "RETRY"
+
+    def report(self):
+        """Returns a summary of the points retried, the time lost to the retries and the points failed"""
+        failed = [x for x in self.retryList if not x[4]]
+        retries = sum(x[1] for x in self.retryList)
+        lost = sum(x[3] for x in self.retryList)
+        summary = (
+            f"Retries: {retries} retries on {len(self.retryList)} points, "
+            f"{len(self.retryList) - len(failed)} recovered, {len(failed)} failed, "
+            f"{lost:.3f} s lost"
+        )
+        for point, retries, last, lost, recovered in failed:
+            summary += f"\n  Point {point} failed after {retries} retries ({last})"
+
+        return summary
+
+
+class SweepRunner:
+    """Class to run the Programm / Readback Accuracy sweep of a Voltage or Current Measurement
+
+    The PSU is swept over the inner setpoints (voltage for a Voltage Measurement, current for a
+    Current Measurement) at every outer setpoint of the ELoad, and the DMM measures every point. The
+    limit of the PSU is set 1 above the largest setpoint of the other quantity, and the ELoad
+    setpoint is derated by 0.1% so that the ELoad does not take the DUT out of the mode measured.
+
+    The four accuracy tests only differ by the quantity measured and by how the DMM is waited for,
+    through its Status Byte (synchronization "STATUS", see Completion) or through *OPC? of the DMM
+    (synchronization "OPC"). Everything else, the checkpoint, the stream, the settling, the retries, the ranges, the
+    repeated or buffered acquisition and the pipeline, is set by the keys of dict and run here.
+
+    Attributes:
+        Function: String containing the quantity measured, "Voltage" or "Current".
+        Load: String containing the function of the ELoad setpoint, the other quantity.
+        test: String containing the name of the DUT Test, which names its checkpoint log.
+        synchronization: String determining how the DMM is waited for, "STATUS" or "OPC".
+        Results: SweepBuffer containing the results of the sweep once it has run.
+
+    """
+
+    def __init__(self, dict, Function, test, synchronization="STATUS"):
+        self.Apply = Dimport.getClass(dict["Instrument"], "Apply")
+        self.Display = Dimport.getClass(dict["Instrument"], "Display")
+        self.Mode = Dimport.getClass(dict["Instrument"], "Function")
+        self.Output = Dimport.getClass(dict["Instrument"], "Output")
+        self.Sense = Dimport.getClass(dict["Instrument"], "Sense")
+        self.Configure = Dimport.getClass(dict["Instrument"], "Configure")
+        self.Trigger = Dimport.getClass(dict["Instrument"], "Trigger")
+        self.Initiate = Dimport.getClass(dict["Instrument"], "Initiate")
+        self.Voltage = Dimport.getClass(dict["Instrument"], "Voltage")
+        self.Measurement = Dimport.getClass(dict["Instrument"], Function)
+
+        self.dict = dict
+        self.Function = Function
+        self.Load = "Current" if Function == "Voltage" else "Voltage"
+        self.Setpoint = Dimport.getClass(dict["Instrument"], self.Load)
+        self.test = test
+        self.synchronization = str(synchronization).upper()
+        self.DMM_Sync = None
+        self.Results = None
+
+    def configure(self):
+        """Initializes the DMM, the ELoad and the PSU for the quantity measured"""
+        dict = self.dict
+        with Batch.getBatch(dict, dict["DMM"], dict["ELoad"], dict["PSU"]) as Setup:
+            self.Configure(dict["DMM"]).write(self.Function)
+            self.Trigger(dict["DMM"]).setSource("BUS")
+            if self.Function == "Voltage":
+                self.Sense(dict["DMM"]).setVoltageResDC(dict["VoltageRes"])
+
+            else:
+                self.Sense(dict["DMM"]).setCurrentResDC(dict["CurrentRes"])
+
+            self.Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
+            self.Mode(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
+            self.Voltage(dict["PSU"]).setSenseMode(
+                dict[f"{self.Function}Sense"], dict["PSU_Channel"]
+            )
+
+            self.Measurement(dict["DMM"]).setNPLC(dict["Aperture"])
+            self.Measurement(dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
+            if self.Function == "Voltage":
+                self.Measurement(dict["DMM"]).setAutoImpedanceMode(dict["InputZ"])
+
+            else:
+                self.Measurement(dict["DMM"]).setTerminal(dict["Terminal"])
+
+            if dict["Range"] == "Auto" and self.Function == "Voltage":
+                self.Sense(dict["DMM"]).setVoltageRangeDCAuto()
+
+            elif dict["Range"] == "Auto":
+                self.Sense(dict["DMM"]).setCurrentRangeDCAuto()
+
+            elif self.Function == "Voltage":
+                self.Sense(dict["DMM"]).setVoltageRangeDC(dict["Range"])
+
+            else:
+                self.Sense(dict["DMM"]).setCurrentRangeDC(dict["Range"])
+
+        print(Setup.report())
+
+        if self.synchronization == "STATUS":
+            self.DMM_Sync, integration_time = Completion.getWait(dict)
+
+    @staticmethod
+    def getProfile(dict, Function):
+        """Returns the setpoints of the sweep of a quantity, "Voltage" or "Current" """
+        minimum = dict[f"min{Function}"]
+        maximum = dict[f"max{Function}"]
+        step_size = dict[f"{Function.lower()}_step_size"]
+        iterations = ((float(maximum) - float(minimum)) / float(step_size)) + 1
+        return ListSweep.getProfile(minimum, step_size, iterations)
+
+    def getSetpoint(self, outer, inner):
+        """Returns the voltage and current of a point from its outer and inner setpoints"""
+        if self.Function == "Voltage":
+            return [inner, outer]
+
+        return [outer, inner]
+
+    def setLoad(self, level):
+        """Programs the ELoad setpoint of an outer step"""
+        if self.Load == "Current":
+            self.Setpoint(self.dict["ELoad"]).setOutputCurrent(
+                level, self.dict["ELoad_Channel"]
+            )
+
+        else:
+            self.Setpoint(self.dict["ELoad"]).setOutputVoltage(
+                level, self.dict["ELoad_Channel"]
+            )
+
+    def run(self):
+        """Runs the sweep until every point is measured, refining it when SweepOrder requests so
+
+        Returns:
+            Returns the SweepBuffer containing the results of the sweep.
+
+        Raises:
+            VisaIOError: An error occured that is not retried by the RetryPolicy.
+        """
+        dict = self.dict
+        self.configure()
+
+        # The limit of the PSU is 1 above the largest setpoint of the other quantity
+        limit = float(dict[f"max{self.Load}"]) + 1
+        Sweep = SweepPlanner(
+            dict, self.getProfile(dict, self.Load), self.getProfile(dict, self.Function)
+        )
+        Log = Checkpoint(dict, self.test)
+        readings = Log.load()
+        points = Sweep.plan(readings)
+        Stream = MeasurementStream(dict, Sweep, self.Function)
+        Results = SweepBuffer(dict, Sweep, self.Function)
+        Stream.resume(readings)
+        print(Sweep.report(points))
+
+        # The buffered DMM is triggered by BufferedAcquisition, so the ELoad does not trigger it
+        buffered = str(dict.get("Acquisition", "")).upper() == "BUFFERED"
+        ELoad_List = None
+        if str(dict.get("ELoadSweep", "")).upper() == "LIST":
+            trigger = "BUS" if buffered else dict.get("ListTrigger", "BUS")
+            ELoad_List = ListSweep(dict, self.Load, [], trigger)
+            ELoad_List.plan(points)
+            ELoad_List.download()
+
+        DUT_Settle = Settling(dict, self.Function)
+        DMM_Retry = RetryPolicy(dict)
+        DMM_Range = RangeOptimizer(dict, self.Function)
+        DMM_Range.plan([x[3] for x in Sweep.points])
+        DMM_Repeat = RepeatAcquisition(dict)
+        # The statistics of the repeated points resumed from the log
+        DMM_Repeat.statistics.update(Log.statistics)
+
+        DMM_Buffer = None
+        if buffered:
+            DMM_Range.apply()
+            DMM_Buffer = BufferedAcquisition(DMM_Range.getSettings(dict))
+            DMM_Buffer.arm(len(points))
+
+        Pipe = Pipeline(dict)
+        self.Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
+        self.Output(dict["PSU"]).setOutputState("ON")
+
+        while points:
+            ELoad_Setpoint = None
+            for k, i, outer, inner in points:
+                Pipe.begin()
+                if outer != ELoad_Setpoint:
+                    if ELoad_List:
+                        if not ELoad_List.routed:
+                            ELoad_List.step()
+
+                    else:
+                        self.setLoad(outer - 0.001 * outer)
+
+                    ELoad_Setpoint = outer
+
+                V, I = self.getSetpoint(outer, inner)
+                if self.Function == "Voltage":
+                    self.Apply(dict["PSU"]).write(dict["PSU_Channel"], V, limit)
+
+                else:
+                    self.Apply(dict["PSU"]).write(dict["PSU_Channel"], limit, I)
+
+                print("Voltage: ", V, "Current: ", I)
+                WAI(dict["PSU"])
+                Results.mark(k, DUT_Settle.up([V, I]))
+                if DMM_Buffer:
+                    DMM_Buffer.trigger(k)
+                    Log.update(DMM_Buffer.readings)
+                    Stream.update(DMM_Buffer.readings)
+
+                else:
+                    integration_time = DMM_Range.apply(inner) * DMM_Repeat.count
+                    while DMM_Retry.attempt([V, I]):
+                        try:
+                            DMM_Repeat.arm()
+                            if ELoad_List:
+                                ELoad_List.arm(k)
+
+                            self.Initiate(dict["DMM"]).initiate()
+                            if ELoad_List:
+                                ELoad_List.trigger(k)
+
+                            else:
+                                TRG(dict["DMM"])
+
+                            remaining = Pipe.overlap(integration_time)
+                            if self.DMM_Sync:
+                                self.DMM_Sync.wait(remaining)
+
+                            else:
+                                SessionPool.sleep(remaining)
+                                OPC(dict["DMM"]).query()
+
+                            readings[k] = DMM_Repeat.fetch(k)
+                            Pipe.defer(
+                                Log.record, k, readings[k], DMM_Repeat.statistics.get(k)
+                            )
+                            Pipe.defer(Stream.record, readings, k)
+                            DMM_Retry.done()
+
+                        except pyvisa.VisaIOError as e:
+                            DMM_Retry.error(e)
+
+                    Results.retry(k, DMM_Retry.retries, DMM_Retry.failed)
+
+                DUT_Settle.down()
+                Pipe.end([V, I])
+
+            Pipe.flush()
+            if DMM_Buffer:
+                readings.update(DMM_Buffer.fetch())
+                Log.update(DMM_Buffer.readings)
+                Stream.update(DMM_Buffer.readings)
+
+            points = Sweep.refine(readings)
+            if points and ELoad_List:
+                ELoad_List.plan(points)
+                ELoad_List.download()
+
+            if points and DMM_Buffer:
+                DMM_Buffer.arm(len(points))
+
+        self.Output(dict["PSU"]).setOutputState("OFF")
+        self.Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
+        if ELoad_List:
+            ELoad_List.close()
+
+        Pipe.close()
+        DMM_Repeat.close()
+
+        if DMM_Buffer:
+            DMM_Buffer.close()
+            print(DMM_Buffer.report())
+
+        # The results of the points measured are written back in the canonical order of the sweep
+        print(Sweep.reportSampling())
+        Results.update(readings, DMM_Repeat.statistics)
+        Stream.close()
+        Log.close()
+
+        self.Stream, self.Log, self.Pipe = Stream, Log, Pipe
+        self.DUT_Settle, self.DMM_Range = DUT_Settle, DMM_Range
+        self.DMM_Repeat, self.DMM_Retry = DMM_Repeat, DMM_Retry
+        self.Results = Results
+        return Results
+
+    def store(self, test):
+        """Stores the results of the sweep and the lists of its helpers on the DUT Test"""
+        test.infoList, test.dataList = self.Results.getLists()
+        test.statsList = self.Results.getStatistics()
+        test.failList = self.Results.getFailures()
+        test.results = self.Results
+        test.settleList = self.DUT_Settle.settleList
+        test.rangeList = self.DMM_Range.rangeList
+        test.retryList = self.DMM_Retry.retryList
+        test.traceList = self.Pipe.traceList
+
+    def report(self):
+        """Returns the reports of the checkpoint, the stream and every helper of the sweep"""
+        reports = [
+            self.Stream.report(),
+            self.Log.report(),
+            self.DUT_Settle.report(),
+            self.DMM_Range.report(),
+            self.DMM_Repeat.report(),
+            self.DMM_Retry.report(),
+        ]
+        if self.DMM_Sync:
+            reports.append(self.DMM_Sync.report())
+
+        reports.append(self.Pipe.report())
+        return "\n".join(reports)
+
 
 class VisaResourceManager:
     """Manage the VISA Resources
 
+    The VISA Resources are opened through the SessionPool so that every Subsystem used during
+    the DUT Test shares the same session of an Instrument instead of opening it again.
+
     Attributes:
         args: args should contain one or multiple string containing the Visa Address of an dict["Instrument"]
 
@@ -83,13 +2428,14 @@ class VisaResourceManager:
 
     def __init__(self):
         """Initiate the object rm as Resource Manager"""
-        rm = pyvisa.ResourceManager()
+        rm = SessionPool.resourceManager()
         self.rm = rm
 
     def openRM(self, *args):
         """Open the VISA Resources to be used
 
         The program also initiates and standardize certain specifications such as the baud rate.
+        The statistics of the SessionPool are reset so that the opens saved are reported per DUT Test.
 
             Args:
                 *args: to declare single or multiple VISA Resources
@@ -101,9 +2447,10 @@ class VisaResourceManager:
                 VisaIOError: An error occured when opening PyVisa Resources
 
         """
+        SessionPool.resetStatistics()
         try:
             for i in range(len(args)):
-                instr = self.rm.open_resource(args[i])
+                instr = SessionPool.open(args[i])
                 instr.baud_rate = 9600
                 # print(instr.query("*IDN?"))
 
@@ -113,8 +2460,19 @@ class VisaResourceManager:
             return 0, e.args
 
     def closeRM(self):
-        """Closes the Visa Resources when not in used"""
-        self.rm.close()
+        """Releases the Visa Resources at the end of a DUT Test
+
+        The sessions are left open in the SessionPool, along with the state shadowed for every Instrument,
+        so that the next DUT Test does not send the settings the Instruments already hold. They are closed
+        when the program exits.
+
+        Returns:
+            Returns a dictionary containing the number of opens saved by the SessionPool for each VISA Address.
+        """
+        saved = SessionPool.savedOpens()
+        print(SessionPool.report())
+        InstrumentExecutor.shutdown()
+        return saved
 
 
 class VoltageMeasurement:
@@ -130,13 +2488,12 @@ class VoltageMeasurement:
         are initialized. The test loop begins where Voltage and Current Sweep is conducted and collect
         measured data.
 
-        The synchronization of Instruments here is done by reading the status of the event registry.
-        The status determined from the Instrument can let the program determine if the Instrument is
-        measuring. The program will only proceed to tell the Instrument to query the measured value
-        after it is determined that the measurement has been completed. This method is suitable for
-        operations that require a longer time (e.g. 100 NPLC). However the implementation is slighty
-        more complicated than other methods. This method only can be implemented that have the specific
-        commands that are used.
+        The synchronization of Instruments here is done through the Status Byte of the DMM. The DMM is armed
+        once so that the Operation Complete bit requests service, and after the DMM is triggered the
+        program either waits for the Service Request or serial polls the Status Byte with a growing
+        interval, instead of querying STAT:OPER:COND? as fast as the bus allows. This method is suitable
+        for operations that require a longer time (e.g. 100 NPLC). The time taken and the number of polls
+        made by every wait are printed when the test is completed.
 
         In line 260, where I_fixed - 0.001 * I_fixed is done to prevent the ELoad from causing the DUT
         to enter CC Mode.
@@ -177,105 +2534,13 @@ class VoltageMeasurement:
         Raises:
             VisaIOError: An error occured when opening PyVisa Resources.
         """
-        # Dynamic Library Import
-        (
-            Read,
-            Apply,
-            Display,
-            Function,
-            Output,
-            Sense,
-            Configure,
-            Delay,
-            Trigger,
-            Sample,
-            Initiate,
-            Fetch,
-            Status,
-            Voltage,
-            Current,
-            Oscilloscope,
-        ) = Dimport.getClasses(dict["Instrument"])
-
-        # Instrument Initialization
-        Configure(dict["DMM"]).write("Voltage")
-        Trigger(dict["DMM"]).setSource("BUS")
-        Sense(dict["DMM"]).setVoltageResDC(dict["VoltageRes"])
-        Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
-        Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
-        Voltage(dict["PSU"]).setSenseMode(dict["VoltageSense"], dict["PSU_Channel"])
-        Voltage(dict["DMM"]).setNPLC(dict["Aperture"])
-        Voltage(dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
-        Voltage(dict["DMM"]).setAutoImpedanceMode(dict["InputZ"])
-
-        if dict["Range"] == "Auto":
-            Sense(dict["DMM"]).setVoltageRangeDCAuto()
-
-        else:
-            Sense(dict["DMM"]).setVoltageRangeDC(dict["Range"])
-
+        Sweep = SweepRunner(dict, "Voltage", "executeVoltageMeasurementA", "STATUS")
         self.param1 = dict["Error_Gain"]
         self.param2 = dict["Error_Offset"]
 
-        # Test Loop Begins
-        i = 0
-        j = 0
-        k = 0
-        I_fixed = float(dict["minCurrent"])
-        V = float(dict["minVoltage"])
-        I = float(dict["maxVoltage"]) + 1
-        current_iter = (
-            (float(dict["maxCurrent"]) - float(dict["minCurrent"]))
-            / float(dict["current_step_size"])
-        ) + 1
-        voltage_iter = (
-            (float(dict["maxVoltage"]) - float(dict["minVoltage"]))
-            / float(dict["voltage_step_size"])
-        ) + 1
-        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
-        Output(dict["PSU"]).setOutputState("ON")
-
-        while i < current_iter:
-            Current(dict["ELoad"]).setOutputCurrent(
-                I_fixed - 0.001 * I_fixed, dict["ELoad_Channel"]
-            )
-            j = 0
-            V = float(dict["minVoltage"])
-            while j < voltage_iter:
-                Apply(dict["PSU"]).write(dict["PSU_Channel"], V, I)
-                print("Voltage: ", V, "Current: ", I_fixed)
-                self.infoList.insert(k, [V, I_fixed, i])
-                WAI(dict["PSU"])
-                Delay(dict["PSU"]).write(dict["UpTime"])
-                Initiate(dict["DMM"]).initiate()
-                status = float(Status(dict["DMM"]).operationCondition())
-                TRG(dict["DMM"])
-
-                while 1:
-                    status = float(Status(dict["DMM"]).operationCondition())
-
-                    if status == 8704.0:
-                        self.dataList.insert(
-                            k, [float(Fetch(dict["DMM"]).query()), I_fixed]
-                        )
-                        break
-
-                    elif status == 512.0:
-                        self.dataList.insert(
-                            k, [float(Fetch(dict["DMM"]).query()), I_fixed]
-                        )
-                        break
-
-                Delay(dict["PSU"]).write(dict["DownTime"])
-                V += float(dict["voltage_step_size"])
-                j += 1
-                k += 1
-
-            I_fixed += float(dict["current_step_size"])
-            i += 1
-
-        Output(dict["PSU"]).setOutputState("OFF")
-        Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
+        Sweep.run()
+        print(Sweep.report())
+        Sweep.store(self)
         return self.infoList, self.dataList
 
     def executeVoltageMeasurementB(
@@ -334,98 +2599,13 @@ class VoltageMeasurement:
         Raises:
             VisaIOError: An error occured when opening PyVisa Resources.
         """
-        # Dynamic Library Import
-        (
-            Read,
-            Apply,
-            Display,
-            Function,
-            Output,
-            Sense,
-            Configure,
-            Delay,
-            Trigger,
-            Sample,
-            Initiate,
-            Fetch,
-            Status,
-            Voltage,
-            Current,
-            Oscilloscope,
-        ) = Dimport.getClasses(dict["Instrument"])
-
-        # Instrument Initialization
-        Configure(dict["DMM"]).write("Voltage")
-        Trigger(dict["DMM"]).setSource("BUS")
-        Sense(dict["DMM"]).setVoltageResDC(dict["VoltageRes"])
-        Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
-        Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
-        Voltage(dict["PSU"]).setSenseMode(dict["VoltageSense"], dict["PSU_Channel"])
-
-        Voltage(dict["DMM"]).setNPLC(dict["Aperture"])
-        Voltage(dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
-        Voltage(dict["DMM"]).setAutoImpedanceMode(dict["InputZ"])
-
-        if dict["Range"] == "Auto":
-            Sense(dict["DMM"]).setVoltageRangeDCAuto()
-
-        else:
-            Sense(dict["DMM"]).setVoltageRangeDC(dict["Range"])
-
+        Sweep = SweepRunner(dict, "Voltage", "executeVoltageMeasurementB", "OPC")
         self.param1 = dict["Error_Gain"]
         self.param2 = dict["Error_Offset"]
 
-        # Test Loop
-        i = 0
-        j = 0
-        k = 0
-        I_fixed = float(dict["minCurrent"])
-        V = float(dict["minVoltage"])
-        I = float(dict["maxCurrent"]) + 1
-        current_iter = (
-            (float(dict["maxCurrent"]) - float(dict["minCurrent"]))
-            / float(dict["current_step_size"])
-        ) + 1
-        voltage_iter = (
-            (float(dict["maxVoltage"]) - float(dict["minVoltage"]))
-            / float(dict["voltage_step_size"])
-        ) + 1
-        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
-        Output(dict["PSU"]).setOutputState("ON")
-
-        while i < current_iter:
-            Current(dict["ELoad"]).setOutputCurrent(
-                I_fixed - 0.001 * I_fixed, dict["ELoad_Channel"]
-            )
-            j = 0
-            V = float(dict["minVoltage"])
-            while j < voltage_iter:
-                Apply(dict["PSU"]).write(dict["PSU_Channel"], V, I)
-                print("Voltage: ", V, "Current: ", I_fixed)
-                self.infoList.insert(k, [V, I_fixed, i])
-                WAI(dict["PSU"])
-                Delay(dict["PSU"]).write(dict["UpTime"])
-                Initiate(dict["DMM"]).initiate()
-                TRG(dict["DMM"])
-
-                temp_string = float(OPC(dict["PSU"]).query())
-
-                if temp_string == 1:
-                    self.dataList.insert(
-                        k, [float(Fetch(dict["DMM"]).query()), I_fixed]
-                    )
-                    del temp_string
-
-                Delay(self.PSU).write(dict["DownTime"])
-                V += float(dict["voltage_step_size"])
-                j += 1
-                k += 1
-
-            I_fixed += float(dict["current_step_size"])
-            i += 1
-
-        Output(dict["PSU"]).setOutputState("OFF")
-        Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
+        Sweep.run()
+        print(Sweep.report())
+        Sweep.store(self)
         return self.infoList, self.dataList
 
 
@@ -441,13 +2621,12 @@ class CurrentMeasurement:
         are initialized. The test loop begins where Voltage and Current Sweep is conducted and collect
         measured data.
 
-        The synchronization of Instrument here is done by reading the status of the event registry.
-        The status determined from the Instrument can let the program determine if the Instrument is
-        measuring. The program will only proceed to tell the Instrument to query the measured value
-        after it is determined that the measurement has been completed. This method is suitable for
-        operations that require a longer time (e.g. 100 NPLC). However the implementation is slighty
-        more complicated than other methods. This method only can be implemented that have the specific
-        commands that are used.
+        The synchronization of Instrument here is done through the Status Byte of the DMM. The DMM is armed
+        once so that the Operation Complete bit requests service, and after the DMM is triggered the
+        program either waits for the Service Request or serial polls the Status Byte with a growing
+        interval, instead of querying STAT:OPER:COND? as fast as the bus allows. This method is suitable
+        for operations that require a longer time (e.g. 100 NPLC). The time taken and the number of polls
+        made by every wait are printed when the test is completed.
 
         In line 605, where V_fixed - 0.001 * V_fixed is done to prevent the ELoad from causing the DUT
         to enter CV Mode.
@@ -488,103 +2667,14 @@ class CurrentMeasurement:
         Raises:
             VisaIOError: An error occured when opening PyVisa Resources.
         """
-        dataList = []
-        infoList = []
-        # Dynamic Library Import
-        (
-            Read,
-            Apply,
-            Display,
-            Function,
-            Output,
-            Sense,
-            Configure,
-            Delay,
-            Trigger,
-            Sample,
-            Initiate,
-            Fetch,
-            Status,
-            Voltage,
-            Current,
-            Oscilloscope,
-        ) = Dimport.getClasses(dict["Instrument"])
-
-        # Instrument Initialization
-        Configure(dict["DMM"]).write("Current")
-        Trigger(dict["DMM"]).setSource("BUS")
-        Sense(dict["DMM"]).setCurrentResDC(dict["CurrentRes"])
-        Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
-        Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
-        Voltage(dict["PSU"]).setSenseMode(dict["CurrentSense"], dict["PSU_Channel"])
-
-        Current(dict["DMM"]).setNPLC(dict["Aperture"])
-        Current(dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
-        Current(dict["DMM"]).setTerminal(dict["Terminal"])
-
-        if dict["Range"] == "Auto":
-            Sense(dict["DMM"]).setCurrentRangeDCAuto()
-        else:
-            Sense(dict["DMM"]).setCurrentRangeDC(dict["Range"])
-        self.param1 = dict["Error_Gain"]
-        self.param2 = dict["Error_Offset"]
-
-        # Test Loop
-        i = 0
-        j = 0
-        k = 0
-        V_fixed = float(dict["minVoltage"])
-        V = float(dict["maxVoltage"]) + 1
-        I = float(dict["minCurrent"])
-        current_iter = (
-            (float(dict["maxCurrent"]) - float(dict["minCurrent"]))
-            / float(dict["current_step_size"])
-        ) + 1
-        voltage_iter = (
-            (float(dict["maxVoltage"]) - float(dict["minVoltage"]))
-            / float(dict["voltage_step_size"])
-        ) + 1
-        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
-        Output(dict["PSU"]).setOutputState("ON")
-
-        while i < voltage_iter:
-            Voltage(dict["ELoad"]).setOutputVoltage(
-                V_fixed - 0.001 * V_fixed, dict["ELoad_Channel"]
-            )
-            j = 0
-            I = float(dict["minCurrent"])
-            while j < current_iter:
-                Apply(dict["PSU"]).write(dict["PSU_Channel"], V, I)
-                print("Voltage: ", V_fixed, "Current: ", I)
-                infoList.insert(k, [V_fixed, I, i])
-
-                WAI(dict["PSU"])
-                Delay(dict["PSU"]).write(dict["UpTime"])
-                Initiate(dict["DMM"]).initiate()
-                status = float(Status(dict["DMM"]).operationCondition())
-                TRG(dict["DMM"])
-
-                while 1:
-                    status = float(Status(dict["DMM"]).operationCondition())
-
-                    if status == 8704.0:
-                        dataList.insert(k, [V_fixed, float(Fetch(dict["DMM"]).query())])
-                        break
-
-                    elif status == 512.0:
-                        dataList.insert(k, [V_fixed, float(Fetch(dict["DMM"]).query())])
-                        break
-
-                Delay(dict["PSU"]).write(dict["DownTime"])
-                I += float(dict["current_step_size"])
-                j += 1
-                k += 1
+        Sweep = SweepRunner(dict, "Current", "executeCurrentMeasurementA", "STATUS")
+        self.param1 = dict["Error_Gain"]
+        self.param2 = dict["Error_Offset"]
 
-            V_fixed += float(dict["voltage_step_size"])
-            i += 1
-        Output(dict["PSU"]).setOutputState("OFF")
-        Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
-        return dataList, infoList
+        Sweep.run()
+        print(Sweep.report())
+        Sweep.store(self)
+        return self.dataList, self.infoList
 
     def executeCurrentMeasurementB(self, dict):
         """Execution of Current Measurement for Programm / Readback Accuracy using WAI and OPC to synchronize Instrument
@@ -639,94 +2729,14 @@ class CurrentMeasurement:
         Raises:
             VisaIOError: An error occured when opening PyVisa Resources.
         """
-        dataList = []
-        infoList = []
-        # Dynamic Library Import
-        (
-            Read,
-            Apply,
-            Display,
-            Function,
-            Output,
-            Sense,
-            Configure,
-            Delay,
-            Trigger,
-            Sample,
-            Initiate,
-            Fetch,
-            Status,
-            Voltage,
-            Current,
-        ) = Dimport.getClasses(dict["Instrument"])
-
-        Configure(self.dict["DMM"]).write("Current")
-        Trigger(self.dict["DMM"]).setSource("BUS")
-        Sense(dict["DMM"]).setCurrentResDC(dict["CurrentRes"])
-        Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
-        Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
-        Voltage(dict["PSU"]).setSenseMode(dict["CurrentSense"], dict["PSU_Channel"])
-
-        Current(self.dict["DMM"]).setNPLC(dict["Aperture"])
-        Current(self.dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
-        Current(self.dict["DMM"]).setTerminal(dict["Terminal"])
-
-        if dict["Range"] == "Auto":
-            Sense(self.dict["DMM"]).setCurrentRangeDCAuto()
-        else:
-            Sense(self.dict["DMM"]).setCurrentRangeDC(dict["Range"])
+        Sweep = SweepRunner(dict, "Current", "executeCurrentMeasurementB", "OPC")
         self.param1 = dict["Error_Gain"]
         self.param2 = dict["Error_Offset"]
-        # Test Loop
-        i = 0
-        j = 0
-        k = 0
-        V_fixed = float(dict["minVoltage"])
-        V = float(dict["maxVoltage"]) + 1
-        I = float(dict["minCurrent"])
-        current_iter = (
-            (float(dict["maxCurrent"]) - float(dict["minCurrent"]))
-            / float(dict["current_step_size"])
-        ) + 1
-        voltage_iter = (
-            (float(dict["maxVoltage"]) - float(dict["minVoltage"]))
-            / float(dict["voltage_stepsize"])
-        ) + 1
-        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
-        Output(dict["PSU"]).setOutputState("ON")
-
-        while i < voltage_iter:
-            Voltage(dict["ELoad"]).setOutputVoltage(
-                V_fixed - 0.001 * V_fixed, dict["ELoad_Channel"]
-            )
-            j = 0
-            I = float(dict["minCurrent"])
-            while j < current_iter:
-                Apply(dict["PSU"]).write(dict["PSU_Channel"], V, I)
-                print("Voltage: ", V_fixed, "Current: ", I)
-                infoList.insert(k, [V_fixed, I, i])
 
-                WAI(dict["PSU"])
-                Delay(dict["PSU"]).write(dict["UpTime"])
-                Initiate(dict["DMM"]).initiate()
-                TRG(dict["DMM"])
-
-                temp_string = float(OPC(dict["PSU"]).query())
-
-                if temp_string == 1:
-                    dataList.insert(k, [V_fixed, float(Fetch(dict["DMM"]).query())])
-                    del temp_string
-
-                Delay(dict["PSU"]).write(dict["DownTime"])
-                I += float(dict["current_step_size"])
-                j += 1
-                k += 1
-
-            V_fixed += float(dict["voltage_stepsize"])
-            i += 1
-        Output(dict["PSU"]).setOutputState("OFF")
-        Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
-        return dataList, infoList
+        Sweep.run()
+        print(Sweep.report())
+        Sweep.store(self)
+        return self.dataList, self.infoList
 
 
 class LoadRegulation:
@@ -801,20 +2811,23 @@ class LoadRegulation:
         ) = Dimport.getClasses(dict["Instrument"])
 
         # Instrument Initializations
-        Configure(dict["DMM"]).write("Voltage")
-        Trigger(dict["DMM"]).setSource("BUS")
-        Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
-        Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
-        Voltage(dict["PSU"]).setSenseMode(dict["CurrentSense"], dict["PSU_Channel"])
-        Voltage(dict["DMM"]).setNPLC(dict["Aperture"])
-        Voltage(dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
-        Voltage(dict["DMM"]).setAutoImpedanceMode(dict["InputZ"])
+        with Batch.getBatch(dict, dict["DMM"], dict["ELoad"], dict["PSU"]) as Setup:
+            Configure(dict["DMM"]).write("Voltage")
+            Trigger(dict["DMM"]).setSource("BUS")
+            Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
+            Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
+            Voltage(dict["PSU"]).setSenseMode(dict["CurrentSense"], dict["PSU_Channel"])
+            Voltage(dict["DMM"]).setNPLC(dict["Aperture"])
+            Voltage(dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
+            Voltage(dict["DMM"]).setAutoImpedanceMode(dict["InputZ"])
 
-        if dict["Range"] == "Auto":
-            Sense(dict["DMM"]).setVoltageRangeDCAuto()
+            if dict["Range"] == "Auto":
+                Sense(dict["DMM"]).setVoltageRangeDCAuto()
 
-        else:
-            Sense(dict["DMM"]).setVoltageRangeDC(dict["Range"])
+            else:
+                Sense(dict["DMM"]).setVoltageRangeDC(dict["Range"])
+
+        print(Setup.report())
 
         self.V_Rating = float(dict["V_Rating"])
         self.I_Rating = float(dict["I_Rating"])
@@ -826,33 +2839,74 @@ class LoadRegulation:
         Apply(dict["PSU"]).write(dict["PSU_Channel"], self.V_Rating, self.I_Rating)
         Output(dict["PSU"]).setOutputState("ON")
 
-        # Reading for No Load Voltage
-
-        WAI(dict["PSU"])
-        Initiate(dict["DMM"]).initiate()
-        TRG(dict["DMM"])
-        Delay(dict["PSU"]).write(dict["UpTime"])
-        V_NL = float(Fetch(dict["DMM"]).query())
-        Delay(dict["PSU"]).write(dict["DownTime"])
-        Current(dict["ELoad"]).setOutputCurrent(I_Max, dict["ELoad_Channel"])
-        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
-        Initiate(dict["DMM"]).initiate()
-        TRG(dict["DMM"])
-        WAI(dict["ELoad"])
-        Delay(dict["PSU"]).write(dict["UpTime"])
-        temp_string = float(OPC(dict["ELoad"]).query())
-        if temp_string == 1:
-            V_FL = float(Fetch(dict["DMM"]).query())
-            del temp_string
+        DUT_Settle = Settling(dict, "Voltage")
+        DMM_Repeat = RepeatAcquisition(dict)
+        DUT_Log = DataLogger(dict, "Current")
+
+        # In List Mode the ELoad steps from no load (0 A) to full load (I_Max)
+        ELoad_List = None
+        if str(dict.get("ELoadSweep", "")).upper() == "LIST" and not DUT_Log.enabled:
+            ELoad_List = ListSweep(dict, "Current", [0, I_Max])
+            ELoad_List.download()
+            Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
+            ELoad_List.step()
+
+        if DUT_Log.enabled:
+            Current(dict["ELoad"]).setOutputCurrent(0, dict["ELoad_Channel"])
+            Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
+            WAI(dict["PSU"])
+            V_NL, V_FL = DUT_Log.capture(0, I_Max)
+            print(DUT_Log.report())
+            self.logList = DUT_Log.logList
+            self.stepList = DUT_Log.stepList
 
-        Delay(dict["PSU"]).write(dict["DownTime"])
+        else:
+            # Reading for No Load Voltage
+
+            WAI(dict["PSU"])
+            DUT_Settle.up("No Load")
+            DMM_Repeat.arm()
+            Initiate(dict["DMM"]).initiate()
+            TRG(dict["DMM"])
+            V_NL = DMM_Repeat.fetch("No Load")
+            DUT_Settle.down()
+            if ELoad_List:
+                ELoad_List.step()
+
+            else:
+                Current(dict["ELoad"]).setOutputCurrent(I_Max, dict["ELoad_Channel"])
+                Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
+
+            WAI(dict["ELoad"])
+            DUT_Settle.up("Full Load")
+            DMM_Repeat.arm()
+            Initiate(dict["DMM"]).initiate()
+            TRG(dict["DMM"])
+            temp_string = float(OPC(dict["DMM"]).query())
+            if temp_string == 1:
+                V_FL = DMM_Repeat.fetch("Full Load")
+                del temp_string
+
+            DUT_Settle.down()
+
+        DMM_Repeat.close()
+        print(DUT_Settle.report())
+        self.settleList = DUT_Settle.settleList
+        print(DMM_Repeat.report())
+        self.statsList = [[x, *y] for x, y in DMM_Repeat.statistics.items()]
         print("V_NL: ", V_NL, "V_FL: ", V_FL)
+        self.regulationList = [V_NL, V_FL]
         Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
+        if ELoad_List:
+            ELoad_List.close()
+
         Output(dict["PSU"]).setOutputState("OFF")
         Voltage_Regulation = ((V_NL - V_FL) / V_FL) * 100
         Desired_Voltage_Regulation = 30 * self.param1 + self.param2
         print("Desired Voltage Regulation (CV): (%)", Desired_Voltage_Regulation)
         print("Calculated Voltage Regulation (CV): (%)", round(Voltage_Regulation, 4))
+        if DMM_Repeat.enabled:
+            print("Confidence Interval: (%) +/-", round(DMM_Repeat.getRegulation(), 4))
 
     def executeCV_LoadRegulationB(self, dict):
         """Test for determining the Load Regulation of DUT under Constant Voltage (CV) Mode.
@@ -863,11 +2917,12 @@ class LoadRegulation:
         turned on to drive the DUT to full load, while measuring the V_FullLoad, Calculations
         are then done to check the load regulation under CV condition.
 
-        The synchronization of Instruments here is done by using IEEE Commands OPC and WAI. The command OPC
-        queries the Instrument the status of the commands. 1 will be returned if all commands given have
-        been executed. Hence, this makes as a simple and efficient way to synchronize the measurement timing
-        of the Instruments, since it is under the IEEE Standard Library, most Instruments are synchronized
-        using this way. However, this method only works for commands with a short execution time.
+        The synchronization of Instruments here is done through the Status Byte of the DMM. The DMM is armed
+        once so that the Operation Complete bit requests service, and after the DMM is triggered the
+        program either waits for the Service Request or serial polls the Status Byte with a growing
+        interval, instead of querying STAT:OPER:COND? as fast as the bus allows. This method is suitable
+        for operations that require a longer time (e.g. 100 NPLC). The time taken and the number of polls
+        made by every wait are printed when the test is completed.
 
         Args:
             Instrument: String determining which library to be used.
@@ -921,20 +2976,25 @@ class LoadRegulation:
         ) = Dimport.getClasses(dict["Instrument"])
 
         # Instruments Initialization
-        Configure(dict["DMM"]).write("Voltage")
-        Trigger(dict["DMM"]).setSource("BUS")
-        Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
-        Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
-        Voltage(dict["PSU"]).setSenseMode(dict["VoltageSense"], dict["PSU_Channel"])
-        Voltage(dict["DMM"]).setNPLC(dict["Aperture"])
-        Voltage(dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
-        Voltage(dict["DMM"]).setAutoImpedanceMode(dict["InputZ"])
+        with Batch.getBatch(dict, dict["DMM"], dict["ELoad"], dict["PSU"]) as Setup:
+            Configure(dict["DMM"]).write("Voltage")
+            Trigger(dict["DMM"]).setSource("BUS")
+            Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
+            Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
+            Voltage(dict["PSU"]).setSenseMode(dict["VoltageSense"], dict["PSU_Channel"])
+            Voltage(dict["DMM"]).setNPLC(dict["Aperture"])
+            Voltage(dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
+            Voltage(dict["DMM"]).setAutoImpedanceMode(dict["InputZ"])
 
-        if dict["Range"] == "Auto":
-            Sense(dict["DMM"]).setVoltageRangeDCAuto()
+            if dict["Range"] == "Auto":
+                Sense(dict["DMM"]).setVoltageRangeDCAuto()
 
-        else:
-            Sense(dict["DMM"]).setVoltageRangeDC(dict["Range"])
+            else:
+                Sense(dict["DMM"]).setVoltageRangeDC(dict["Range"])
+
+        print(Setup.report())
+
+        DMM_Sync, integration_time = Completion.getWait(dict)
 
         self.V_Rating = float(dict["V_Rating"])
         self.I_Rating = float(dict["I_Rating"])
@@ -946,45 +3006,67 @@ class LoadRegulation:
         Apply(dict["PSU"]).write(dict["PSU_Channel"], self.V_Rating, self.I_Rating)
         Output(dict["PSU"]).setOutputState("ON")
 
-        # Reading for No Load Voltage
-
-        WAI(dict["PSU"])
-        Initiate(dict["DMM"]).initiate()
-        status = float(Status(dict["DMM"]).operationCondition())
-        TRG(dict["DMM"])
-        while 1:
-            status = float(Status(dict["DMM"]).operationCondition())
-
-            if status == 8704.0:
-                V_NL = float(Fetch(dict["DMM"]).query())
-                break
-
-            elif status == 512.0:
-                V_NL = float(Fetch(dict["DMM"]).query())
-                break
-        Delay(dict["PSU"]).write(dict["DownTime"])
-        Current(dict["ELoad"]).setOutputCurrent(I_Max, dict["ELoad_Channel"])
-        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
-
-        WAI(dict["ELoad"])
-        Initiate(dict["DMM"]).initiate()
-        status = float(Status(dict["DMM"]).operationCondition())
-        TRG(dict["DMM"])
-        Delay(dict["PSU"]).write(dict["UpTime"])
-        while 1:
-            status = float(Status(dict["DMM"]).operationCondition())
-
-            if status == 8704.0:
-                V_FL = float(Fetch(dict["DMM"]).query())
-                break
-
-            elif status == 512.0:
-                V_FL = float(Fetch(dict["DMM"]).query())
-                break
+        DUT_Settle = Settling(dict, "Voltage")
+        DMM_Repeat = RepeatAcquisition(dict)
+        DUT_Log = DataLogger(dict, "Current")
+
+        # In List Mode the ELoad steps from no load (0 A) to full load (I_Max)
+        ELoad_List = None
+        if str(dict.get("ELoadSweep", "")).upper() == "LIST" and not DUT_Log.enabled:
+            ELoad_List = ListSweep(dict, "Current", [0, I_Max])
+            ELoad_List.download()
+            Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
+            ELoad_List.step()
+
+        if DUT_Log.enabled:
+            Current(dict["ELoad"]).setOutputCurrent(0, dict["ELoad_Channel"])
+            Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
+            WAI(dict["PSU"])
+            V_NL, V_FL = DUT_Log.capture(0, I_Max)
+            print(DUT_Log.report())
+            self.logList = DUT_Log.logList
+            self.stepList = DUT_Log.stepList
 
-        Delay(dict["PSU"]).write(dict["DownTime"])
+        else:
+            # Reading for No Load Voltage
+
+            WAI(dict["PSU"])
+            DUT_Settle.up("No Load")
+            DMM_Repeat.arm()
+            Initiate(dict["DMM"]).initiate()
+            TRG(dict["DMM"])
+            DMM_Sync.wait(integration_time * DMM_Repeat.count)
+            V_NL = DMM_Repeat.fetch("No Load")
+            DUT_Settle.down()
+            if ELoad_List:
+                ELoad_List.step()
+
+            else:
+                Current(dict["ELoad"]).setOutputCurrent(I_Max, dict["ELoad_Channel"])
+                Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
+
+            WAI(dict["ELoad"])
+            DUT_Settle.up("Full Load")
+            DMM_Repeat.arm()
+            Initiate(dict["DMM"]).initiate()
+            TRG(dict["DMM"])
+            DMM_Sync.wait(integration_time * DMM_Repeat.count)
+            V_FL = DMM_Repeat.fetch("Full Load")
+
+            DUT_Settle.down()
+
+        print(DMM_Sync.report())
+        DMM_Repeat.close()
+        print(DUT_Settle.report())
+        self.settleList = DUT_Settle.settleList
+        print(DMM_Repeat.report())
+        self.statsList = [[x, *y] for x, y in DMM_Repeat.statistics.items()]
         print("V_NL: ", V_NL, "V_FL: ", V_FL)
+        self.regulationList = [V_NL, V_FL]
         Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
+        if ELoad_List:
+            ELoad_List.close()
+
         Output(dict["PSU"]).setOutputState("OFF")
         Voltage_Regulation = ((V_NL - V_FL) / V_FL) * 100
         Desired_Voltage_Regulation = 30 * self.param1 + self.param2
@@ -992,6 +3074,8 @@ class LoadRegulation:
         print(
             "Calculated Load Voltage Regulation (CV): (%)", round(Voltage_Regulation, 4)
         )
+        if DMM_Repeat.enabled:
+            print("Confidence Interval: (%) +/-", round(DMM_Repeat.getRegulation(), 4))
 
     def executeCC_LoadRegulationA(self, dict):
         """Test for determining the Load Regulation of DUT under Constant Current (CC) Mode.
@@ -1058,20 +3142,23 @@ class LoadRegulation:
             Oscilloscope,
         ) = Dimport.getClasses(dict["Instrument"])
         # Fixed Settings
-        Configure(dict["DMM"]).write("Current")
-        Trigger(dict["DMM"]).setSource("BUS")
-        Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
-        Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
-        Voltage(dict["PSU"]).setSenseMode(dict["CurrentSense"], dict["PSU_Channel"])
-        Current(dict["DMM"]).setNPLC(dict["Aperture"])
-        Current(dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
-        Current(dict["DMM"]).setTerminal(dict["Terminal"])
+        with Batch.getBatch(dict, dict["DMM"], dict["ELoad"], dict["PSU"]) as Setup:
+            Configure(dict["DMM"]).write("Current")
+            Trigger(dict["DMM"]).setSource("BUS")
+            Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
+            Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
+            Voltage(dict["PSU"]).setSenseMode(dict["CurrentSense"], dict["PSU_Channel"])
+            Current(dict["DMM"]).setNPLC(dict["Aperture"])
+            Current(dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
+            Current(dict["DMM"]).setTerminal(dict["Terminal"])
 
-        if dict["Range"] == "Auto":
-            Sense(dict["DMM"]).setCurrentRangeDCAuto()
+            if dict["Range"] == "Auto":
+                Sense(dict["DMM"]).setCurrentRangeDCAuto()
 
-        else:
-            Sense(dict["DMM"]).setCurrentRangeDC(dict["Range"])
+            else:
+                Sense(dict["DMM"]).setCurrentRangeDC(dict["Range"])
+
+        print(Setup.report())
 
         self.V_Rating = float(dict["V_Rating"])
         self.I_Rating = float(dict["I_Rating"])
@@ -1081,37 +3168,79 @@ class LoadRegulation:
 
         V_Max = self.P_Rating / self.I_Rating
         Apply(dict["PSU"]).write(dict["PSU_Channel"], self.V_Rating, self.I_Rating)
-        Voltage(dict["ELoad"]).setOutputVoltage(1, dict["ELoad_Channel"])
-        Output(dict["PSU"]).setOutputState("ON")
-        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
-        # Reading for No Load Voltage
 
-        WAI(dict["PSU"])
-        Initiate(dict["DMM"]).initiate()
-        TRG(dict["DMM"])
-        Delay(dict["PSU"]).write(dict["UpTime"])
-        I_NL = float(Fetch(dict["DMM"]).query())
+        DUT_Settle = Settling(dict, "Current")
+        DMM_Repeat = RepeatAcquisition(dict)
+        DUT_Log = DataLogger(dict, "Voltage")
 
-        Delay(dict["PSU"]).write(dict["DownTime"])
-        Voltage(dict["ELoad"]).setOutputVoltage(V_Max - 1, dict["ELoad_Channel"])
+        # In List Mode the ELoad steps from no load (1 V) to full load (V_Max - 1)
+        ELoad_List = None
+        if str(dict.get("ELoadSweep", "")).upper() == "LIST" and not DUT_Log.enabled:
+            ELoad_List = ListSweep(dict, "Voltage", [1, V_Max - 1])
+            ELoad_List.download()
+            ELoad_List.step()
 
-        Initiate(dict["DMM"]).initiate()
-        TRG(dict["DMM"])
-        WAI(dict["ELoad"])
-        Delay(dict["PSU"]).write(dict["UpTime"])
-        temp_string = float(OPC(dict["ELoad"]).query())
-        if temp_string == 1:
-            I_FL = float(Fetch(dict["DMM"]).query())
-            del temp_string
+        else:
+            Voltage(dict["ELoad"]).setOutputVoltage(1, dict["ELoad_Channel"])
+
+        Output(dict["PSU"]).setOutputState("ON")
+        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
+        if DUT_Log.enabled:
+            WAI(dict["PSU"])
+            I_NL, I_FL = DUT_Log.capture(1, V_Max - 1)
+            print(DUT_Log.report())
+            self.logList = DUT_Log.logList
+            self.stepList = DUT_Log.stepList
 
-        Delay(dict["PSU"]).write(dict["DownTime"])
+        else:
+            # Reading for No Load Voltage
+
+            WAI(dict["PSU"])
+            DUT_Settle.up("No Load")
+            DMM_Repeat.arm()
+            Initiate(dict["DMM"]).initiate()
+            TRG(dict["DMM"])
+            I_NL = DMM_Repeat.fetch("No Load")
+
+            DUT_Settle.down()
+            if ELoad_List:
+                ELoad_List.step()
+
+            else:
+                Voltage(dict["ELoad"]).setOutputVoltage(
+                    V_Max - 1, dict["ELoad_Channel"]
+                )
+
+            WAI(dict["ELoad"])
+            DUT_Settle.up("Full Load")
+            DMM_Repeat.arm()
+            Initiate(dict["DMM"]).initiate()
+            TRG(dict["DMM"])
+            temp_string = float(OPC(dict["DMM"]).query())
+            if temp_string == 1:
+                I_FL = DMM_Repeat.fetch("Full Load")
+                del temp_string
+
+            DUT_Settle.down()
+
+        DMM_Repeat.close()
+        print(DUT_Settle.report())
+        self.settleList = DUT_Settle.settleList
+        print(DMM_Repeat.report())
+        self.statsList = [[x, *y] for x, y in DMM_Repeat.statistics.items()]
         print("I_NL: ", I_NL, "I_FL: ", I_FL)
+        self.regulationList = [I_NL, I_FL]
         Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
+        if ELoad_List:
+            ELoad_List.close()
+
         Output(dict["PSU"]).setOutputState("OFF")
         Voltage_Regulation = ((I_NL - I_FL) / I_FL) * 100
         Desired_Voltage_Regulation = 30 * self.param1 + self.param2
         print("Desired Load Regulation(CC): (%)", Desired_Voltage_Regulation)
         print("Calculated Load Regulation(CC): (%)", round(Voltage_Regulation, 4))
+        if DMM_Repeat.enabled:
+            print("Confidence Interval: (%) +/-", round(DMM_Repeat.getRegulation(), 4))
 
     def executeCC_LoadRegulationB(self, dict):
         """Test for determining the Load Regulation of DUT under Constant Current (CC) Mode.
@@ -1122,11 +3251,12 @@ class LoadRegulation:
         turned on to drive the DUT to full load, while measuring the V_FullLoad, Calculations
         are then done to check the load regulation under CC condition.
 
-        The synchronization of Instrument here is done by using IEEE Commands OPC and WAI. The command OPC
-        queries the Instrument the status of the commands. 1 will be returned if all commands given have
-        been executed. Hence, this makes as a simple and efficient way to synchronize the measurement timing
-        of the Instrument, since it is under the IEEE Standard Library, most Instrument are synchronized
-        using this way. However, this method only works for commands with a short execution time.
+        The synchronization of Instrument here is done through the Status Byte of the DMM. The DMM is armed
+        once so that the Operation Complete bit requests service, and after the DMM is triggered the
+        program either waits for the Service Request or serial polls the Status Byte with a growing
+        interval, instead of querying STAT:OPER:COND? as fast as the bus allows. This method is suitable
+        for operations that require a longer time (e.g. 100 NPLC). The time taken and the number of polls
+        made by every wait are printed when the test is completed.
 
         Args:
             Instrument: String determining which library to be used.
@@ -1179,20 +3309,25 @@ class LoadRegulation:
         ) = Dimport.getClasses(dict["Instrument"])
 
         # Instruments Initialization
-        Configure(dict["DMM"]).write("Current")
-        Trigger(dict["DMM"]).setSource("BUS")
-        Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
-        Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
-        Voltage(dict["PSU"]).setSenseMode(dict["CurrentSense"], dict["PSU_Channel"])
-        Current(dict["DMM"]).setNPLC(dict["Aperture"])
-        Current(dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
-        Current(dict["DMM"]).setTerminal(dict["Terminal"])
+        with Batch.getBatch(dict, dict["DMM"], dict["ELoad"], dict["PSU"]) as Setup:
+            Configure(dict["DMM"]).write("Current")
+            Trigger(dict["DMM"]).setSource("BUS")
+            Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
+            Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
+            Voltage(dict["PSU"]).setSenseMode(dict["CurrentSense"], dict["PSU_Channel"])
+            Current(dict["DMM"]).setNPLC(dict["Aperture"])
+            Current(dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
+            Current(dict["DMM"]).setTerminal(dict["Terminal"])
 
-        if dict["Range"] == "Auto":
-            Sense(dict["DMM"]).setCurrentRangeDCAuto()
+            if dict["Range"] == "Auto":
+                Sense(dict["DMM"]).setCurrentRangeDCAuto()
 
-        else:
-            Sense(dict["DMM"]).setCurrentRangeDC(dict["Range"])
+            else:
+                Sense(dict["DMM"]).setCurrentRangeDC(dict["Range"])
+
+        print(Setup.report())
+
+        DMM_Sync, integration_time = Completion.getWait(dict)
 
         self.V_Rating = float(dict["V_Rating"])
         self.I_Rating = float(dict["I_Rating"])
@@ -1202,52 +3337,535 @@ class LoadRegulation:
 
         V_Max = self.P_Rating / self.I_Rating
         Apply(dict["PSU"]).write(dict["PSU_Channel"], self.V_Rating, self.I_Rating)
-        Voltage(dict["ELoad"]).setOutputVoltage(1, dict["ELoad_Channel"])
-        Output(dict["PSU"]).setOutputState("ON")
-        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
-        # Reading for No Load Voltage
 
-        WAI(dict["PSU"])
-        Initiate(dict["DMM"]).initiate()
-        status = float(Status(dict["DMM"]).operationCondition())
-        TRG(dict["DMM"])
-        while 1:
-            status = float(Status(dict["DMM"]).operationCondition())
-
-            if status == 8704.0:
-                I_NL = float(Fetch(dict["DMM"]).query())
-                break
-
-            elif status == 512.0:
-                I_NL = float(Fetch(dict["DMM"]).query())
-                break
-        Delay(dict["PSU"]).write(dict["DownTime"])
-        Voltage(dict["ELoad"]).setOutputVoltage(V_Max - 1, dict["ELoad_Channel"])
+        DUT_Settle = Settling(dict, "Current")
+        DMM_Repeat = RepeatAcquisition(dict)
+        DUT_Log = DataLogger(dict, "Voltage")
 
-        WAI(dict["ELoad"])
-        Initiate(dict["DMM"]).initiate()
-        status = float(Status(dict["DMM"]).operationCondition())
-        TRG(dict["DMM"])
-        Delay(dict["PSU"]).write(dict["UpTime"])
-        while 1:
-            status = float(Status(dict["DMM"]).operationCondition())
+        # In List Mode the ELoad steps from no load (1 V) to full load (V_Max - 1)
+        ELoad_List = None
+        if str(dict.get("ELoadSweep", "")).upper() == "LIST" and not DUT_Log.enabled:
+            ELoad_List = ListSweep(dict, "Voltage", [1, V_Max - 1])
+            ELoad_List.download()
+            ELoad_List.step()
 
-            if status == 8704.0:
-                I_FL = float(Fetch(dict["DMM"]).query())
-                break
+        else:
+            Voltage(dict["ELoad"]).setOutputVoltage(1, dict["ELoad_Channel"])
 
-            elif status == 512.0:
-                I_FL = float(Fetch(dict["DMM"]).query())
-                break
+        Output(dict["PSU"]).setOutputState("ON")
+        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
+        if DUT_Log.enabled:
+            WAI(dict["PSU"])
+            I_NL, I_FL = DUT_Log.capture(1, V_Max - 1)
+            print(DUT_Log.report())
+            self.logList = DUT_Log.logList
+            self.stepList = DUT_Log.stepList
 
-        Delay(dict["PSU"]).write(dict["DownTime"])
+        else:
+            # Reading for No Load Voltage
+
+            WAI(dict["PSU"])
+            DUT_Settle.up("No Load")
+            DMM_Repeat.arm()
+            Initiate(dict["DMM"]).initiate()
+            TRG(dict["DMM"])
+            DMM_Sync.wait(integration_time * DMM_Repeat.count)
+            I_NL = DMM_Repeat.fetch("No Load")
+            DUT_Settle.down()
+            if ELoad_List:
+                ELoad_List.step()
+
+            else:
+                Voltage(dict["ELoad"]).setOutputVoltage(
+                    V_Max - 1, dict["ELoad_Channel"]
+                )
+
+            WAI(dict["ELoad"])
+            DUT_Settle.up("Full Load")
+            DMM_Repeat.arm()
+            Initiate(dict["DMM"]).initiate()
+            TRG(dict["DMM"])
+            DMM_Sync.wait(integration_time * DMM_Repeat.count)
+            I_FL = DMM_Repeat.fetch("Full Load")
+
+            DUT_Settle.down()
+
+        print(DMM_Sync.report())
+        DMM_Repeat.close()
+        print(DUT_Settle.report())
+        self.settleList = DUT_Settle.settleList
+        print(DMM_Repeat.report())
+        self.statsList = [[x, *y] for x, y in DMM_Repeat.statistics.items()]
         print("I_NL: ", I_NL, "I_FL: ", I_FL)
+        self.regulationList = [I_NL, I_FL]
         Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
+        if ELoad_List:
+            ELoad_List.close()
+
         Output(dict["PSU"]).setOutputState("OFF")
         Current_Regulation = ((I_NL - I_FL) / I_FL) * 100
         Desired_Current_Regulation = self.I_Rating * self.param1 + self.param2
         print("Desired Load Regulation (CC): (%)", Desired_Current_Regulation)
         print("Calculated Load Regulation (CC): (%)", round(Current_Regulation, 4))
+        if DMM_Repeat.enabled:
+            print("Confidence Interval: (%) +/-", round(DMM_Repeat.getRegulation(), 4))
+
+
+class ChannelList:
+    """Class to program and read back every DUT of a multi-channel test with a single command
+
+    Every channel of an N6700 mainframe given in PSU_Channel holds a DUT, loaded by the ELoad channel
+    in the same position of ELoad_Channel, e.g. PSU_Channel "1,2" and ELoad_Channel "3,4". The
+    channels are given as a comma separated list or a range ("1:4"). Every setpoint is written to
+    all the channels at once with a channel list (e.g. VOLT 5,(@1,2)) and all the channels are read
+    back with a single MEAS? query, so the number of bus transactions per point does not grow with
+    the number of DUTs. The subsystems are imported from the library in the key Instrument.
+
+    Attributes:
+        PSU: String containing the VISA Address of the PSU mainframe.
+        ELoad: String containing the VISA Address of the ELoad mainframe.
+        PSU_Channels: List containing the channel of every DUT.
+        ELoad_Channels: List containing the ELoad channel loading every DUT.
+
+    """
+
+    def __init__(self, dict):
+        self.Voltage = Dimport.getClass(dict["Instrument"], "Voltage")
+        self.Current = Dimport.getClass(dict["Instrument"], "Current")
+        self.Output = Dimport.getClass(dict["Instrument"], "Output")
+        self.Measure = Dimport.getClass(dict["Instrument"], "Measure")
+
+        self.PSU = dict["PSU"]
+        self.ELoad = dict["ELoad"]
+        self.PSU_Channels = self.parse(dict["PSU_Channel"])
+        self.ELoad_Channels = self.parse(dict["ELoad_Channel"])
+        if len(self.PSU_Channels) != len(self.ELoad_Channels):
+            raise ValueError(
+                "PSU_Channel and ELoad_Channel need the same number of channels"
+            )
+
+    @staticmethod
+    def parse(channels):
+        """Returns the list of channels, e.g. [1, 2, 3, 4] for "1,2,3,4", "1:4" or [1, 2, 3, 4]"""
+        if isinstance(channels, (list, tuple)):
+            return [int(x) for x in channels]
+
+        parsed = []
+        for item in str(channels).split(","):
+            first, _, last = item.partition(":")
+            parsed.extend(range(int(first), int(last or first) + 1))
+
+        return parsed
+
+    @staticmethod
+    def format(channels):
+        """Returns the channels as the content of a SCPI channel list, e.g. "1,2,3,4" """
+        return ",".join(str(x) for x in channels)
+
+    def setPSU(self, Function, value):
+        """Programs the voltage or current of every DUT"""
+        if Function == "Voltage":
+            self.Voltage(self.PSU).setOutputVoltage(
+                value, self.format(self.PSU_Channels)
+            )
+
+        else:
+            self.Current(self.PSU).setOutputCurrent(
+                value, self.format(self.PSU_Channels)
+            )
+
+    def setELoad(self, Function, value):
+        """Programs the voltage or current of every ELoad channel"""
+        if Function == "Voltage":
+            self.Voltage(self.ELoad).setOutputVoltage(
+                value, self.format(self.ELoad_Channels)
+            )
+
+        else:
+            self.Current(self.ELoad).setOutputCurrent(
+                value, self.format(self.ELoad_Channels)
+            )
+
+    def setOutput(self, state, ELoad=True):
+        """Turns the output of every DUT, and every ELoad channel, on or off"""
+        self.Output(self.PSU).setOutputStateC(
+            state, self.format(self.PSU_Channels)
+        )
+        if ELoad:
+            self.Output(self.ELoad).setOutputStateC(
+                state, self.format(self.ELoad_Channels)
+            )
+
+    def measure(self, Function):
+        """Reads back the voltage or current of every DUT with a single query
+
+        Returns:
+            Returns a list containing the reading of every DUT in the order of PSU_Channel.
+        """
+        response = self.Measure(self.PSU).multipleChannelQuery(
+            self.format(self.PSU_Channels), "VOLT" if Function == "Voltage" else "CURR"
+        )
+        return [float(x) for x in response.split(",")]
+
+
+class MultiChannel:
+    """Tests running the same plan on several DUTs, one per channel of an N6700 mainframe
+
+    The DMM can only measure one DUT at a time, hence by default the accuracy tests measure every
+    DUT with the DMM in turn. When the key Readback is set to "ON", every DUT is swept at once and
+    the readback of the mainframe (MEAS:VOLT? and MEAS:CURR? with a channel list) is taken as the
+    measured value instead. The load regulation tests always use the readback.
+
+    """
+
+    def __init__(self):
+        pass
+
+    def executeVoltageMeasurement(self, dict):
+        """Execution of Voltage Programm / Readback Accuracy on every channel in PSU_Channel
+
+        By default the sweep of executeVoltageMeasurementA (see SweepRunner) is run on every channel
+        in turn, the DMM being connected to the channel tested (e.g. through a switch). See
+        executeReadback for the key Readback set to "ON".
+
+        Args:
+            dict: Dictionary containing the settings of executeVoltageMeasurementA, where
+                PSU_Channel and ELoad_Channel contain a list of channels.
+
+        Returns:
+            Returns a list containing the infoList & dataList of every DUT in the order of PSU_Channel,
+            or the results of executeReadback.
+
+        Raises:
+            ValueError: PSU_Channel and ELoad_Channel do not have the same number of channels.
+        """
+        if str(dict.get("Readback", "OFF")).upper() == "ON":
+            return self.executeReadback(dict, "Voltage")
+
+        return self.executeChannels(dict, "Voltage")
+
+    def executeCurrentMeasurement(self, dict):
+        """Execution of Current Programm / Readback Accuracy on every channel in PSU_Channel
+
+        By default the sweep of executeCurrentMeasurementA (see SweepRunner) is run on every channel
+        in turn, the DMM being connected to the channel tested (e.g. through a switch). See
+        executeReadback for the key Readback set to "ON".
+
+        Args:
+            dict: Dictionary containing the settings of executeCurrentMeasurementA, where
+                PSU_Channel and ELoad_Channel contain a list of channels.
+
+        Returns:
+            Returns a list containing the dataList & infoList of every DUT in the order of PSU_Channel,
+            or the results of executeReadback.
+
+        Raises:
+            ValueError: PSU_Channel and ELoad_Channel do not have the same number of channels.
+        """
+        if str(dict.get("Readback", "OFF")).upper() == "ON":
+            return self.executeReadback(dict, "Current")
+
+        return self.executeChannels(dict, "Current")
+
+    def executeChannels(self, dict, Function):
+        """Runs the DMM sweep of a Voltage or Current Measurement on every channel in turn
+
+        Every channel keeps its own checkpoint log, the path in the key Checkpoint followed by the
+        channel, so that an interrupted run resumes on the channel it stopped at.
+
+        Args:
+            dict: Dictionary containing the settings of the accuracy test.
+            Function: String containing the quantity measured, "Voltage" or "Current".
+
+        Returns:
+            Returns a list containing the infoList & dataList of every DUT, in the order returned by
+            the accuracy test of the quantity.
+        """
+        Channels = ChannelList(dict)
+        results = []
+        for PSU_Channel, ELoad_Channel in zip(
+            Channels.PSU_Channels, Channels.ELoad_Channels
+        ):
+            settings = {
+                **dict,
+                "PSU_Channel": PSU_Channel,
+                "ELoad_Channel": ELoad_Channel,
+            }
+            if dict.get("Checkpoint"):
+                settings["Checkpoint"] = f"{dict['Checkpoint']}.{PSU_Channel}"
+
+            print("Channel", PSU_Channel)
+            Sweep = SweepRunner(settings, Function, f"execute{Function}Measurement")
+            Sweep.run()
+            print(Sweep.report())
+            infoList, dataList = Sweep.Results.getLists()
+            if Function == "Voltage":
+                results.append((infoList, dataList))
+
+            else:
+                results.append((dataList, infoList))
+
+        return results
+
+    def executeReadback(self, dict, Function):
+        """Sweeps every channel in PSU_Channel at once and reads back every DUT from the mainframe
+
+        The sweep is the same as the accuracy test of the quantity and is planned by the SweepPlanner,
+        refined on the channel whose point lies closest to (or furthest outside) its limit when the
+        sampling is adaptive. At every point, the setpoint of every DUT and of every ELoad channel is
+        written with a single command each, and every DUT is read back with a single query.
+
+        The readback only checks the DUT against its own measurement, not against the DMM, hence the
+        results are labelled "READBACK" and the readings are returned as a readbackList, which is not
+        a dataList for datatoGraph.
+
+        Args:
+            dict: Dictionary containing the settings of the accuracy test, where PSU_Channel and
+                ELoad_Channel contain a list of channels.
+            Function: String containing the quantity measured, "Voltage" or "Current".
+
+        Returns:
+            Returns a list containing, for every DUT in the order of PSU_Channel, a dictionary of its
+            Channel, its Source ("READBACK"), the infoList and the readbackList (Voltage and Current
+            Read Back) of the points measured.
+
+        Raises:
+            ValueError: PSU_Channel and ELoad_Channel do not have the same number of channels.
+        """
+        Mode = Dimport.getClass(dict["Instrument"], "Function")
+        Voltage = Dimport.getClass(dict["Instrument"], "Voltage")
+        Delay = Dimport.getClass(dict["Instrument"], "Delay")
+        Load = "Current" if Function == "Voltage" else "Voltage"
+
+        Channels = ChannelList(dict)
+        with Batch.getBatch(dict, dict["ELoad"], dict["PSU"]) as Setup:
+            Mode(dict["ELoad"]).setMode(
+                dict["setFunction"], Channels.format(Channels.ELoad_Channels)
+            )
+            Voltage(dict["PSU"]).setSenseMode(
+                dict[f"{Function}Sense"], Channels.format(Channels.PSU_Channels)
+            )
+            Channels.setPSU(Load, float(dict[f"max{Load}"]) + 1)
+
+        print(Setup.report())
+
+        Sweep = SweepPlanner(
+            dict,
+            SweepRunner.getProfile(dict, Load),
+            SweepRunner.getProfile(dict, Function),
+        )
+        points = Sweep.plan()
+        print(Sweep.report(points))
+
+        Channels.setOutput("ON")
+        readings = {}
+        while points:
+            ELoad_Setpoint = None
+            for k, i, outer, inner in points:
+                if outer != ELoad_Setpoint:
+                    Channels.setELoad(Load, outer - 0.001 * outer)
+                    ELoad_Setpoint = outer
+
+                Channels.setPSU(Function, inner)
+                V, I = (inner, outer) if Function == "Voltage" else (outer, inner)
+                print("Voltage: ", V, "Current: ", I)
+                WAI(dict["PSU"])
+                Delay(dict["PSU"]).write(dict["UpTime"])
+                readings[k] = Channels.measure(Function)
+                Delay(dict["PSU"]).write(dict["DownTime"])
+
+            points = Sweep.refine(self.getWorst(Sweep, readings))
+
+        Channels.setOutput("OFF")
+        print(Sweep.reportSampling())
+
+        results = []
+        for n, channel in enumerate(Channels.PSU_Channels):
+            infoList = []
+            readbackList = []
+            for k, i, outer, inner in Sweep.points:
+                if k not in readings:
+                    continue
+
+                V, I = (inner, outer) if Function == "Voltage" else (outer, inner)
+                infoList.append([V, I, i])
+                if Function == "Voltage":
+                    readbackList.append([readings[k][n], I])
+
+                else:
+                    readbackList.append([V, readings[k][n]])
+
+            results.append(
+                {
+                    "Channel": channel,
+                    "Source": "READBACK",
+                    "infoList": infoList,
+                    "readbackList": readbackList,
+                }
+            )
+
+        return results
+
+    @staticmethod
+    def getWorst(Sweep, readings):
+        """Returns the reading of every point on the channel with the lowest margin to its limit
+
+        A point programmed to 0 has no margin, its worst reading is the one furthest from 0.
+        """
+        worst = {}
+        for k, values in readings.items():
+            setpoint = Sweep.points[k][3]
+            if Sweep.getMargin(setpoint, values[0]) is None:
+                worst[k] = max(values, key=lambda x: abs(x - setpoint))
+
+            else:
+                worst[k] = min(values, key=lambda x: Sweep.getMargin(setpoint, x))
+
+        return worst
+
+    def executeCV_LoadRegulation(self, dict):
+        """Test for determining the Load Regulation under CV Mode of every channel in PSU_Channel at once
+
+        The No Load Voltage of every DUT is read back with the ELoad channels off, then every ELoad
+        channel draws the full load current (P_Rating / V_Rating) and the Full Load Voltage is read
+        back, with a single command or query for all the DUTs at each step.
+
+        Args:
+            dict: Dictionary containing the settings of executeCV_LoadRegulationA, where
+                PSU_Channel and ELoad_Channel contain a list of channels.
+
+        Returns:
+            Returns a list containing the channel, V_NL, V_FL and the Load Regulation in % of every DUT.
+
+        Raises:
+            ValueError: PSU_Channel and ELoad_Channel do not have the same number of channels.
+        """
+        Mode = Dimport.getClass(dict["Instrument"], "Function")
+        Voltage = Dimport.getClass(dict["Instrument"], "Voltage")
+        Delay = Dimport.getClass(dict["Instrument"], "Delay")
+
+        Channels = ChannelList(dict)
+        V_Rating = float(dict["V_Rating"])
+        I_Rating = float(dict["I_Rating"])
+        I_Max = float(dict["P_Rating"]) / V_Rating
+
+        with Batch.getBatch(dict, dict["ELoad"], dict["PSU"]) as Setup:
+            Mode(dict["ELoad"]).setMode(
+                dict["setFunction"], Channels.format(Channels.ELoad_Channels)
+            )
+            Voltage(dict["PSU"]).setSenseMode(
+                dict["VoltageSense"], Channels.format(Channels.PSU_Channels)
+            )
+            Channels.setPSU("Voltage", V_Rating)
+            Channels.setPSU("Current", I_Rating)
+
+        print(Setup.report())
+
+        # Reading for No Load Voltage
+        Channels.setOutput("ON", ELoad=False)
+        WAI(dict["PSU"])
+        Delay(dict["PSU"]).write(dict["UpTime"])
+        V_NL = Channels.measure("Voltage")
+
+        Channels.setELoad("Current", I_Max)
+        Channels.setOutput("ON")
+        WAI(dict["ELoad"])
+        Delay(dict["PSU"]).write(dict["UpTime"])
+        V_FL = Channels.measure("Voltage")
+        Channels.setOutput("OFF")
+
+        Desired_Voltage_Regulation = 30 * float(dict["Error_Gain"]) + float(
+            dict["Error_Offset"]
+        )
+        print("Desired Voltage Regulation (CV): (%)", Desired_Voltage_Regulation)
+        results = []
+        for channel, NL, FL in zip(Channels.PSU_Channels, V_NL, V_FL):
+            Voltage_Regulation = ((NL - FL) / FL) * 100
+            print(
+                "Channel",
+                channel,
+                "V_NL: ",
+                NL,
+                "V_FL: ",
+                FL,
+                "Calculated Voltage Regulation (CV): (%)",
+                round(Voltage_Regulation, 4),
+            )
+            results.append([channel, NL, FL, Voltage_Regulation])
+
+        return results
+
+    def executeCC_LoadRegulation(self, dict):
+        """Test for determining the Load Regulation under CC Mode of every channel in PSU_Channel at once
+
+        The No Load Current of every DUT is read back with every ELoad channel holding 1 V, then every
+        ELoad channel holds the full load voltage (P_Rating / I_Rating - 1) and the Full Load Current
+        is read back, with a single command or query for all the DUTs at each step.
+
+        Args:
+            dict: Dictionary containing the settings of executeCC_LoadRegulationA, where
+                PSU_Channel and ELoad_Channel contain a list of channels.
+
+        Returns:
+            Returns a list containing the channel, I_NL, I_FL and the Load Regulation in % of every DUT.
+
+        Raises:
+            ValueError: PSU_Channel and ELoad_Channel do not have the same number of channels.
+        """
+        Mode = Dimport.getClass(dict["Instrument"], "Function")
+        Voltage = Dimport.getClass(dict["Instrument"], "Voltage")
+        Delay = Dimport.getClass(dict["Instrument"], "Delay")
+
+        Channels = ChannelList(dict)
+        V_Rating = float(dict["V_Rating"])
+        I_Rating = float(dict["I_Rating"])
+        V_Max = float(dict["P_Rating"]) / I_Rating
+
+        with Batch.getBatch(dict, dict["ELoad"], dict["PSU"]) as Setup:
+            Mode(dict["ELoad"]).setMode(
+                dict["setFunction"], Channels.format(Channels.ELoad_Channels)
+            )
+            Voltage(dict["PSU"]).setSenseMode(
+                dict["CurrentSense"], Channels.format(Channels.PSU_Channels)
+            )
+            Channels.setPSU("Voltage", V_Rating)
+            Channels.setPSU("Current", I_Rating)
+            Channels.setELoad("Voltage", 1)
+
+        print(Setup.report())
+
+        # Reading for No Load Current
+        Channels.setOutput("ON")
+        WAI(dict["PSU"])
+        Delay(dict["PSU"]).write(dict["UpTime"])
+        I_NL = Channels.measure("Current")
+
+        Channels.setELoad("Voltage", V_Max - 1)
+        WAI(dict["ELoad"])
+        Delay(dict["PSU"]).write(dict["UpTime"])
+        I_FL = Channels.measure("Current")
+        Channels.setOutput("OFF")
+
+        Desired_Current_Regulation = 30 * float(dict["Error_Gain"]) + float(
+            dict["Error_Offset"]
+        )
+        print("Desired Load Regulation(CC): (%)", Desired_Current_Regulation)
+        results = []
+        for channel, NL, FL in zip(Channels.PSU_Channels, I_NL, I_FL):
+            Current_Regulation = ((NL - FL) / FL) * 100
+            print(
+                "Channel",
+                channel,
+                "I_NL: ",
+                NL,
+                "I_FL: ",
+                FL,
+                "Calculated Load Regulation(CC): (%)",
+                round(Current_Regulation, 4),
+            )
+            results.append([channel, NL, FL, Current_Regulation])
+
+        return results
 
 
 class RiseFallTime:
@@ -1263,9 +3881,8 @@ class RiseFallTime:
         The test begins by initializing all the settings for Oscilloscope and other Instrument.
         The PSU is then set to output full load followed by activating single mode on the oscilloscope.
         The Eload is then turned off, which would trigger the oscilloscope to show a transient wave. The
-        transient wave is then measured using the built in functions. The transient time is caluclated by
-        totalling the rise and fall time where the threshold is set manually depending on the voltage
-        settling band.
+        transient wave is then downloaded once and analysed on the host (see TransientAnalysis). The
+        transient time is the time the output takes to settle within the voltage settling band.
 
         Args:
             ELoad: String determining the VISA Address of ELoad.
@@ -1287,6 +3904,7 @@ class RiseFallTime:
             VerticalScale: Float determining the vertical scale of the oscilloscope display.
             I_Step: Float determining the value of current step.
             V_settling_band: Float determining the desired voltage settling band.
+            V_Settling_Bands: Optional list of Floats containing further settling bands to analyse.
 
         Raises:
             VisaIOError: An error occured when opening PyVisa Resources.
@@ -1313,21 +3931,24 @@ class RiseFallTime:
         ) = Dimport.getClasses(dict["Instrument"])
         V_Settling_Band = dict["V_Settling_Band"]
         # Instruments Settings
-        Oscilloscope(dict["OSC"]).setChannelCoupling(
-            dict["OSC_Channel"], dict["Channel_CouplingMode"]
-        )
-        Oscilloscope(dict["OSC"]).setTriggerMode(dict["Trigger_Mode"])
-        Oscilloscope(dict["OSC"]).setTriggerCoupling(dict["Trigger_CouplingMode"])
-        Oscilloscope(dict["OSC"]).setTriggerSweepMode(dict["Trigger_SweepMode"])
-        Oscilloscope(dict["OSC"]).setTriggerSlope(dict["Trigger_SlopeMode"])
-        Oscilloscope(dict["OSC"]).setTimeScale(dict["TimeScale"])
-        Oscilloscope(dict["OSC"]).setTriggerSource(dict["OSC_Channel"])
-        Oscilloscope(dict["OSC"]).setVerticalScale(
-            dict["VerticalScale"], dict["OSC_Channel"]
-        )
-        Oscilloscope(dict["OSC"]).setTriggerEdgeLevel(0, dict["OSC_Channel"])
-        Oscilloscope(dict["OSC"]).setTriggerHFReject(1)
-        Oscilloscope(dict["OSC"]).setTriggerNoiseReject(1)
+        with Batch.getBatch(dict, dict["OSC"]) as Setup:
+            Oscilloscope(dict["OSC"]).setChannelCoupling(
+                dict["OSC_Channel"], dict["Channel_CouplingMode"]
+            )
+            Oscilloscope(dict["OSC"]).setTriggerMode(dict["Trigger_Mode"])
+            Oscilloscope(dict["OSC"]).setTriggerCoupling(dict["Trigger_CouplingMode"])
+            Oscilloscope(dict["OSC"]).setTriggerSweepMode(dict["Trigger_SweepMode"])
+            Oscilloscope(dict["OSC"]).setTriggerSlope(dict["Trigger_SlopeMode"])
+            Oscilloscope(dict["OSC"]).setTimeScale(dict["TimeScale"])
+            Oscilloscope(dict["OSC"]).setTriggerSource(dict["OSC_Channel"])
+            Oscilloscope(dict["OSC"]).setVerticalScale(
+                dict["VerticalScale"], dict["OSC_Channel"]
+            )
+            Oscilloscope(dict["OSC"]).setTriggerEdgeLevel(0, dict["OSC_Channel"])
+            Oscilloscope(dict["OSC"]).setTriggerHFReject(1)
+            Oscilloscope(dict["OSC"]).setTriggerNoiseReject(1)
+
+        print(Setup.report())
 
         Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
         Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
@@ -1341,22 +3962,18 @@ class RiseFallTime:
 
         Oscilloscope(dict["OSC"]).setSingleMode()
         WAI(dict["OSC"])
-        sleep(1)
+        SessionPool.sleep(1)
         Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
         WAI(dict["OSC"])
 
-        V_max = float(Oscilloscope(dict["OSC"]).getMaximumVoltage())
-        Oscilloscope(dict["OSC"]).setThresholdMode("Voltage")
-        Oscilloscope(dict["OSC"]).setUpperLimit(0.99 * V_max)
-        Oscilloscope(dict["OSC"]).setLowerLimit(0)
-        rise_time = float(Oscilloscope(dict["OSC"]).getRiseTime(1))
-
-        Oscilloscope(dict["OSC"]).setLowerLimit(V_Settling_Band)
-
-        fall_time = float(Oscilloscope(dict["OSC"]).getFallTime(1))
+        # The waveform is downloaded once and the transient analysed on the host
+        Transient = TransientAnalysis(dict)
+        Transient.capture()
+        print(Transient.report())
+        self.transientList = Transient.settleList
 
         print(
-            f"Total Transient Time with Voltage Settling Band of {V_Settling_Band}, {rise_time+fall_time}s"
+            f"Total Transient Time with Voltage Settling Band of {V_Settling_Band}, {Transient.recovery}s"
         )
 
         Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
@@ -1445,17 +4062,17 @@ class ProgrammingSpeedTest:
         Output(dict["PSU"]).setOutputState("ON")
         Oscilloscope(dict["OSC"]).setSingleMode()
         WAI(dict["OSC"])
-        sleep(1)
+        SessionPool.sleep(1)
 
         Apply(dict["PSU"]).write(dict["PSU_Channel"], dict["V_Upper"], 2)
-        sleep(1)
+        SessionPool.sleep(1)
         Rise_Time = float(Oscilloscope(dict["OSC"]).getRiseTime(dict["OSC_Channel"]))
         print(f"Rise Time from{Lower_Bound}% to {Upper_Bound}%: {Rise_Time} s")
-        sleep(1)
+        SessionPool.sleep(1)
         Oscilloscope(dict["OSC"]).setSingleMode()
-        sleep(1)
+        SessionPool.sleep(1)
         Apply(dict["PSU"]).write(dict["PSU_Channel"], dict["V_Lower"], 2)
-        sleep(1)
+        SessionPool.sleep(1)
         Fall_Time = float(Oscilloscope(dict["OSC"]).getFallTime(dict["OSC_Channel"]))
 
         print(f"Fall Time from {Upper_Bound}% to {Lower_Bound}%: {Fall_Time} s")
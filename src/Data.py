@@ -4,6 +4,9 @@
 
 """
 
+import asyncio
+import csv
+import math
 import sys
 import pandas as pd
 from matplotlib import pyplot as plt
@@ -15,6 +18,20 @@ sys.path.insert(
 )
 from IEEEStandard import IDN
 from Keysight import System
+from AsyncDriver import AsyncSubsystem
+
+# Columns of the statistics of repeated points (see RepeatAcquisition in DUT_Test.py)
+STATISTICS = [
+    "Readings",
+    "Standard Deviation",
+    "Minimum",
+    "Maximum",
+    "Confidence Low",
+    "Confidence High",
+]
+
+# Columns of the retries of every point (see RetryPolicy and SweepBuffer in DUT_Test.py)
+RETRIES = ["Retries", "Failed"]
 
 
 class datatoCSV_Accuracy(object):
@@ -26,17 +43,21 @@ class datatoCSV_Accuracy(object):
 
     """
 
-    def __init__(self, infoList, dataList):
+    def __init__(self, infoList, dataList, statsList=None, failList=None):
         """This function initializes the preprocessing of data and generate CSV file
 
             This function begins by extracting the list provided as an arguement into
             multiple columns. The absolute and percentage error is then calculted using
             the columns, the columns are then converted into dataframes which is then
-            all compiled into a csv file.
+            all compiled into a csv file. The statistics of repeated points are added as
+            the STATISTICS columns, and the retries of the points as the RETRIES columns.
+            A point whose reading failed has no measured value.
 
         Args:
             infoList: List containing all the data that is sent from the program.
             dataList: List containing all the data that is collected from the DUT.
+            statsList: List containing the statistics of every point, None for single readings.
+            failList: List containing the retries and failure of every point, None without retries.
             Vset: Column containing information regarding the Voltage Set.
             Iset: Column containing information regarding the Current Set.
             Key: Column containing key to differentiate different current iterations.
@@ -87,15 +108,30 @@ class datatoCSV_Accuracy(object):
             axis=1,
         )
 
+        if statsList is not None:
+            statistics = pd.DataFrame(np.asarray(statsList), columns=STATISTICS)
+            CSV1 = pd.concat([CSV1, statistics], axis=1)
+
+        if failList is not None:
+            failures = pd.DataFrame(np.asarray(failList), columns=RETRIES)
+            failures["Failed"] = failures["Failed"].astype(bool)
+            CSV1 = pd.concat([CSV1, failures], axis=1)
+
         CSV1.to_csv("csv/data.csv", index=False)
 
     def column(self, matrix, i):
         """Function to convert rows of data from list to a column
 
+            The columns of a NumPy array (e.g. the SweepBuffer of DUT_Test.py) are returned as
+            views, so they are handed to pandas without a copy.
+
         Args:
             matrix: The 2D matrix to store the column data
             i: to iterate through loop
         """
+        if isinstance(matrix, np.ndarray):
+            return matrix[:, i]
+
         return [row[i] for row in matrix]
 
 
@@ -203,20 +239,44 @@ class datatoCSV_Regulation(object):
     def column(self, matrix, i):
         """Function to convert rows of data from list to a column
 
+            The columns of a NumPy array (e.g. the SweepBuffer of DUT_Test.py) are returned as
+            views, so they are handed to pandas without a copy.
+
         Args:
             matrix: The 2D matrix to store the column data
             i: to iterate through loop
         """
+        if isinstance(matrix, np.ndarray):
+            return matrix[:, i]
+
         return [row[i] for row in matrix]
 
 
 class datatoGraph(datatoCSV_Accuracy):
     """Child class of datatoCSV_Accuracy to plot the graph"""
 
-    def __init__(self, infoList, dataList):
-        super().__init__(infoList, dataList)
+    def __init__(self, infoList, dataList, statsList=None, failList=None):
+        super().__init__(infoList, dataList, statsList, failList)
         self.data = pd.read_csv("csv/data.csv")
 
+    @staticmethod
+    def confidence(df, column):
+        """Returns the half width in percent of the confidence interval of the error of every point
+
+            A repeated point only fails when its whole confidence interval lies outside the
+            error boundary, so that a point does not fail on its noise alone. Single readings
+            have no interval.
+
+        Args:
+            df: Dataframe containing the points, with the STATISTICS columns when repeated.
+            column: String containing the column of the set values, e.g. "Voltage Set".
+        """
+        if "Confidence Low" not in df:
+            return 0
+
+        half = (df["Confidence High"] - df["Confidence Low"]) / 2
+        return (half / df[column] * 100).abs()
+
     def errorBoundary(self, param1, param2, UNIT, x, x_err, y):
         """Function is used to determine and plot the error boundaries of voltage/current accuracy
 
@@ -387,11 +447,17 @@ class datatoGraph(datatoCSV_Accuracy):
             self.upper_error_limit = upper_error_limit
             self.lower_error_limit = lower_error_limit
 
-            condition1 = upper_error_limit < Vpercent_errorS
-            condition2 = lower_error_limit > Vpercent_errorS
+            guard = datatoGraph.confidence(grouped_df.get_group(x), "Voltage Set")
+            condition1 = upper_error_limit < Vpercent_errorS - guard
+            condition2 = lower_error_limit > Vpercent_errorS + guard
 
+            # A point whose reading failed has no error, it is marked instead of passed
+            missing = Vpercent_errorS.isna()
             for i in range(condition1.count()):
-                if condition1.iloc[i] | condition2.iloc[i]:
+                if missing.iloc[i]:
+                    self.condition = "NO READING"
+                    boolList.append(self.condition)
+                elif condition1.iloc[i] | condition2.iloc[i]:
                     self.condition = "FAIL"
                     boolList.append(self.condition)
                 else:
@@ -461,13 +527,16 @@ class datatoGraph(datatoCSV_Accuracy):
             lower_error_limitC, columns=["Lower Error Boundary"]
         )
 
-        ungrouped_df.drop(columns=["key"], inplace=True)
+        # The statistics and retries follow the condition, which keeps its Excel report column
+        statistics = ungrouped_df[[x for x in STATISTICS + RETRIES if x in ungrouped_df]]
+        ungrouped_df.drop(columns=["key", *statistics.columns], inplace=True)
         self.CSV2 = pd.concat(
             [
                 ungrouped_df,
                 upper_error_limitF,
                 lower_error_limitF,
                 conditionFF,
+                statistics,
             ],
             axis=1,
         )
@@ -522,11 +591,17 @@ class datatoGraph(datatoCSV_Accuracy):
             self.upper_error_limit = upper_error_limit
             self.lower_error_limit = lower_error_limit
 
-            condition1 = upper_error_limit < Ipercent_errorS
-            condition2 = lower_error_limit > Ipercent_errorS
+            guard = datatoGraph.confidence(grouped_df.get_group(x), "Current Set")
+            condition1 = upper_error_limit < Ipercent_errorS - guard
+            condition2 = lower_error_limit > Ipercent_errorS + guard
 
+            # A point whose reading failed has no error, it is marked instead of passed
+            missing = Ipercent_errorS.isna()
             for i in range(condition1.count()):
-                if condition1.iloc[i] | condition2.iloc[i]:
+                if missing.iloc[i]:
+                    self.condition = "NO READING"
+                    boolList.append(self.condition)
+                elif condition1.iloc[i] | condition2.iloc[i]:
                     self.condition = "FAIL"
                     boolList.append(self.condition)
                 else:
@@ -596,13 +671,16 @@ class datatoGraph(datatoCSV_Accuracy):
             lower_error_limitC, columns=["Lower Error Boundary"]
         )
 
-        ungrouped_df.drop(columns=["key"], inplace=True)
+        # The statistics and retries follow the condition, which keeps its Excel report column
+        statistics = ungrouped_df[[x for x in STATISTICS + RETRIES if x in ungrouped_df]]
+        ungrouped_df.drop(columns=["key", *statistics.columns], inplace=True)
         self.CSV2 = pd.concat(
             [
                 ungrouped_df,
                 upper_error_limitF,
                 lower_error_limitF,
                 conditionFF,
+                statistics,
             ],
             axis=1,
         )
@@ -613,6 +691,210 @@ class datatoGraph(datatoCSV_Accuracy):
         plt.savefig("images/Chart.png")
 
 
+class streamtoCSV_Accuracy(object):
+    """This class writes the points of a Voltage/Current Accuracy sweep to a CSV File as they are measured
+
+    It is a consumer of the MeasurementStream of DUT_Test.py, and writes the same columns as
+    datatoCSV_Accuracy one row per point, in the order the points are measured. Every row is flushed,
+    so the file can be read while the test is still running.
+
+    Attributes:
+        path: String containing the path of the CSV File.
+        rows: Integer containing the number of rows written.
+
+    """
+
+    COLUMNS = (
+        "Voltage Set",
+        "Current Set",
+        "Voltage Measured",
+        "Current Measured",
+        "key",
+        "Voltage Absolute Error",
+        "Voltage Percentage Error (%)",
+        "Current Absolute Error",
+        "Current Percentage Error (%)",
+    )
+
+    def __init__(self, path="csv/data.csv"):
+        self.path = path
+        self.rows = 0
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.COLUMNS)
+        self.file.flush()
+
+    def write(self, info, data):
+        """Writes a row with the absolute and percentage errors of a point
+
+        Args:
+            info: List containing the Voltage Set, Current Set and key of the point.
+            data: List containing the Voltage Measured and Current Measured of the point.
+        """
+        Vset, Iset, key = info
+        Vmeasured, Imeasured = data
+        Vabsolute_error = Vset - Vmeasured
+        Iabsolute_error = Iset - Imeasured
+        self.writer.writerow(
+            [
+                Vset,
+                Iset,
+                Vmeasured,
+                Imeasured,
+                key,
+                Vabsolute_error,
+                Vabsolute_error / Vset * 100 if Vset else math.nan,
+                Iabsolute_error,
+                Iabsolute_error / Iset * 100 if Iset else math.nan,
+            ]
+        )
+        self.file.flush()
+        self.rows += 1
+
+    def close(self):
+        self.file.close()
+
+
+class streamStatistics(object):
+    """This class keeps running statistics of the percentage error of a Voltage/Current Accuracy sweep
+
+    It is a consumer of the MeasurementStream of DUT_Test.py. The mean and standard deviation are
+    updated with Welford's method, so the statistics take constant memory however long the sweep. A
+    point fails when its percentage error is outside the error boundary (param1 * set + param2) * 100,
+    the same boundary as datatoGraph.
+
+    Attributes:
+        UNIT: String containing the quantity measured, "Voltage" or "Current".
+        param1: Float containing the gain error of the specification.
+        param2: Float containing the offset error of the specification.
+        count: Integer containing the number of points.
+        mean: Float containing the mean of the percentage error.
+        minimum: Float containing the lowest percentage error.
+        maximum: Float containing the highest percentage error.
+        failed: Integer containing the number of points outside the error boundary.
+        worst: List containing the info of the point with the largest absolute percentage error.
+
+    """
+
+    def __init__(self, UNIT, param1, param2):
+        self.UNIT = UNIT
+        self.param1 = float(param1)
+        self.param2 = float(param2)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.failed = 0
+        self.worst = None
+
+    def write(self, info, data):
+        if self.UNIT.upper() == "VOLTAGE":
+            x, measured = info[0], data[0]
+
+        else:
+            x, measured = info[1], data[1]
+
+        if not x:
+            return
+
+        percent_error = (x - measured) / x * 100
+        self.count += 1
+        delta = percent_error - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (percent_error - self.mean)
+
+        if self.worst is None or abs(percent_error) > max(
+            abs(self.minimum), abs(self.maximum)
+        ):
+            self.worst = list(info)
+
+        self.minimum = min(self.minimum, percent_error)
+        self.maximum = max(self.maximum, percent_error)
+
+        if abs(percent_error) > (self.param1 * x + self.param2) * 100:
+            self.failed += 1
+
+    def deviation(self):
+        """Returns the sample standard deviation of the percentage error"""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def report(self):
+        if not self.count:
+            return f"{self.UNIT} Statistics: no points"
+
+        return (
+            f"{self.UNIT} Statistics: {self.count} points, "
+            f"mean {self.mean:.6f} %, deviation {self.deviation():.6f} %, "
+            f"range {self.minimum:.6f} % to {self.maximum:.6f} %, "
+            f"{self.failed} failed, worst at {self.worst}"
+        )
+
+
+class streamtoGraph(object):
+    """This class plots the percentage error of a Voltage/Current Accuracy sweep live as it is measured
+
+    It is a consumer of the MeasurementStream of DUT_Test.py. The points are added to an interactive
+    scatter plot, black when inside the error boundary and red when outside, and the figure is
+    redrawn every few points so that the plot does not slow down the sweep.
+
+    Attributes:
+        UNIT: String containing the quantity measured, "Voltage" or "Current".
+        param1: Float containing the gain error of the specification.
+        param2: Float containing the offset error of the specification.
+        every: Integer containing the number of points between two redraws.
+
+    """
+
+    def __init__(self, UNIT, param1, param2, every=10):
+        self.UNIT = UNIT
+        self.param1 = float(param1)
+        self.param2 = float(param2)
+        self.every = max(int(every), 1)
+        self.pending = {"black": ([], []), "red": ([], [])}
+        self.count = 0
+
+        plt.ion()
+        self.figure, self.axes = plt.subplots()
+        self.axes.set_title(UNIT)
+        self.axes.set_xlabel(UNIT + " Set")
+        self.axes.set_ylabel("Percentage Error (%)")
+
+    def write(self, info, data):
+        if self.UNIT.upper() == "VOLTAGE":
+            x, measured = info[0], data[0]
+
+        else:
+            x, measured = info[1], data[1]
+
+        if not x:
+            return
+
+        percent_error = (x - measured) / x * 100
+        limit = (self.param1 * x + self.param2) * 100
+        colour = "black" if abs(percent_error) <= limit else "red"
+        self.pending[colour][0].append(x)
+        self.pending[colour][1].append(percent_error)
+
+        self.count += 1
+        if self.count % self.every == 0:
+            self.draw()
+
+    def draw(self):
+        """Adds the points received since the last redraw to the plot"""
+        for colour, (x, y) in self.pending.items():
+            if x:
+                self.axes.scatter(x, y, color=colour, s=6 if colour == "black" else 12)
+
+        self.pending = {"black": ([], []), "red": ([], [])}
+        self.figure.canvas.draw_idle()
+        plt.pause(0.001)
+
+    def close(self):
+        self.draw()
+        plt.ioff()
+
+
 class instrumentData(object):
     """This class stores and facilitates the collection of Instrument Data to be placed in Excel Report
 
@@ -624,12 +906,14 @@ class instrumentData(object):
     """
 
     def __init__(self, *args):
-        instrumentIDN = []
-        instrumentVersion = []
+        # Every Instrument is queried on its own executor, the time taken is that of the slowest one
+        async def query():
+            return await asyncio.gather(
+                asyncio.gather(*[AsyncSubsystem(IDN, x).query() for x in args]),
+                asyncio.gather(*[AsyncSubsystem(System, x).version() for x in args]),
+            )
 
-        for x in args:
-            instrumentIDN.append(IDN(x).query())
-            instrumentVersion.append(System(x).version())
+        instrumentIDN, instrumentVersion = asyncio.run(query())
 
         df1 = pd.DataFrame(instrumentIDN, columns=["Instruments Used: "])
         df2 = pd.DataFrame(instrumentVersion, columns=["SCPI Version"])
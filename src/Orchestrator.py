@@ -0,0 +1,404 @@
+"""Module containing the orchestration of queued test plans over several benches, one worker process per bench
+
+    Every bench has its own PSU, DMM, ELoad and Oscilloscope. Instead of starting a GUI for every bench by
+    hand, the test plans are queued and spread over a pool of worker processes, one per bench. Every worker
+    owns the Instruments of its bench through its own VisaResourceManager (the SessionPool is per process),
+    and takes the next plan from the queue as soon as its bench is free. A plan may also be pinned to a
+    bench, e.g. because of the DUT mounted on it. The result of every plan is streamed back to a central
+    Collector as soon as it completes, which appends it to a JSON Lines file, so the results of a long
+    queue can be followed while it runs.
+
+    A bench with the backend "@sim" runs against the simulated Instruments (see Simulator.py), so the
+    orchestration can be tried on one machine with simulated benches. At the end the Collector reports how
+    busy every bench was on the host clock: the time spent running plans, the time spent idle (waiting for
+    a plan or for its Instruments) and the share of the run it was busy for.
+
+    The benches and the plans are given in a JSON file:
+
+        {
+            "benches": [
+                {"name": "Bench 1", "PSU": "USB0::...", "DMM": "GPIB0::22::INSTR", "ELoad": "USB0::...",
+                 "PSU_Channel": 1, "ELoad_Channel": 2}
+            ],
+            "plans": [
+                {"name": "DUT 1", "test": "VoltageMeasurement.executeVoltageMeasurementA",
+                 "settings": {...}, "bench": "Bench 1"}
+            ]
+        }
+
+    Usage:
+        python Orchestrator.py plans.json --output results.jsonl
+        python Orchestrator.py --simulate 4 --plans 12
+
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import types
+from time import perf_counter, time
+
+sys.path.insert(
+    1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "library")
+)
+
+from SessionPool import SessionPool
+import DUT_Test
+
+
+# Settings of a plan that belong to the bench it runs on
+BENCH_KEYS = (
+    "PSU",
+    "DMM",
+    "ELoad",
+    "OSC",
+    "PSU_Channel",
+    "ELoad_Channel",
+    "OSC_Channel",
+)
+
+
+def getTest(name):
+    """Returns the function executing a DUT Test from its name
+
+    Args:
+        name: String containing the class and method of the DUT Test in DUT_Test.py, e.g.
+            "VoltageMeasurement.executeVoltageMeasurementA".
+
+    Raises:
+        AttributeError: The DUT Test does not exist.
+    """
+    cls, _, method = name.partition(".")
+    cls = getattr(DUT_Test, cls)
+    function = getattr(cls, method)
+
+    def execute(dict):
+        # Tests whose class cannot be instantiated (e.g. RiseFallTime) get a namespace as self
+        try:
+            self = cls()
+
+        except TypeError:
+            self = types.SimpleNamespace()
+
+        return function(self, dict)
+
+    return execute
+
+
+def getSimulatedBench(number):
+    """Returns a simulated bench with VISA Addresses of its own
+
+    Args:
+        number: Integer containing the number of the bench.
+    """
+    return {
+        "name": f"Sim Bench {number}",
+        "backend": "@sim",
+        "timeScale": 0,
+        "PSU": f"USB0::0x2A8D::0x0F02::SIM{number:04d}::0::INSTR",
+        "ELoad": f"USB0::0x2A8D::0x0F02::SIM{number:04d}::0::INSTR",
+        "DMM": f"GPIB{number}::22::INSTR",
+        "OSC": f"USB0::0x0957::0x1796::SIM{number:04d}::0::INSTR",
+        "PSU_Channel": 1,
+        "ELoad_Channel": 2,
+        "OSC_Channel": 1,
+    }
+
+
+def work(bench, pinned, shared, results):
+    """Runs the plans of a single bench in its worker process
+
+    The plans pinned to the bench are run first, then the plans of the shared queue. Both queues end
+    with None. Every message put on the results queue is a dictionary with the type "result",
+    "error" or "done". The time of a plan is given on the clock of the bench (virtual for a simulated
+    bench) and on the host clock (wall), the busy and elapsed time of the bench on the host clock.
+
+    Args:
+        bench: Dictionary containing the name, backend and VISA Addresses of the bench.
+        pinned: Queue containing the plans pinned to the bench.
+        shared: Queue containing the plans any bench may run.
+        results: Queue of the messages streamed back to the Collector.
+    """
+    SessionPool.backend = bench.get("backend", "")
+    SessionPool.timeScale = float(bench.get("timeScale", 0))
+    addresses = {key: bench[key] for key in BENCH_KEYS if key in bench}
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        A = DUT_Test.VisaResourceManager()
+        flag, args = A.openRM(
+            *[bench[key] for key in ("PSU", "DMM", "ELoad", "OSC") if bench.get(key)]
+        )
+
+    # Busy and idle time are measured on the host clock, the clock of a simulated bench in virtual time
+    # does not advance while its worker waits for a plan. The wall-clock time stamps are comparable
+    # between the workers.
+    started = time()
+    busy = 0.0
+    plans = 0
+    failed = 0
+
+    for plans_queue in (pinned, shared):
+        for plan in iter(plans_queue.get, None):
+            message = {
+                "bench": bench["name"],
+                "plan": plan.get("name", plan["test"]),
+                "test": plan["test"],
+            }
+            settings = dict(plan.get("settings", {}), **addresses)
+            output = io.StringIO()
+            began = SessionPool.now()
+            wall = perf_counter()
+            try:
+                if flag == 0:
+                    raise RuntimeError(f"Instruments of the bench not opened: {args}")
+
+                if SessionPool.backend == "@sim":
+                    A.rm.bench.assign(settings)
+
+                with contextlib.redirect_stdout(output):
+                    message["result"] = getTest(plan["test"])(settings)
+
+                message["type"] = "result"
+
+            except Exception as e:
+                message["type"] = "error"
+                message["error"] = f"{type(e).__name__}: {e}"
+                failed += 1
+
+            message["time"] = SessionPool.now() - began
+            message["wall"] = perf_counter() - wall
+            message["log"] = output.getvalue()
+            busy += message["wall"]
+            plans += 1
+            results.put(message)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        A.closeRM()
+
+    finished = time()
+
+    results.put(
+        {
+            "type": "done",
+            "bench": bench["name"],
+            "plans": plans,
+            "failed": failed,
+            "busy": busy,
+            "elapsed": finished - started,
+            "started": started,
+            "finished": finished,
+        }
+    )
+
+
+def getJSON(value):
+    """Returns a value that JSON cannot serialise as a list (NumPy arrays) or as a string"""
+    return value.tolist() if hasattr(value, "tolist") else str(value)
+
+
+class Collector(object):
+    """Collects the messages streamed back by the workers and keeps the statistics of every bench
+
+    Attributes:
+        path: String containing the path of the JSON Lines file every message is appended to, None to
+            keep the messages in memory only.
+        results: List containing the message of every plan run.
+        benches: Dictionary mapping the name of the bench to the statistics of its worker.
+
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.results = []
+        self.benches = {}
+        self.file = open(path, "a") if path else None
+
+    def collect(self, message):
+        """Records a message of a worker and appends it to the results file"""
+        if message["type"] == "done":
+            self.benches[message["bench"]] = message
+
+        else:
+            self.results.append(message)
+            status = "done" if message["type"] == "result" else message["error"]
+            print(
+                f"{message['bench']}: {message['plan']} ({message['time']:.3f} s) {status}"
+            )
+
+        if self.file:
+            self.file.write(json.dumps(message, default=getJSON) + "\n")
+            self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def report(self):
+        """Returns a summary of the plans run and how busy every bench was
+
+        The run lasts from the first bench starting to the last bench finishing, on the host clock.
+        The share of every bench is its elapsed time over the run, so an uneven spread of the queue
+        shows up as benches finishing early.
+        """
+        benches = self.benches.values()
+        makespan = (
+            max(x["finished"] for x in benches) - min(x["started"] for x in benches)
+            if benches
+            else 0
+        )
+        lines = ["Benches:"]
+        for name, x in self.benches.items():
+            utilisation = x["busy"] / x["elapsed"] if x["elapsed"] else 0
+            share = x["elapsed"] / makespan if makespan else 0
+            lines.append(
+                f"  {name}: {x['plans']} plans ({x['failed']} failed), "
+                f"{x['busy']:.3f} s busy, {x['elapsed'] - x['busy']:.3f} s idle, "
+                f"{utilisation:.0%} utilisation, {share:.0%} of the run"
+            )
+
+        lines.append(f"  Run: {len(self.results)} plans in {makespan:.3f} s")
+        return "\n".join(lines)
+
+
+class Orchestrator(object):
+    """Spreads the queued test plans over a pool of worker processes, one per bench
+
+    Attributes:
+        benches: List containing the dictionary of every bench.
+        plans: List containing the dictionary of every plan, with its test, settings and optional bench.
+        collector: The Collector receiving the results.
+
+    """
+
+    def __init__(self, benches, plans, collector=None):
+        self.benches = benches
+        self.plans = plans
+        self.collector = collector if collector is not None else Collector()
+
+    def run(self):
+        """Runs every plan and waits for every bench to finish
+
+        Returns:
+            Returns the Collector holding the results.
+
+        Raises:
+            ValueError: A plan is pinned to a bench that does not exist.
+        """
+        names = [bench["name"] for bench in self.benches]
+        context = multiprocessing.get_context("spawn")
+        shared = context.Queue()
+        results = context.Queue()
+        pinned = {name: context.Queue() for name in names}
+
+        for plan in self.plans:
+            if plan.get("bench") is None:
+                shared.put(plan)
+
+            elif plan["bench"] in pinned:
+                pinned[plan["bench"]].put(plan)
+
+            else:
+                raise ValueError(f"Unknown bench {plan['bench']} in plan {plan}")
+
+        for name in names:
+            pinned[name].put(None)
+            shared.put(None)
+
+        workers = [
+            context.Process(
+                target=work,
+                args=(bench, pinned[bench["name"]], shared, results),
+                name=bench["name"],
+            )
+            for bench in self.benches
+        ]
+        for worker in workers:
+            worker.start()
+
+        # A worker that died without reporting is waited for no longer
+        running = set(names)
+        while running:
+            try:
+                message = results.get(timeout=1)
+
+            except queue.Empty:
+                for worker in workers:
+                    if worker.name in running and not worker.is_alive():
+                        print(f"{worker.name}: worker exited ({worker.exitcode})")
+                        running.discard(worker.name)
+
+                continue
+
+            self.collector.collect(message)
+            if message["type"] == "done":
+                running.discard(message["bench"])
+
+        for worker in workers:
+            worker.join()
+
+        self.collector.close()
+        return self.collector
+
+
+def getExamplePlans(count):
+    """Returns plans alternating between the accuracy and load regulation tests of the Benchmark"""
+    from Benchmark import SETTINGS, getSettings, getSweep
+
+    settings = {
+        key: value for key, value in SETTINGS.items() if key not in BENCH_KEYS
+    }
+    tests = (
+        ("VoltageMeasurement.executeVoltageMeasurementA", 100),
+        ("CurrentMeasurement.executeCurrentMeasurementA", 100),
+        ("LoadRegulation.executeCV_LoadRegulationA", None),
+        ("VoltageMeasurement.executeVoltageMeasurementB", 400),
+    )
+    plans = []
+    for i in range(count):
+        test, points = tests[i % len(tests)]
+        plan_settings = getSettings(test.partition(".execute")[2], settings)
+        if points:
+            plan_settings.update(getSweep(points, 30, 5))
+
+        plans.append({"name": f"DUT {i + 1}", "test": test, "settings": plan_settings})
+
+    return plans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?", help="JSON file of the benches and plans")
+    parser.add_argument("--output", default="results.jsonl")
+    parser.add_argument("--simulate", type=int, default=0, help="Simulated benches")
+    parser.add_argument("--plans", type=int, default=8, help="Example plans")
+    args = parser.parse_args()
+
+    benches = []
+    plans = []
+    if args.file:
+        with open(args.file) as f:
+            config = json.load(f)
+
+        benches = config.get("benches", [])
+        plans = config.get("plans", [])
+
+    if args.simulate:
+        benches = [getSimulatedBench(i + 1) for i in range(args.simulate)]
+
+    if not plans:
+        plans = getExamplePlans(args.plans)
+
+    collector = Orchestrator(benches, plans, Collector(args.output)).run()
+    print(collector.report())
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,556 @@
+"""Module containing the declarative test plans and the executor compiling and running them
+
+    The GUI builds the settings of a DUT Test as a flat dictionary of 20 to 60 keys (see
+    Data.dictGenerator). A test plan describes the same DUT Test declaratively, grouped by what the keys
+    are about, in a JSON (or YAML, if PyYAML is installed) file:
+
+        {
+            "name": "DUT 1 Voltage Accuracy",
+            "test": "VoltageMeasurementA",
+            "instruments": {"instrument": "Keysight", "psu": "USB0::...", "dmm": "GPIB0::22::INSTR",
+                            "eload": "USB0::...", "psuChannel": 1, "eloadChannel": 2},
+            "dut": {"voltage": 30, "current": 5, "power": 100, "gain": 0.01, "offset": 0.01},
+            "setup": {"function": "Current", "voltageRes": "SLOW", "range": "Auto", "aperture": 1},
+            "sweep": {"voltage": [1, 30, 1], "current": [1, 5, 1], "order": "SERPENTINE"},
+            "settle": {"policy": "ADAPTIVE", "tolerance": 1e-4},
+            "measure": {"acquisition": "BUFFERED", "retries": 2},
+            "schedule": "AUTO"
+        }
+
+    The sweep axes are given as [start, stop, step]. Every other key of a section is either one of the
+    names in SECTIONS or a key of the DUT Test as it is (e.g. "I_Step"), which is passed on unchanged.
+    The settings a plan leaves out default to those of the dialog of the DUT Test in the GUI (DEFAULTS),
+    except for the Instruments, the ratings and specifications of the DUT and the sweep (REQUIRED),
+    which are reported when missing before anything is simulated or opened.
+
+    The executor compiles the plan into the settings of the DUT Test. With the schedule "AUTO", the keys
+    of SCHEDULES that the plan leaves open (sweep order, completion wait, ELoad LIST sweep and buffered
+    acquisition) are chosen by running every candidate schedule against the simulated bench (see
+    Simulator.py) in virtual time and keeping the fastest. A dry run does the same without touching any
+    Instrument and reports the bus transactions and the estimated time of the plan.
+
+    Usage:
+        python TestPlan.py plan.json --dry-run
+        python TestPlan.py plan.yaml
+
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(
+    1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "library")
+)
+
+from SessionPool import SessionPool
+from DUT_Test import VisaResourceManager
+from Orchestrator import getTest
+
+try:
+    import yaml
+
+except ImportError:
+    yaml = None
+
+
+# Name of every DUT Test a plan can run, with its class and method in DUT_Test.py
+TESTS = {
+    "VoltageMeasurementA": "VoltageMeasurement.executeVoltageMeasurementA",
+    "VoltageMeasurementB": "VoltageMeasurement.executeVoltageMeasurementB",
+    "CurrentMeasurementA": "CurrentMeasurement.executeCurrentMeasurementA",
+    "CurrentMeasurementB": "CurrentMeasurement.executeCurrentMeasurementB",
+    "CV_LoadRegulationA": "LoadRegulation.executeCV_LoadRegulationA",
+    "CV_LoadRegulationB": "LoadRegulation.executeCV_LoadRegulationB",
+    "CC_LoadRegulationA": "LoadRegulation.executeCC_LoadRegulationA",
+    "CC_LoadRegulationB": "LoadRegulation.executeCC_LoadRegulationB",
+    "RiseFallTime": "RiseFallTime.execute",
+    "ProgrammingSpeedTest": "ProgrammingSpeedTest.execute",
+}
+
+# Names of the keys of every section of a plan and the key of the DUT Test they set
+SECTIONS = {
+    "instruments": {
+        "instrument": "Instrument",
+        "psu": "PSU",
+        "dmm": "DMM",
+        "eload": "ELoad",
+        "osc": "OSC",
+        "psuChannel": "PSU_Channel",
+        "eloadChannel": "ELoad_Channel",
+        "oscChannel": "OSC_Channel",
+    },
+    "dut": {
+        "voltage": "V_Rating",
+        "current": "I_Rating",
+        "power": "P_Rating",
+        "gain": "Error_Gain",
+        "offset": "Error_Offset",
+    },
+    "setup": {
+        "function": "setFunction",
+        "voltageSense": "VoltageSense",
+        "currentSense": "CurrentSense",
+        "voltageRes": "VoltageRes",
+        "currentRes": "CurrentRes",
+        "range": "Range",
+        "aperture": "Aperture",
+        "autoZero": "AutoZero",
+        "inputZ": "InputZ",
+        "terminal": "Terminal",
+        "upTime": "UpTime",
+        "downTime": "DownTime",
+    },
+    "sweep": {
+        "order": "SweepOrder",
+        "eloadWeight": "ELoadWeight",
+        "eload": "ELoadSweep",
+        "dwell": "ListDwell",
+        "listTrigger": "ListTrigger",
+        "listPin": "ListPin",
+        "sampling": "Sampling",
+        "coarseStep": "CoarseStep",
+        "budget": "PointBudget",
+        "refineMargin": "RefineMargin",
+        "refineChange": "RefineChange",
+    },
+    "settle": {
+        "policy": "Settling",
+        "tolerance": "SettleTolerance",
+        "window": "SettleWindow",
+        "rate": "SettleRate",
+        "nplc": "SettleNPLC",
+        "timeout": "SettleTimeout",
+        "synchronization": "Synchronization",
+        "pollInterval": "PollInterval",
+        "pollBackoff": "PollBackoff",
+        "pollMaxInterval": "PollMaxInterval",
+        "pollTimeout": "PollTimeout",
+    },
+    "measure": {
+        "acquisition": "Acquisition",
+        "bufferSize": "BufferSize",
+        "dataFormat": "DataFormat",
+        "triggerMargin": "TriggerMargin",
+        "batch": "Batch",
+        "batchLength": "BatchLength",
+        "retries": "Retries",
+        "retryBackoff": "RetryBackoff",
+        "retryRearm": "RetryRearm",
+        "checkpoint": "Checkpoint",
+        "checkpointSync": "CheckpointSync",
+        "checkpointMaxAge": "CheckpointMaxAge",
+        "keepResults": "KeepResults",
+        "pipeline": "Pipeline",
+        "optimize": "Optimize",
+        "uncertaintyMargin": "UncertaintyMargin",
+        "coverageFactor": "CoverageFactor",
+        "noiseSamples": "NoiseSamples",
+        "repeat": "Repeat",
+        "repeatChunk": "RepeatChunk",
+        "confidence": "Confidence",
+        "datalog": "Datalog",
+        "dlogPeriod": "DlogPeriod",
+        "dlogFile": "DlogFile",
+        "loadDwell": "LoadDwell",
+        "loadSteps": "LoadSteps",
+        "dlogSettle": "DlogSettle",
+    },
+}
+
+# Sweep axes of a plan and the keys of their start, stop and step
+AXES = {
+    "voltage": ("minVoltage", "maxVoltage", "voltage_step_size"),
+    "current": ("minCurrent", "maxCurrent", "current_step_size"),
+}
+
+# Settings of the Digital Multimeter every DUT Test measuring with it defaults to, as set by the GUI
+MEASURE = {
+    "Instrument": "Keysight",
+    "Range": "Auto",
+    "Aperture": 10,
+    "AutoZero": "ON",
+    "UpTime": 50,
+    "DownTime": 50,
+}
+
+# Settings of every DUT Test that default to the values of its dialog in the GUI when the plan leaves
+# them out
+DEFAULTS = {
+    "VoltageMeasurement": dict(
+        MEASURE,
+        setFunction="Current",
+        VoltageRes="SLOW",
+        VoltageSense="INT",
+        InputZ="ON",
+    ),
+    "CurrentMeasurement": dict(
+        MEASURE,
+        setFunction="Voltage",
+        CurrentRes="SLOW",
+        CurrentSense="INT",
+        Terminal="3A",
+    ),
+    "CV_LoadRegulation": dict(
+        MEASURE,
+        setFunction="Current",
+        VoltageRes="SLOW",
+        VoltageSense="EXT",
+        CurrentSense="EXT",
+        InputZ="ON",
+    ),
+    "CC_LoadRegulation": dict(
+        MEASURE,
+        setFunction="Voltage",
+        CurrentRes="SLOW",
+        CurrentSense="INT",
+        Terminal="3A",
+    ),
+    "RiseFallTime": {
+        "Instrument": "Keysight",
+        "setFunction": "Current",
+        "VoltageSense": "EXT",
+        "Channel_CouplingMode": "AC",
+        "Trigger_CouplingMode": "AC",
+        "Trigger_Mode": "EDGE",
+        "Trigger_SweepMode": "NORMAL",
+        "Trigger_SlopeMode": "ALTERNATE",
+        "TimeScale": 5,
+        "VerticalScale": 1e-5,
+    },
+    "ProgrammingSpeedTest": {
+        "Instrument": "Keysight",
+        "VoltageSense": "EXT",
+        "Trigger_CouplingMode": "DC",
+        "Trigger_Mode": "EDGE",
+        "Trigger_SweepMode": "NORMAL",
+        "Trigger_SlopeMode": "EITH",
+    },
+}
+
+# Settings of every DUT Test without a default, which every plan of the DUT Test has to give
+ACCURACY = (
+    "PSU",
+    "DMM",
+    "ELoad",
+    "PSU_Channel",
+    "ELoad_Channel",
+    "Error_Gain",
+    "Error_Offset",
+    *AXES["voltage"],
+    *AXES["current"],
+)
+REGULATION = (
+    "PSU",
+    "DMM",
+    "ELoad",
+    "PSU_Channel",
+    "ELoad_Channel",
+    "Error_Gain",
+    "Error_Offset",
+    "V_Rating",
+    "I_Rating",
+    "P_Rating",
+)
+REQUIRED = {
+    "VoltageMeasurement": ACCURACY,
+    "CurrentMeasurement": ACCURACY,
+    "CV_LoadRegulation": REGULATION,
+    "CC_LoadRegulation": REGULATION,
+    "RiseFallTime": (
+        "PSU",
+        "ELoad",
+        "OSC",
+        "PSU_Channel",
+        "ELoad_Channel",
+        "OSC_Channel",
+        "V_Rating",
+        "I_Rating",
+        "I_Step",
+        "V_Settling_Band",
+    ),
+    "ProgrammingSpeedTest": (
+        "PSU",
+        "OSC",
+        "PSU_Channel",
+        "OSC_Channel",
+        "V_Lower",
+        "V_Upper",
+        "Upper_Bound",
+        "Lower_Bound",
+    ),
+}
+
+# Candidate schedules of the schedule "AUTO", every one of them measures the same points
+SCHEDULES = (
+    {},
+    {"SweepOrder": "SERPENTINE"},
+    {"SweepOrder": "SERPENTINE", "Synchronization": "SRQ"},
+    {"SweepOrder": "SERPENTINE", "ELoadSweep": "LIST"},
+    {"SweepOrder": "SERPENTINE", "ELoadSweep": "LIST", "Acquisition": "BUFFERED"},
+)
+
+
+def loadPlan(path):
+    """Returns the test plan of a JSON or YAML file
+
+    Raises:
+        ImportError: The plan is a YAML file and PyYAML is not installed.
+    """
+    with open(path) as f:
+        if path.lower().endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ImportError("PyYAML is needed for the test plan " + path)
+
+            return yaml.safe_load(f)
+
+        return json.load(f)
+
+
+def getFamily(test):
+    """Returns the name of a DUT Test without its variant, the key of DEFAULTS and REQUIRED"""
+    return test[:-1] if test[-1] in "AB" else test
+
+
+def getPlanKey(key):
+    """Returns where a key of the DUT Test is set in a plan, e.g. "setup.currentRes" for CurrentRes"""
+    for axis, keys in AXES.items():
+        if key in keys:
+            return f"sweep.{axis}"
+
+    for section, names in SECTIONS.items():
+        for name, setting in names.items():
+            if setting == key:
+                return f"{section}.{name}"
+
+    return key
+
+
+def compilePlan(plan):
+    """Compiles a test plan into the settings of its DUT Test
+
+    The settings the plan leaves out default to DEFAULTS, and every setting of REQUIRED has to be given,
+    so a plan missing one fails here rather than deep inside the DUT Test.
+
+    Args:
+        plan: Dictionary containing the test plan.
+
+    Returns:
+        Returns the name of the DUT Test and the dictionary containing its settings.
+
+    Raises:
+        ValueError: The DUT Test or a section of the plan is not known, a sweep axis is not [start, stop, step],
+            or a required setting is missing.
+    """
+    if plan.get("test") not in TESTS:
+        raise ValueError(
+            f"Unknown DUT Test {plan.get('test')}, expected one of {list(TESTS)}"
+        )
+
+    settings = {}
+    for section, value in plan.items():
+        if section in ("name", "test", "schedule"):
+            continue
+
+        if section not in SECTIONS:
+            raise ValueError(f"Unknown section {section} of the test plan")
+
+        for key, setting in value.items():
+            if section == "sweep" and key in AXES:
+                if len(setting) != 3:
+                    raise ValueError(f"Sweep axis {key} is not [start, stop, step]")
+
+                settings.update(zip(AXES[key], setting))
+
+            else:
+                settings[SECTIONS[section].get(key, key)] = setting
+
+    family = getFamily(plan["test"])
+    settings = dict(DEFAULTS[family], **settings)
+    missing = [key for key in REQUIRED[family] if key not in settings]
+    if missing:
+        names = sorted({getPlanKey(key) for key in missing})
+        raise ValueError(f"Missing settings of {plan['test']}: {', '.join(names)}")
+
+    return plan["test"], settings
+
+
+class Executor(object):
+    """Compiles the test plans into the settings of their DUT Test, chooses their schedule and runs them
+
+    Attributes:
+        name: String containing the name of the DUT Test.
+        settings: Dictionary containing the settings of the DUT Test compiled from the plan.
+        schedule: Dictionary containing the keys of SCHEDULES chosen for the plan.
+        candidates: List containing the dry run of every candidate schedule.
+
+    """
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.name, self.settings = compilePlan(plan)
+        self.schedule = {}
+        self.candidates = []
+
+    def getCandidates(self):
+        """Returns the candidate schedules, leaving out the keys already set by the plan"""
+        if str(self.plan.get("schedule", "AS_IS")).upper() != "AUTO":
+            return [{}]
+
+        candidates = []
+        for schedule in SCHEDULES:
+            schedule = {
+                key: value for key, value in schedule.items() if key not in self.settings
+            }
+            # Buffered readings are triggered at a fixed delay, which drops the adaptive settling
+            if str(self.settings.get("Settling", "FIXED")).upper() == "ADAPTIVE":
+                schedule.pop("Acquisition", None)
+
+            if schedule not in candidates:
+                candidates.append(schedule)
+
+        return candidates
+
+    def simulate(self, schedule):
+        """Runs the DUT Test with a schedule against a fresh simulated bench in virtual time
+
+        The checkpoint of the plan is left out, so a dry run never resumes or removes it.
+
+        Returns:
+            Returns a dictionary containing the estimated time, bus transactions and bytes of the run.
+        """
+        settings = dict(self.settings, **schedule)
+        settings.pop("Checkpoint", None)
+
+        backend, timeScale = SessionPool.backend, SessionPool.timeScale
+        SessionPool.closeAll()
+        SessionPool.backend = "@sim"
+        SessionPool.timeScale = 0
+        output = io.StringIO()
+
+        try:
+            with contextlib.redirect_stdout(output):
+                A = VisaResourceManager()
+                bench = A.rm.bench
+                bench.assign(settings)
+                A.openRM(
+                    *[
+                        settings[key]
+                        for key in ("PSU", "DMM", "ELoad")
+                        if key in settings
+                    ]
+                )
+                bench.resetStatistics()
+
+                start = perf_counter()
+                getTest(TESTS[self.name])(settings)
+                wall = perf_counter() - start
+                time = bench.clock.now()
+                statistics = bench.statistics()
+                A.closeRM()
+
+        finally:
+            SessionPool.closeAll()
+            SessionPool.backend, SessionPool.timeScale = backend, timeScale
+
+        return {
+            "schedule": schedule,
+            "time": time,
+            "wall": wall,
+            "transactions": sum(x["transactions"] for x in statistics.values()),
+            "bytes": sum(
+                x["bytesWritten"] + x["bytesRead"] for x in statistics.values()
+            ),
+            "instruments": {
+                VISA_ADDRESS: {
+                    "roles": x["roles"],
+                    "transactions": x["transactions"],
+                    "busTime": x["busTime"],
+                }
+                for VISA_ADDRESS, x in statistics.items()
+            },
+        }
+
+    def dryRun(self):
+        """Chooses the schedule of the plan without touching any Instrument
+
+        Every candidate schedule is run against the simulated bench and the one with the shortest
+        estimated time is kept, the one with the fewest transactions on a tie.
+
+        Returns:
+            Returns the dry run of the schedule chosen.
+        """
+        self.candidates = [self.simulate(x) for x in self.getCandidates()]
+        best = min(self.candidates, key=lambda x: (x["time"], x["transactions"]))
+        self.schedule = best["schedule"]
+        return best
+
+    def execute(self):
+        """Runs the DUT Test of the plan on the Instruments with the schedule chosen
+
+        Returns:
+            Returns the result of the DUT Test.
+        """
+        if not self.candidates and len(self.getCandidates()) > 1:
+            self.dryRun()
+
+        settings = dict(self.settings, **self.schedule)
+        A = VisaResourceManager()
+        flag, args = A.openRM(
+            *[settings[key] for key in ("PSU", "DMM", "ELoad") if key in settings]
+        )
+        if flag == 0:
+            raise RuntimeError(f"Instruments of the plan not opened: {args}")
+
+        try:
+            return getTest(TESTS[self.name])(settings)
+
+        finally:
+            A.closeRM()
+
+    def report(self):
+        """Returns a summary of the dry run of every candidate schedule and the schedule chosen"""
+        lines = [f"Test Plan: {self.plan.get('name', self.name)} ({self.name})"]
+        for x in self.candidates:
+            schedule = ", ".join(f"{k}={v}" for k, v in x["schedule"].items())
+            chosen = " <- chosen" if x["schedule"] == self.schedule else ""
+            lines.append(
+                f"  {schedule or 'as planned'}: {x['time']:.3f} s estimated, "
+                f"{x['transactions']} transactions, {x['bytes']} bytes{chosen}"
+            )
+            for VISA_ADDRESS, instrument in x["instruments"].items():
+                if chosen:
+                    lines.append(
+                        f"    {VISA_ADDRESS} ({'/'.join(instrument['roles'])}): "
+                        f"{instrument['transactions']} transactions, "
+                        f"{instrument['busTime']:.3f} s on the bus"
+                    )
+
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("plan", help="JSON or YAML file of the test plan")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Estimate the plan on the simulated bench",
+    )
+    args = parser.parse_args()
+
+    executor = Executor(loadPlan(args.plan))
+    executor.dryRun()
+    print(executor.report())
+
+    if not args.dry_run:
+        result = executor.execute()
+        print(f"Test Plan completed: {type(result).__name__} returned")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,10 @@ class xlreport(object):
         self.green_fill = PatternFill(
             start_color="FFAAFF00", end_color="FFAAFF00", fill_type="solid"
         )
+        self.amber_font = Font(size=14, bold=True, color="7f4f00")
+        self.amber_fill = PatternFill(
+            start_color="ffe699", end_color="ffe699", fill_type="solid"
+        )
         self.path = (
             r"C:\Users\zhiywong\OneDrive - Keysight Technologies\Documents\GitHub\PyVisa\Excel Files\\"
             + datetime.datetime.now().strftime("%Y-%m-%d--%H-%M-%S")
@@ -99,6 +103,16 @@ class xlreport(object):
                     font=self.red_font,
                 ),
             )
+            # Points whose reading failed after its retries (see RetryPolicy in DUT_Test.py)
+            ws.conditional_formatting.add(
+                cellref,
+                FormulaRule(
+                    formula=[f'NOT(ISERROR(SEARCH("NO READING",{cellref})))'],
+                    stopIfTrue=True,
+                    fill=self.amber_fill,
+                    font=self.amber_font,
+                ),
+            )
 
             self.adjustcolumnWidth(ws, 20)
             self.adjustcolumnWidth(ws, 20)